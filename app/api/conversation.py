@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, WebSocket, Depends
 from app.services.llm.conversation_manager import conversation_pool
-from app.services.voice.audio_processor import audio_processor
+from app.services.voice.audio_processor import AudioProcessor
 from typing import Dict, Optional
 import json
 import uuid
@@ -36,6 +36,8 @@ async def voice_conversation(websocket: WebSocket, session_id: str):
     """Handle real-time voice conversation"""
     await websocket.accept()
     conversation = conversation_pool.get_conversation(session_id)
+    # One processor per connection: it buffers this connection's utterance
+    audio_processor = AudioProcessor()
     
     try:
         while True:
@@ -43,9 +45,9 @@ async def voice_conversation(websocket: WebSocket, session_id: str):
             audio_data = await websocket.receive_bytes()
             
             # Convert speech to text
-            text = await audio_processor.speech_to_text(audio_data)
+            text = await audio_processor.process_audio(audio_data)
             
-            if text.strip():
+            if text and text.strip():
                 # Process the text through conversation manager
                 result = await conversation.process_user_input(text)
                 
@@ -1,13 +1,16 @@
 from fastapi import Depends, HTTPException
 from app.services.auth.auth_service import AuthService
 from typing import Optional, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_auth_service() -> AuthService:
     """Dependency to get an instance of AuthService"""
     try:
         return AuthService()
     except Exception as e:
-        print(f"Error creating AuthService: {str(e)}")
+        logger.error(f"Error creating AuthService: {str(e)}")
         raise HTTPException(status_code=500, detail="Error initializing auth service")
 
 async def get_current_user(
@@ -7,11 +7,12 @@ from app.api.dependencies.auth import get_auth_service
 from app.models.user import UserCreate
 from pydantic import BaseModel, EmailStr
 from typing import Dict, Any, Optional
-import traceback
+import logging
 from app.services.voice.livekit_service import livekit_service
 from app.core.config import get_settings
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 security = HTTPBearer(auto_error=False)  # Make bearer token optional for OPTIONS requests
 
 class UserCredentials(BaseModel):
@@ -42,9 +43,9 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> Dict[str, Any]:
     try:
-        print(f"Login attempt for email: {credentials.email}")
+        logger.debug("Login attempt for email: %s", credentials.email)
         result = await auth_service.sign_in(credentials.email, credentials.password)
-        print(f"Login successful for email: {credentials.email}")
+        logger.info("Login successful for email: %s", credentials.email)
         return JSONResponse(
             content=result,
             headers={
@@ -53,10 +54,9 @@ async def login(
             }
         )
     except Exception as e:
-        print(f"Login error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
         if isinstance(e, HTTPException):
             raise e
+        logger.error(f"Login error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
 @router.get("/verify")
@@ -65,12 +65,10 @@ async def verify_token(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> Dict[str, Any]:
     try:
-        print("Attempting to verify token")
         user = await auth_service.verify_token(credentials.credentials)
         return JSONResponse(content=user)
     except Exception as e:
-        print(f"Token verification error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.debug("Token verification error: %s", e)
         raise HTTPException(status_code=401, detail="Invalid token")
 
 @router.post("/signup")
@@ -79,7 +77,7 @@ async def signup(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> Dict[str, Any]:
     try:
-        print(f"Received signup request for email: {user_data.email}")
+        logger.debug("Received signup request for email: %s", user_data.email)
         
         # First create the user profile
         user = await user_service.register_user(user_data)
@@ -88,7 +86,7 @@ async def signup(
         
         # Then sign them in to get the access token
         auth_result = await auth_service.sign_in(user_data.email, user_data.password)
-        print(f"Signup successful for email: {user_data.email}")
+        logger.info("Signup successful for email: %s", user_data.email)
         
         return JSONResponse(content={
             "user": user,
@@ -97,11 +95,10 @@ async def signup(
         })
         
     except HTTPException as e:
-        print(f"HTTP error during signup: {str(e.detail)}")
+        logger.warning(f"HTTP error during signup: {str(e.detail)}")
         raise e
     except Exception as e:
-        print(f"Unexpected error in signup route: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"Unexpected error in signup route: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/logout")
@@ -110,12 +107,10 @@ async def logout(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> Dict[str, Any]:
     try:
-        print("Processing logout request")
         success = await auth_service.sign_out(credentials.credentials)
         return JSONResponse(content={"success": success})
     except Exception as e:
-        print(f"Logout error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"Logout error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error during logout")
 
 @router.post("/reset-password")
@@ -124,12 +119,11 @@ async def reset_password(
     auth_service: AuthService = Depends(get_auth_service)
 ) -> Dict[str, Any]:
     try:
-        print(f"Processing password reset for email: {request.email}")
+        logger.debug("Processing password reset for email: %s", request.email)
         success = await auth_service.reset_password(request.email)
         return JSONResponse(content={"success": success})
     except Exception as e:
-        print(f"Password reset error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"Password reset error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error sending password reset email")
 
 @router.get("/livekit-token")
@@ -155,5 +149,5 @@ async def get_livekit_token(
             "ws_url": settings.LIVEKIT_WS_URL
         }
     except Exception as e:
-        traceback.print_exc()
+        logger.error(f"Error generating LiveKit token: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -2,13 +2,15 @@ from fastapi import APIRouter, WebSocket, Depends, HTTPException, WebSocketDisco
 from typing import List, Dict, Any, Optional
 import json
 import logging
+import uuid
 from app.services.auth.auth_service import AuthService
 from app.api.dependencies.auth import get_auth_service
-from app.services.voice.audio_processor import AudioProcessor
-from app.services.voice.tts_service import tts_service
+from app.services.voice.voice_session import VoiceSession
+from app.services.voice.frames import FRAME_VERSION
+from app.services.voice.admission import BUSY_CLOSE_CODE, session_admission
 from app.services.voice.livekit_service import livekit_service
-from app.services.chat.conversation_manager import conversation_manager
 from app.core.config import get_settings
+from app.core.logging_config import set_log_context
 import traceback
 from pydantic import BaseModel
 from starlette.websockets import WebSocketState
@@ -41,8 +43,7 @@ async def create_room(
         # Verify token and get user ID
         try:
             verified_user = await auth_service.verify_token(token)
-            logger.info(f"Verified user: {verified_user}")
-            logger.info(f"Request user_id: {request.user_id}")
+            logger.debug("Verified user %s for room request by %s", verified_user['id'], request.user_id)
             
             if verified_user['id'] != request.user_id:
                 logger.error(f"User ID mismatch: token user {verified_user['id']} != request user {request.user_id}")
@@ -75,9 +76,26 @@ async def create_room(
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = Query(...),
+    stt: Optional[str] = Query(None),
+    encoding: Optional[str] = Query(None),
+    tts: Optional[str] = Query(None),
+    frames: Optional[int] = Query(None),
     auth_service: AuthService = Depends(get_auth_service),
 ):
     user_id = None
+    # Clients that send audio as it is recorded opt in with ?stt=stream (&encoding=linear16 for raw PCM)
+    streaming_stt = stt == "stream"
+    # and to receive response audio while it is synthesized with ?tts=stream
+    streaming_tts = tts == "stream"
+    # Clients that understand binary frames ask for their version with ?frames=1
+    framed = frames == FRAME_VERSION
+
+    # Shed load before spending an auth round trip on a session this process can't serve
+    if session_admission.admit() is not None:
+        # Close codes only reach the client after the handshake, so accept and close right away
+        await websocket.accept()
+        await websocket.close(code=BUSY_CLOSE_CODE, reason=f"retry_after={session_admission.retry_after_seconds()}")
+        return
     try:
         # Verify token before accepting connection
         user = await auth_service.verify_token(token)
@@ -89,7 +107,7 @@ async def websocket_endpoint(
         await websocket.accept()
         
         user_id = user.get("id")
-        audio_processor = AudioProcessor()
+        set_log_context(session_id=uuid.uuid4().hex[:12], user_id=user_id)
 
         try:
             # Store the connection
@@ -103,72 +121,24 @@ async def websocket_endpoint(
             active_connections[user_id] = websocket
             
             # Send success message
-            await websocket.send_json({
+            connected = {
                 "type": "connected",
                 "message": "Connected successfully"
-            })
+            }
+            if frames is not None:
+                # 0 tells a client asking for an unsupported version to expect JSON messages
+                connected["protocol"] = FRAME_VERSION if framed else 0
+            await websocket.send_json(connected)
+            
+            await VoiceSession(
+                websocket,
+                user_id,
+                streaming_stt=streaming_stt,
+                stream_audio=streaming_tts,
+                encoding=encoding,
+                frames=framed
+            ).run()
             
-            # Handle incoming messages
-            while True:
-                try:
-                    # Receive binary audio data
-                    data = await websocket.receive_bytes()
-                    
-                    # Process audio to text
-                    text = await audio_processor.process_audio(data)
-                    if not text:
-                        continue
-                        
-                    await websocket.send_json({
-                        "type": "transcription",
-                        "text": text
-                    })
-                    
-                    # Get AI response
-                    response = await conversation_manager.process_query(user_id, text)
-                    
-                    # Send text response
-                    await websocket.send_json({
-                        "type": "response",
-                        "text": response.text,
-                        "properties": response.properties if hasattr(response, 'properties') else None
-                    })
-
-                    # Convert response to speech and send audio
-                    try:
-                        audio_data = await tts_service.text_to_speech(response.text)
-                        if audio_data and len(audio_data) > 0:
-                            logger.info(f"Sending audio response of size: {len(audio_data)} bytes")
-                            await websocket.send_bytes(audio_data)
-                        else:
-                            logger.error("TTS service returned empty audio data")
-                            await websocket.send_json({
-                                "type": "error",
-                                "message": "Failed to generate audio response"
-                            })
-                    except ValueError as ve:
-                        logger.error(f"TTS error: {str(ve)}")
-                        await websocket.send_json({
-                            "type": "error",
-                            "message": str(ve)
-                        })
-                    except Exception as e:
-                        logger.error(f"Unexpected TTS error: {str(e)}")
-                        await websocket.send_json({
-                            "type": "error",
-                            "message": "Failed to generate audio response"
-                        })
-                    
-                except WebSocketDisconnect:
-                    logger.info(f"Client disconnected: {user_id}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error processing message: {str(e)}")
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": "Error processing message"
-                    })
-                    
         except WebSocketDisconnect:
             logger.info(f"Client disconnected during auth: {user_id}")
         except Exception as e:
@@ -179,6 +149,7 @@ async def websocket_endpoint(
         logger.error(f"Failed to initialize WebSocket connection: {str(e)}")
         await websocket.close(code=4000, reason="Connection initialization failed")
     finally:
+        session_admission.release()
         if user_id and user_id in active_connections:
             del active_connections[user_id]
         logger.info(f"Connection closed for user: {user_id}")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, WebSocket, HTTPException, Depends
 from app.services.voice.twilio_service import twilio_service
 from app.services.voice.livekit_service import livekit_service
-from app.services.voice.audio_processor import audio_processor
+from app.services.voice.audio_processor import AudioProcessor
 from app.core.config import get_settings
 from typing import Optional
 import uuid
@@ -46,7 +46,7 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time audio streaming"""
     await websocket.accept()
     try:
-        await audio_processor.process_realtime_audio(websocket)
+        await AudioProcessor().process_realtime_audio(websocket)
     except Exception as e:
         await websocket.close(code=1000, reason=str(e))
     finally:
@@ -3,24 +3,86 @@ from typing import List
 from functools import lru_cache
 import logging
 
+logger = logging.getLogger(__name__)
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "AI Voice Agent"
     VERSION: str = "1.0.0"
     DESCRIPTION: str = "AI-powered voice agent for real estate inquiries and recommendations"
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line, for log shipping)
+    DEBUG_TRACE: bool = False  # Attach per-stage latency traces to voice responses
     
     # Database
     SUPABASE_URL: str
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_KEY: str
     SUPABASE_JWT_SECRET: str
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = 20  # Shared connection pool across all Supabase clients
+    SUPABASE_HTTP_MAX_KEEPALIVE: int = 10
+    SUPABASE_HTTP_TIMEOUT: float = 10.0
+    PROVIDER_HTTP_MAX_CONNECTIONS: int = 20  # Per provider (ElevenLabs, Deepgram, LiveKit, OpenAI)
+    PROVIDER_HTTP_MAX_KEEPALIVE: int = 10
+    PROVIDER_HTTP_CONNECT_TIMEOUT: float = 5.0
+    PROVIDER_HTTP_READ_TIMEOUT: float = 30.0  # Long enough for a full TTS synthesis
+    DATABASE_BACKEND: str = "supabase"  # "supabase" (PostgREST) or "postgres" (asyncpg pool)
+    DATABASE_URL: str | None = None  # Direct Postgres connection string for the asyncpg backend
+    DATABASE_POOL_MIN_SIZE: int = 2
+    DATABASE_POOL_MAX_SIZE: int = 10
+    PROPERTY_CACHE_SIZE: int = 2048  # Max property rows held by the read-through cache
+    PROPERTY_CACHE_TTL: int = 300  # Seconds before a cached property is reloaded
+    CONVERSATION_BATCH_SIZE: int = 50  # Conversation rows per multi-row insert
+    CONVERSATION_FLUSH_INTERVAL: float = 2.0  # Max seconds a conversation row waits before flushing
+    CONVERSATION_JOURNAL_PATH: str = "var/conversation_journal.jsonl"  # Spill file used while the database is down
+    TTS_CACHE_DIR: str = "var/tts_cache"  # On-disk blob store for synthesized phrases
+    TTS_CACHE_MEMORY_BYTES: int = 64 * 1024 * 1024
+    TTS_CACHE_DISK_BYTES: int = 1024 * 1024 * 1024
+    TTS_CACHE_PREWARM: bool = False  # Synthesize canned replies at startup (uses ElevenLabs credits once)
+    TTS_MAX_CONCURRENCY: int = 3  # Concurrent ElevenLabs requests per process; keep within the plan's limit
+    TTS_SENTENCE_MIN_CHARS: int = 40  # Shorter pieces are synthesized together with the next sentence
     
     # AI Services
     GOOGLE_API_KEY: str | None = None  # For Gemini
     ELEVENLABS_API_KEY: str | None = None
     ELEVENLABS_VOICE_ID: str = "21m00Tcm4TlvDq8ikWAM"  # Default voice ID
     DEEPGRAM_API_KEY: str | None = None
+    DEEPGRAM_LIVE_URL: str = "wss://api.deepgram.com/v1/listen"
+    DEEPGRAM_MODEL: str = "nova-2"
+    STT_ENDPOINTING_MS: int = 300  # Silence before Deepgram marks speech as final
+    STT_UTTERANCE_END_MS: int = 1000  # Word gap that ends an utterance even in background noise
+    MAX_UTTERANCE_BYTES: int = 2 * 1024 * 1024  # About five minutes of webm/opus per recording
+    STT_SAMPLE_RATE: int = 16000  # Raw PCM streams are 16-bit mono at this rate
+    VAD_FRAME_MS: int = 20
+    VAD_ENERGY_THRESHOLD: float = 0.01  # Frame RMS (full scale = 1.0) counted as speech, about -40 dBFS
+    VAD_ZCR_THRESHOLD: float = 0.3  # Zero-crossing rate that lets quieter frames count as fricatives
+    VAD_HANGOVER_MS: int = 500  # Trailing silence kept with speech before the utterance is ended
+    AUDIO_TARGET_PEAK: float = 0.9  # Peak level recordings are normalized to before STT, about -1 dBFS
+    AUDIO_TRIM_PAD_MS: int = 100  # Silence kept around the speech when trimming a recording
+    STT_UPLOAD_BITRATE: int = 24000  # Opus bitrate of normalized recordings uploaded for transcription
+    VOICE_TURN_QUEUE_SIZE: int = 4  # Utterances waiting for an answer per connection
+    VOICE_AUDIO_QUEUE_SIZE: int = 100  # Audio chunks waiting for live transcription per connection (~10 s of 100 ms chunks)
+    VOICE_OUTBOX_SIZE: int = 64  # Messages and audio frames waiting to be written per connection
+    VOICE_SEND_TIMEOUT_SECONDS: float = 10.0  # A client that doesn't read for this long is disconnected
+    VOICE_MAX_SESSIONS: int = 100  # Concurrent voice sessions per process
+    VOICE_MAX_TURNS_IN_FLIGHT: int = 40  # Turns being answered across all sessions before new ones are refused
+    VOICE_MAX_LOOP_LAG_MS: int = 250  # Event loop lag beyond which new sessions are refused
+    VOICE_LOOP_LAG_INTERVAL_MS: int = 500
+    VOICE_RETRY_AFTER_SECONDS: int = 5  # Base retry delay sent to refused clients, jittered up to 2x
+
+    # Property search
+    SPECULATIVE_SEARCH: bool = False  # Run structured and semantic search concurrently
+    PROPERTY_FACETS_TTL: int = 300  # Seconds before facet counts are reloaded from property_facets
+
+    # Conversation
+    INTENT_ROUTER_ENABLED: bool = True  # Answer trivial intents locally instead of calling the LLM
+    INTENT_CONFIDENCE_THRESHOLD: float = 0.8
+
+    # Auth
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # Verified tokens kept in memory
+    AUTH_TOKEN_CACHE_TTL: int = 60  # Seconds before a token is verified again
+    AUTH_REMOTE_VERIFY: bool = False  # Also check tokens with Supabase Auth to catch revoked sessions
     
     # CORS Settings
     ALLOWED_HOSTS: List[str] = [
@@ -59,8 +121,8 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     try:
         settings = Settings()
-        print("Settings loaded successfully")
+        logger.debug("Settings loaded successfully")
         return settings
     except Exception as e:
-        print(f"Error loading settings: {e}")
+        logger.error(f"Error loading settings: {e}")
         raise
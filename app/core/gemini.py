@@ -0,0 +1,27 @@
+from typing import Any, Dict
+import logging
+import threading
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+_models: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+def gemini_model(name: str = DEFAULT_MODEL) -> Any:
+    """Process-wide Gemini model, created on first use.
+
+    The SDK is imported here rather than at module level, so services holding a model
+    can be imported (and tested) without google.generativeai or an API key.
+    """
+    if name not in _models:
+        with _lock:
+            if name not in _models:
+                import google.generativeai as genai
+                genai.configure(api_key=settings.GOOGLE_API_KEY)
+                _models[name] = genai.GenerativeModel(name)
+                logger.info(f"Initialized Gemini model {name}")
+    return _models[name]
@@ -0,0 +1,48 @@
+from typing import Dict, Any, Optional, Callable, Awaitable
+from datetime import datetime, timezone
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class HealthStatus:
+    def __init__(self, name: str):
+        self.name = name
+        self.connected = False
+        self.last_checked: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+            "latency_ms": self.latency_ms
+        }
+
+async def probe_with_retry(
+    status: HealthStatus,
+    probe: Callable[[], Awaitable[Any]],
+    retries: int = 3,
+    backoff: float = 0.5
+) -> bool:
+    """Run a connectivity probe with exponential backoff, recording the outcome on `status`"""
+    for attempt in range(retries):
+        started = time.perf_counter()
+        try:
+            await probe()
+            status.connected = True
+            status.last_error = None
+            status.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            return True
+        except Exception as e:
+            status.connected = False
+            status.last_error = str(e)
+            logger.warning(f"{status.name} health check failed (attempt {attempt + 1}/{retries}): {str(e)}")
+            if attempt < retries - 1:
+                await asyncio.sleep(backoff * 2 ** attempt)
+        finally:
+            status.last_checked = datetime.now(timezone.utc).isoformat()
+    return False
@@ -0,0 +1,126 @@
+from typing import Any, Dict, Iterable
+import logging
+import time
+import httpx
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+http_client_requests_total = metrics.counter("http_client_requests_total")
+http_client_request_seconds = metrics.histogram("http_client_request_seconds")
+http_client_in_flight = metrics.gauge("http_client_in_flight")
+http_client_pool_connections = metrics.gauge("http_client_pool_connections")
+
+# Outbound providers that get a pooled client from `http_clients`
+PROVIDERS = ("elevenlabs", "deepgram", "livekit", "openai")
+
+def record_pool(name: str, pool: Any):
+    """Publish open/idle connection counts for an httpcore connection pool"""
+    # httpcore doesn't expose pool stats publicly; skip quietly if its internals change
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return
+    idle = sum(1 for connection in connections if connection.is_idle())
+    http_client_pool_connections.set(idle, client=name, state="idle")
+    http_client_pool_connections.set(len(connections) - idle, client=name, state="active")
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """Pooled sync transport that records request latency, in-flight requests and pool usage.
+
+    Latency is measured to the response headers; streamed bodies are read afterwards.
+    """
+
+    def __init__(self, name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        http_client_in_flight.inc(client=self.name)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = super().handle_request(request)
+            status = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            http_client_in_flight.dec(client=self.name)
+            http_client_request_seconds.observe(time.perf_counter() - started, client=self.name)
+            http_client_requests_total.inc(client=self.name, status=status)
+            record_pool(self.name, self._pool)
+
+class AsyncInstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Async counterpart of InstrumentedTransport, recording the same metrics"""
+
+    def __init__(self, name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        http_client_in_flight.inc(client=self.name)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await super().handle_async_request(request)
+            status = f"{response.status_code // 100}xx"
+            return response
+        finally:
+            http_client_in_flight.dec(client=self.name)
+            http_client_request_seconds.observe(time.perf_counter() - started, client=self.name)
+            http_client_requests_total.inc(client=self.name, status=status)
+            record_pool(self.name, self._pool)
+
+class HTTPClientRegistry:
+    """Application-scoped async HTTP clients, one keep-alive HTTP/2 pool per provider.
+
+    Clients are created by `open` at startup (or on first use) and must be used from
+    the event loop that created them; `aclose` releases every pool on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def open(self, names: Iterable[str] = PROVIDERS):
+        """Create the clients for `names` up front"""
+        for name in names:
+            self.client(name)
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """Pooled client for a provider, created on first use"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                transport=AsyncInstrumentedTransport(name, http2=True, limits=self.limits),
+                timeout=self.timeout
+            )
+            self._clients[name] = client
+        return client
+
+    async def aclose(self):
+        """Close every pool"""
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing {name} HTTP client: {str(e)}")
+
+# Global provider HTTP clients
+http_clients = HTTPClientRegistry(
+    max_connections=settings.PROVIDER_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.PROVIDER_HTTP_MAX_KEEPALIVE,
+    connect_timeout=settings.PROVIDER_HTTP_CONNECT_TIMEOUT,
+    read_timeout=settings.PROVIDER_HTTP_READ_TIMEOUT
+)
@@ -0,0 +1,136 @@
+from typing import Dict, Any, Optional, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+# Correlation ids (request_id, session_id, user_id) attached to every record emitted in this context
+log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+CONTEXT_FIELDS = ("request_id", "session_id", "user_id")
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s %(session_id)s] %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+@contextmanager
+def bind_log_context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """Attach correlation ids to every log record emitted inside the block"""
+    token = log_context.set({**log_context.get(), **fields})
+    try:
+        yield log_context.get()
+    finally:
+        log_context.reset(token)
+
+def set_log_context(**fields: Any):
+    """Attach correlation ids for the rest of the current task, e.g. a WebSocket session"""
+    log_context.set({**log_context.get(), **fields})
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto the record; runs in the emitting thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field, "-"))
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in N records that pass `extra={"sample_every": N}`, counted per call site.
+
+    Lets per-chunk or per-turn messages stay enabled under load without flooding the
+    handlers; kept records carry `sampled` with the number they stand for.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counts: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = getattr(record, "sample_every", None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        with self._lock:
+            seen = self._counts.get(key, 0)
+            self._counts[key] = seen + 1
+        record.sampled = every
+        return seen % every == 0
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves line formatting to the listener thread.
+
+    msg and args are merged in the caller, so the record holds the values as they were
+    when it was logged (args can be mutable objects the caller keeps changing), and the
+    exception text is rendered while the traceback is still valid. Timestamps, context
+    fields and the output format are applied by the listener's formatter, unlike the
+    stock handler, which formats the whole line in the caller.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the correlation ids as top-level fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, "-")
+            if value != "-":
+                entry[field] = value
+        if getattr(record, "sampled", None):
+            entry["sampled"] = record.sampled
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+def setup_logging(level: str = "INFO", fmt: str = "text") -> logging.handlers.QueueListener:
+    """Route all logging through a queue drained by a background thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,127 @@
+from typing import Dict, List, Any, Optional, Tuple
+import bisect
+import threading
+
+# Latency buckets in seconds, tuned for voice-turn stages (sub-10ms cache hits up to multi-second LLM calls)
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Build a hashable, order-independent key from metric labels"""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class Histogram:
+    def __init__(self, name: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any):
+        """Record a single observation for the given label set"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0, "max": 0.0}
+                self._series[key] = series
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["max"] = max(series["max"], value)
+
+    def count(self, **labels: Any) -> int:
+        """Number of observations recorded for the given label set"""
+        series = self._series.get(_label_key(labels))
+        return series["count"] if series else 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return a JSON-serializable view of every label set"""
+        with self._lock:
+            result = []
+            for key, series in self._series.items():
+                cumulative = 0
+                buckets = {}
+                for bound, bucket_count in zip(self.buckets, series["counts"]):
+                    cumulative += bucket_count
+                    buckets[str(bound)] = cumulative
+                buckets["+Inf"] = series["count"]
+                result.append({
+                    "labels": dict(key),
+                    "count": series["count"],
+                    "sum": series["sum"],
+                    "max": series["max"],
+                    "buckets": buckets
+                })
+            return result
+
+class Counter:
+    def __init__(self, name: str):
+        self.name = name
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any):
+        """Increment the counter for the given label set"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Current value for the given label set"""
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+class Gauge(Counter):
+    def set(self, value: float, **labels: Any):
+        """Set the gauge to an absolute value for the given label set"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: Any):
+        """Decrement the gauge for the given label set"""
+        self.inc(-amount, **labels)
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory, kind: type):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            elif type(metric) is not kind:
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def histogram(self, name: str, buckets: Optional[Tuple[float, ...]] = None) -> Histogram:
+        """Get or create a histogram by name"""
+        return self._get_or_create(name, lambda: Histogram(name, buckets or DEFAULT_BUCKETS), Histogram)
+
+    def counter(self, name: str) -> Counter:
+        """Get or create a counter by name"""
+        return self._get_or_create(name, lambda: Counter(name), Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        """Get or create a gauge by name"""
+        return self._get_or_create(name, lambda: Gauge(name), Gauge)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable view of all registered metrics"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {
+            name: {"type": type(metric).__name__.lower(), "series": metric.snapshot()}
+            for name, metric in sorted(metrics.items())
+        }
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -1,13 +1,121 @@
-from supabase import create_client
+from typing import Dict, Optional
+import logging
+import threading
+import httpx
+from supabase import create_client, Client, ClientOptions
+from supabase_auth import SyncGoTrueClient
+from postgrest import SyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
 from app.core.config import get_settings
-from typing import Optional
-
-def get_supabase_client(auth_token: Optional[str] = None):
-    """Get a Supabase client instance with optional auth token"""
-    settings = get_settings()
-    client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-    
-    if auth_token:
-        client.auth.set_session(auth_token, auth_token)
-    
-    return client
+from app.core.http import InstrumentedTransport
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+class SupabaseClientRegistry:
+    """Process-wide Supabase clients sharing one pooled HTTP transport.
+
+    `client(role)` returns a long-lived supabase client per role: "anon" for data
+    access and "service" for admin operations. `for_user(token)` returns a
+    lightweight PostgREST client that sends the caller's JWT over the same connection
+    pool, so row level security applies without building a client per request.
+    `auth_client()` returns a throwaway GoTrue client for sign-up/sign-in flows: signing
+    in swaps a client's session and auth headers to the user's, which must never
+    happen on a client shared by the whole process.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        anon_key: str,
+        service_key: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 10.0
+    ):
+        self.url = url.rstrip("/")
+        self.keys = {"anon": anon_key, "service": service_key}
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.timeout = timeout
+        self._http_client: Optional[httpx.Client] = None
+        self._clients: Dict[str, Client] = {}
+        # Clients are first used from worker threads (asyncio.to_thread), so creation is locked
+        self._lock = threading.Lock()
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Shared HTTP/2 connection pool used by every Supabase client"""
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(
+                        transport=InstrumentedTransport("supabase", http2=True, limits=self.limits),
+                        timeout=self.timeout,
+                        follow_redirects=True
+                    )
+        return self._http_client
+
+    def client(self, role: str = "anon") -> Client:
+        """Long-lived Supabase client for a role, created on first use"""
+        if role not in self.keys:
+            raise ValueError(f"Unknown Supabase client role: {role}")
+        if role not in self._clients:
+            http_client = self.http_client
+            with self._lock:
+                if role not in self._clients:
+                    logger.info(f"Initializing Supabase {role} client with URL: {self.url}")
+                    self._clients[role] = create_client(
+                        self.url,
+                        self.keys[role],
+                        options=ClientOptions(
+                            httpx_client=http_client,
+                            auto_refresh_token=False,
+                            persist_session=False
+                        )
+                    )
+        return self._clients[role]
+
+    def for_user(self, auth_token: Optional[str] = None) -> SyncPostgrestClient:
+        """PostgREST client that acts as the user holding `auth_token` (anon if None)"""
+        anon_key = self.keys["anon"]
+        return SyncPostgrestClient(
+            f"{self.url}/rest/v1",
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apikey": anon_key,
+                "Authorization": f"Bearer {auth_token or anon_key}",
+            },
+            http_client=self.http_client
+        )
+
+    def auth_client(self) -> SyncGoTrueClient:
+        """GoTrue client for one auth call; any session it signs into dies with it"""
+        anon_key = self.keys["anon"]
+        return SyncGoTrueClient(
+            url=f"{self.url}/auth/v1",
+            headers={"apikey": anon_key, "Authorization": f"Bearer {anon_key}"},
+            auto_refresh_token=False,
+            persist_session=False,
+            http_client=self.http_client
+        )
+
+    def close(self):
+        """Close the shared connection pool"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._clients.clear()
+
+# Global Supabase client registry
+supabase_clients = SupabaseClientRegistry(
+    settings.SUPABASE_URL,
+    settings.SUPABASE_ANON_KEY,
+    settings.SUPABASE_SERVICE_KEY,
+    max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE,
+    timeout=settings.SUPABASE_HTTP_TIMEOUT
+)
@@ -0,0 +1,80 @@
+from typing import Dict, List, Any, Optional, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import time
+from app.core.metrics import metrics
+
+stage_latency = metrics.histogram("conversation_stage_seconds")
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+class Span:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.outcome = "ok"
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+
+    def finish(self):
+        """Stop the span and record its duration"""
+        self.duration = time.perf_counter() - self.started
+        stage_latency.observe(self.duration, stage=self.stage, outcome=self.outcome)
+
+    def to_dict(self, trace_start: float) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "outcome": self.outcome,
+            "offset_ms": round((self.started - trace_start) * 1000, 2),
+            "duration_ms": round((self.duration or 0.0) * 1000, 2)
+        }
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the trace for debug payloads"""
+        return {
+            "name": self.name,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "spans": [span.to_dict(self.started) for span in self.spans if span.duration is not None]
+        }
+
+@contextmanager
+def trace(name: str) -> Iterator[Trace]:
+    """Start a trace that collects every span opened within the current context"""
+    current = Trace(name)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+@contextmanager
+def span(stage: str) -> Iterator[Span]:
+    """Time a stage, recording it on the active trace and the stage latency histogram.
+
+    Callers may set `span.outcome` (e.g. "hit", "empty") to refine the recorded outcome;
+    an exception escaping the block marks it as "error" (or "cancelled").
+    """
+    current = Span(stage)
+    active_trace = _current_trace.get()
+    if active_trace is not None:
+        active_trace.spans.append(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.outcome = "cancelled"
+        raise
+    except BaseException:
+        current.outcome = "error"
+        raise
+    finally:
+        current.finish()
+
+def get_current_trace() -> Optional[Trace]:
+    """Return the trace active in the current context, if any"""
+    return _current_trace.get()
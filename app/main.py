@@ -1,26 +1,63 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.api.routes import auth, voice
 from app.api.routes.recommendations import router as recommendations_router
 from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.logging_config import setup_logging, shutdown_logging, bind_log_context
+from app.core.supabase import supabase_clients
+from app.core.http import http_clients
 from app.core.database import engine, Base
+from app.services.db.postgres_service import postgres_service
+from app.services.db.database_service import database_service
+from app.services.db.conversation_writer import conversation_writer
+from app.services.chat.conversation_manager import CANNED_RESPONSES
+from app.services.voice.tts_service import tts_service
+from app.services.voice.admission import session_admission
+from contextlib import asynccontextmanager
+import asyncio
 import logging
+import uuid
 
 # Initialize settings and logging
 settings = get_settings()
-logging.basicConfig(level=settings.LOG_LEVEL)
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown"""
+    # Probe the database in the background so a slow or flaky backend doesn't block startup
+    readiness_probe = asyncio.create_task(database_service.check_health())
+    http_clients.open()
+    await conversation_writer.start()
+    session_admission.start()
+    tts_prewarm = None
+    if settings.TTS_CACHE_PREWARM:
+        tts_prewarm = asyncio.create_task(tts_service.prewarm(CANNED_RESPONSES))
+    yield
+    readiness_probe.cancel()
+    if tts_prewarm is not None:
+        tts_prewarm.cancel()
+    await session_admission.stop()
+    await conversation_writer.stop()
+    if settings.DATABASE_BACKEND == "postgres":
+        await postgres_service.close()
+    supabase_clients.close()
+    await http_clients.aclose()
+    shutdown_logging()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description=settings.DESCRIPTION,
     docs_url="/api/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/api/redoc" if settings.ENVIRONMENT != "production" else None,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -34,6 +71,15 @@ app.add_middleware(
     max_age=3600,
 )
 
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Tag every log line emitted while handling a request with its request id"""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    with bind_log_context(request_id=request_id):
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception handler caught: {exc}")
@@ -55,3 +101,20 @@ async def root() -> dict:
         "version": settings.VERSION,
         "environment": settings.ENVIRONMENT
     }
+
+@app.get("/health")
+async def health() -> JSONResponse:
+    """Readiness check reporting database connectivity"""
+    ready = await database_service.check_health(retries=1)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ok" if ready else "unavailable",
+            "database": {"backend": settings.DATABASE_BACKEND, **database_service.health.to_dict()}
+        }
+    )
+
+@app.get("/metrics")
+async def get_metrics() -> dict:
+    """In-process latency histograms and counters"""
+    return metrics.snapshot()
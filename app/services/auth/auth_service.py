@@ -1,12 +1,29 @@
 from fastapi import HTTPException
-from supabase import create_client, Client
+from supabase import Client
 from app.core.config import get_settings
+from app.core.supabase import supabase_clients
+from app.core.metrics import metrics
 from typing import Optional, Dict, Any
-import traceback
+from cachetools import TTLCache
 from datetime import datetime
+import asyncio
+import hashlib
+import logging
+import time
+import jwt
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+auth_verifications_total = metrics.counter("auth_verifications_total")
+
+# Verified users keyed by token hash, shared by the per-request AuthService instances
+verified_tokens: TTLCache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+
+def _token_key(token: str) -> str:
+    """Cache key for a token, so raw bearer tokens aren't kept in memory"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def format_datetime(dt: Optional[datetime]) -> Optional[str]:
     """Convert datetime to ISO format string"""
     return dt.isoformat() if dt else None
@@ -14,31 +31,21 @@ def format_datetime(dt: Optional[datetime]) -> Optional[str]:
 class AuthService:
     def __init__(self):
         try:
-            print(f"Initializing Supabase clients with URL: {settings.SUPABASE_URL}")
-            # Initialize two clients: one with anon key for auth, one with service role for admin ops
-            self.auth_client: Client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_ANON_KEY
-            )
-            self.admin_client: Client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_SERVICE_KEY
-            )
-            print("Supabase clients initialized successfully")
+            # Shared service role client for admin ops; auth flows get a client per call
+            # (supabase_clients.auth_client) so no user session lives on a shared client
+            self.admin_client: Client = supabase_clients.client("service")
         except Exception as e:
-            print(f"Error initializing Supabase clients: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.error(f"Error initializing Supabase clients: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Error initializing auth service")
 
     async def sign_up(self, email: str, password: str) -> Dict[str, Any]:
         try:
-            print(f"Attempting to sign up user with email: {email}")
+            logger.debug("Attempting to sign up user with email: %s", email)
             data = {
                 "email": email,
                 "password": password
             }
-            response = self.auth_client.auth.sign_up(data)
-            print(f"Sign up response received: {response}")
+            response = supabase_clients.auth_client().sign_up(data)
             
             if not response or not response.user:
                 raise HTTPException(status_code=400, detail="Invalid response from auth service")
@@ -46,8 +53,7 @@ class AuthService:
             user = response.user
             session = response.session
             
-            print(f"User created with ID: {user.id if user else 'None'}")
-            print(f"Session created: {session is not None}")
+            logger.info(f"User created with ID: {user.id}, session created: {session is not None}")
             
             # If email confirmation is required
             if user and not user.email_confirmed_at:
@@ -72,16 +78,16 @@ class AuthService:
             }
             
         except Exception as e:
-            print(f"Error in sign_up: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
             if isinstance(e, HTTPException):
+                logger.warning(f"Sign up rejected: {e.detail}")
                 raise e
+            logger.error(f"Error in sign_up: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=str(e))
 
     async def sign_in(self, email: str, password: str) -> Dict[str, Any]:
         try:
-            print(f"Attempting to sign in user with email: {email}")
-            response = self.auth_client.auth.sign_in_with_password({
+            logger.debug("Attempting to sign in user with email: %s", email)
+            response = supabase_clients.auth_client().sign_in_with_password({
                 "email": email,
                 "password": password
             })
@@ -103,55 +109,88 @@ class AuthService:
             }
             
         except Exception as e:
-            print(f"Error in sign_in: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
             if isinstance(e, HTTPException):
                 raise e
+            logger.warning(f"Error in sign_in: {e}")
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
     async def verify_token(self, token: str) -> Dict[str, Any]:
+        """Verify a Supabase access token locally, using cached results for repeat tokens"""
+        # Strip 'Bearer ' prefix if present
+        if isinstance(token, str) and token.startswith('Bearer '):
+            token = token.split(' ')[1]
+            
+        # Validate token format
+        if not token or not isinstance(token, str):
+            raise HTTPException(status_code=401, detail="Invalid token format")
+        
+        key = _token_key(token)
+        cached = verified_tokens.get(key)
+        if cached is not None:
+            user, expires_at = cached
+            if expires_at > time.time():
+                auth_verifications_total.inc(result="cached")
+                return user
+            verified_tokens.pop(key, None)
+        
         try:
-            # Strip 'Bearer ' prefix if present
-            if token.startswith('Bearer '):
-                token = token.split(' ')[1]
-                
-            # Validate token format
-            if not token or not isinstance(token, str):
-                raise HTTPException(status_code=401, detail="Invalid token format")
-                
-            response = self.auth_client.auth.get_user(token)
-            if not response or not response.user:
+            claims = jwt.decode(
+                token,
+                settings.SUPABASE_JWT_SECRET,
+                algorithms=["HS256"],
+                audience=settings.SUPABASE_JWT_AUDIENCE,
+                options={"require": ["exp", "sub", "aud"]}
+            )
+            user = {"id": claims["sub"], "email": claims.get("email")}
+            if settings.AUTH_REMOTE_VERIFY:
+                # Catch revoked sessions; runs once per token per cache TTL
+                user = await self._verify_token_remote(token)
+            auth_verifications_total.inc(result="remote" if settings.AUTH_REMOTE_VERIFY else "local")
+        except jwt.InvalidAlgorithmError:
+            # Projects on asymmetric signing keys can't be checked with the shared secret
+            if not settings.AUTH_REMOTE_VERIFY:
+                auth_verifications_total.inc(result="invalid")
+                logger.warning("Token signed with an unsupported algorithm and remote verification is disabled")
                 raise HTTPException(status_code=401, detail="Invalid token")
-            
-            user = response.user
-            return {
-                "id": user.id,
-                "email": user.email,
-                "email_confirmed_at": format_datetime(user.email_confirmed_at)
-            }
-            
+            claims = jwt.decode(token, options={"verify_signature": False})
+            user = await self._verify_token_remote(token)
+            auth_verifications_total.inc(result="remote")
+        except jwt.InvalidTokenError as e:
+            auth_verifications_total.inc(result="invalid")
+            logger.info(f"Rejected token: {str(e)}")
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        verified_tokens[key] = (user, claims.get("exp", 0))
+        return user
+
+    async def _verify_token_remote(self, token: str) -> Dict[str, Any]:
+        """Check a token against the Supabase auth server"""
+        try:
+            response = await asyncio.to_thread(supabase_clients.auth_client().get_user, token)
         except Exception as e:
-            print(f"Error in verify_token: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
-            # Pass through HTTPException if it's already been raised
-            if isinstance(e, HTTPException):
-                raise e
+            auth_verifications_total.inc(result="invalid")
+            logger.info(f"Remote token verification failed: {str(e)}")
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if not response or not response.user:
+            auth_verifications_total.inc(result="invalid")
             raise HTTPException(status_code=401, detail="Invalid token")
+        
+        # Same shape as a locally verified token, so cached entries don't depend on the path
+        return {"id": response.user.id, "email": response.user.email}
 
     async def sign_out(self, token: str) -> bool:
         try:
-            self.auth_client.auth.sign_out(token)
+            verified_tokens.pop(_token_key(token), None)
+            supabase_clients.auth_client().sign_out(token)
             return True
         except Exception as e:
-            print(f"Error in sign_out: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.error(f"Error in sign_out: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Error during sign out")
 
     async def reset_password(self, email: str) -> bool:
         try:
-            self.auth_client.auth.reset_password_email(email)
+            supabase_clients.auth_client().reset_password_email(email)
             return True
         except Exception as e:
-            print(f"Error in reset_password: {e}")
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.error(f"Error in reset_password: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Error sending password reset email")
\ No newline at end of file
@@ -1,6 +1,6 @@
 from app.core.config import get_settings
 from app.models.user import UserCreate, User
-from supabase import create_client
+from app.core.supabase import supabase_clients
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -17,9 +17,8 @@ def format_datetime(dt: Optional[datetime]) -> Optional[str]:
 
 class UserService:
     def __init__(self):
-        # Initialize two clients: one with anon key for auth, one with service role for admin ops
-        self.auth_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-        self.admin_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+        # Shared service role client for admin ops; sign-up uses a per-call auth client
+        self.admin_client = supabase_clients.client("service")
     
     async def wait_for_user(self, user_id: str, max_retries: int = 5) -> bool:
         """Wait for user to be available in auth system"""
@@ -43,7 +42,7 @@ class UserService:
             logger.info(f"Registering user with email: {user_data.email}")
             
             # Create user in Supabase auth using anon client
-            auth_response = self.auth_client.auth.sign_up({
+            auth_response = supabase_clients.auth_client().sign_up({
                 "email": user_data.email,
                 "password": user_data.password
             })
@@ -1,17 +1,17 @@
 from typing import List, Dict, Any
 import logging
 from app.services.vector_store.pinecone_service import pinecone_service
-import google.generativeai as genai
 from app.core.config import get_settings
+from app.core.gemini import gemini_model
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 class ChatService:
-    def __init__(self):
-        # Initialize Gemini
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+    @property
+    def model(self):
+        # Created on first use
+        return gemini_model()
         
     async def get_response(self, user_query: str) -> str:
         """Get AI response for user query using RAG with Pinecone"""
@@ -55,7 +55,7 @@ class ChatService:
             """
             
             # Get response from Gemini
-            response = await self.model.generate_content(prompt)
+            response = await self.model.generate_content_async(prompt)
             return response.text
             
         except Exception as e:
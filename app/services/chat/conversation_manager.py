@@ -1,29 +1,125 @@
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 from app.services.vector_store.pinecone_service import pinecone_service
-from app.services.db.supabase_service import supabase_service
-import google.generativeai as genai
-from google.generativeai.types import content_types
+from app.services.db.database_service import database_service
+from app.services.db.property_queries import PropertyPage
+from app.services.property.property_cache import property_cache
+from app.services.property.facet_service import facet_service
+from app.services.chat.intent_router import IntentRouter
 from dataclasses import dataclass
 from app.core.config import get_settings
+from app.core.gemini import gemini_model
+from app.core import tracing
+from app.core.metrics import metrics
+import traceback
+import asyncio
+import re
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Number of properties presented per voice turn
+PAGE_SIZE = 6
+
+speculative_search_total = metrics.counter("speculative_search_total")
+speculative_search_saved = metrics.histogram("speculative_search_saved_seconds")
+
 @dataclass
 class ChatResponse:
     text: str
     properties: List[Dict[str, Any]]
+    trace: Optional[Dict[str, Any]] = None
+    intent: Optional[str] = None
+
+# Templated replies for intents that don't need the LLM
+INTENT_RESPONSES = {
+    "greeting": "Hello! I'm Janaki, your real estate assistant. Are you looking to buy or rent a property today?",
+    "thanks": "You're welcome! Let me know if there's anything else I can help you find.",
+    "goodbye": "Thank you for talking with me. Have a great day, and feel free to come back anytime!",
+    "affirm": "Great. Tell me which property you'd like to hear more about, or describe what you're looking for.",
+    "deny": "No problem. Is there anything else I can help you with?",
+}
+NO_MORE_RESULTS_RESPONSE = "That's all the properties I have for those criteria. Would you like to try a different search?"
+ERROR_RESPONSE = "I apologize, but I encountered an error while processing your request. Could you please try again?"
+# Replies repeated verbatim across sessions, worth pre-synthesizing
+CANNED_RESPONSES = [*INTENT_RESPONSES.values(), NO_MORE_RESULTS_RESPONSE, ERROR_RESPONSE]
+
+# Browse-style questions answered from precomputed facets instead of fetching rows. Only
+# filter words may sit between "how many" and the listing noun, so detail questions
+# ("how many bathrooms does the 2 bhk have") aren't taken for counts.
+FACET_COUNT_PATTERN = re.compile(
+    r"\b(how many|number of|count of)\s+"
+    r"(?:(?:\d+|one|two|three|four|five|bhk|bedroom|rental|residential|commercial|agricultural|available|active)\s+){0,3}"
+    r"(propert(y|ies)|listings?|homes|houses|flats|apartments|rentals|plots|offices|shops|bhks?)\b"
+)
+FACET_VALUES_PATTERNS = {
+    "city": re.compile(r"\b(which|what) (cities|locations|areas|places)\b|\bwhere do you have\b"),
+    "state": re.compile(r"\b(which|what) states\b"),
+}
+# Most facet values read out in a single answer
+MAX_FACET_VALUES = 8
+
+# Location mapping with pronunciation and spelling variations
+LOCATION_VARIANTS = {
+    "bangalore": ["bangalore", "bengaluru", "benguluru", "blr", "banglore", "bangalor"],
+    "andhra pradesh": ["andhra pradesh", "andhra", "ap", "andra pradesh", "andra", "andrapradesh"],
+    "telangana": ["telangana", "hyderabad", "hyd", "telengana", "telangana", "telungana"],
+    "tamil nadu": ["tamil nadu", "chennai", "tamilnadu", "tamil nad", "tamilnad"],
+    "kerala": ["kerala", "kochi", "cochin", "trivandrum", "kerela", "karala"],
+    "maharashtra": ["maharashtra", "mumbai", "pune", "maharastra", "maharashtra"],
+    "dewas": ["dewas", "davos", "divas", "devos", "dewos", "dewaz"],  # Added pronunciation variations
+    "orai": ["orai", "oorai", "horai", "orei", "orrai"],  # Added pronunciation variations
+    "himachal pradesh": ["himachal pradesh", "himachal", "hp", "himanchal", "himachal pradesh", "himachalpradesh"]
+}
+LISTING_TYPE_VARIANTS = {
+    "rent": ["rent", "rental", "renting", "lease", "leasing"],
+    "sale": ["sale", "buy", "buying", "purchase", "purchasing", "sell", "selling"]
+}
+PROPERTY_TYPE_VARIANTS = {
+    "agricultural": ["agricultural", "farm", "farming"],
+    "commercial": ["commercial", "office", "retail", "shop"],
+    "residential": ["residential", "house", "home"]
+}
+
+# Words that carry no listing detail, or that the extracted filters already cover; what's
+# left of a query ("villa with a pool") goes to full-text search
+SEARCH_STOPWORDS = frozenset("""
+    a an and any are at can do does find for from get give have i in is it looking look me my near need of on or
+    please search show some that the there these those to want we what which with you bhk bedroom bedrooms
+    property properties listing listings flat flats apartment apartments homes houses
+""".split()) | frozenset(
+    word
+    for vocabulary in (LOCATION_VARIANTS, LISTING_TYPE_VARIANTS, PROPERTY_TYPE_VARIANTS)
+    for variants in vocabulary.values()
+    for variant in variants
+    for word in variant.split()
+)
+
+def text_search_terms(query: str) -> str:
+    """Descriptive words of a query as a websearch OR-query, or "" when nothing is left"""
+    words = [word for word in re.findall(r"[a-z]+", query.lower()) if len(word) > 2 and word not in SEARCH_STOPWORDS]
+    return " or ".join(dict.fromkeys(words))
 
 class ConversationManager:
-    def __init__(self):
-        # Initialize Gemini
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')  # Changed to gemini-pro as it's better for chat
+    def __init__(self, model=None):
+        # Gemini model; the shared one is created on first use
+        self._model = model
         self.conversations: Dict[str, List[Dict[str, str]]] = {}
         # Store last filtered properties for each user
         self.last_properties: Dict[str, List[Dict[str, Any]]] = {}
+        # Filters and keyset cursor of the last structured search, served by "show more"
+        self.next_cursors: Dict[str, Tuple[Dict[str, Any], Optional[str]]] = {}
+        # Last response per user, served by "repeat that"
+        self.last_responses: Dict[str, ChatResponse] = {}
+        self.intent_router = (
+            IntentRouter(confidence_threshold=settings.INTENT_CONFIDENCE_THRESHOLD)
+            if settings.INTENT_ROUTER_ENABLED else None
+        )
         
+    @property
+    def model(self):
+        return self._model or gemini_model()
+
     def _get_conversation_history(self, user_id: str) -> List[Dict[str, str]]:
         """Get conversation history for a user"""
         if user_id not in self.conversations:
@@ -35,68 +131,255 @@ class ConversationManager:
         history = self._get_conversation_history(user_id)
         history.append({"role": role, "content": content})
         
-    async def _search_properties(self, filters: Dict[str, Any], user_id: str, is_followup: bool = False) -> List[Dict[str, Any]]:
+    async def _search_properties(
+        self,
+        filters: Dict[str, Any],
+        user_id: str,
+        is_followup: bool = False,
+        query: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """Search for properties using filters"""
         try:
-            logger.info(f"Searching properties with filters: {filters}")
+            logger.debug("Searching properties with filters: %s", filters)
             
             # If this is a follow-up query and we have previous results
             if is_followup and user_id in self.last_properties:
-                logger.info(f"Filtering from previous results with filters: {filters}")
-                previous_properties = self.last_properties[user_id]
-                logger.info(f"Previous properties count: {len(previous_properties)}")
-                filtered_properties = []
-                
-                for prop in previous_properties:
-                    matches = True
-                    for key, value in filters.items():
-                        if key == 'property_type':
-                            prop_type = str(prop.get('type', '') or prop.get('property_type', '')).lower()
-                            filter_type = value.lower()
-                            logger.info(f"Comparing property type: {prop_type} with filter: {filter_type}")
-                            if not prop_type or prop_type != filter_type:
+                with tracing.span("followup_filter") as stage:
+                    logger.debug("Filtering from previous results with filters: %s", filters)
+                    previous_properties = self.last_properties[user_id]
+                    logger.debug("Previous properties count: %s", len(previous_properties))
+                    filtered_properties = []
+                    
+                    for prop in previous_properties:
+                        matches = True
+                        for key, value in filters.items():
+                            if key == 'property_type':
+                                prop_type = str(prop.get('type', '') or prop.get('property_type', '')).lower()
+                                filter_type = value.lower()
+                                logger.debug("Comparing property type: %s with filter: %s", prop_type, filter_type)
+                                if not prop_type or prop_type != filter_type:
+                                    matches = False
+                                    break
+                            elif key in prop and prop[key] != value:
                                 matches = False
                                 break
-                        elif key in prop and prop[key] != value:
-                            matches = False
-                            break
-                    if matches:
-                        filtered_properties.append(prop)
-                
-                logger.info(f"Filtered properties count: {len(filtered_properties)}")
-                if filtered_properties:
-                    # Update last properties with filtered results
-                    self.last_properties[user_id] = filtered_properties
-                return filtered_properties
+                        if matches:
+                            filtered_properties.append(prop)
+                    
+                    logger.debug("Filtered properties count: %s", len(filtered_properties))
+                    if filtered_properties:
+                        # Update last properties with filtered results
+                        self.last_properties[user_id] = filtered_properties
+                        self.next_cursors.pop(user_id, None)
+                    else:
+                        stage.outcome = "empty"
+                    return filtered_properties
             
-            # First try to get properties directly from Supabase using filters
-            properties = await supabase_service.get_properties_by_filters(filters)
-            logger.info(f"Direct database search results: {len(properties) if properties else 0} properties")
+            if settings.SPECULATIVE_SEARCH:
+                return await self._speculative_search(filters, user_id, query)
             
-            if properties:
+            # Descriptive words the filters can't express ("villa with a pool") rank the
+            # matching listings first; the text search applies the same filters
+            text_matches = await self._text_search(query, filters, user_id)
+            if text_matches:
+                return text_matches
+            
+            # Otherwise get properties directly from Supabase using filters
+            with tracing.span("db_filters") as stage:
+                page = await database_service.get_property_page(filters, projection="card", limit=PAGE_SIZE)
+                if not page.items:
+                    stage.outcome = "empty"
+            logger.debug("Direct database search results: %s properties", len(page.items))
+            
+            if page.items:
                 # Store results for potential follow-up queries
-                self.last_properties[user_id] = properties[:6]
-                return properties[:6]  # Return top 6 matches
+                return self._remember_page(user_id, filters, page)  # Return top 6 matches
                 
             # If no direct matches, try semantic search with Pinecone
-            logger.info("No direct matches, trying semantic search")
-            query_text = " ".join([f"{k}: {v}" for k, v in filters.items()])
-            query_embedding = await pinecone_service.get_embedding(query_text)
-            similar_docs = await pinecone_service.search_similar(query_embedding, top_k=6)
-            
-            if similar_docs:
-                logger.info(f"Found {len(similar_docs)} similar properties via semantic search")
-                # Get full property details from Supabase
-                property_ids = [doc['id'] for doc in similar_docs]
-                properties = await supabase_service.get_properties_by_ids(property_ids)
-                return properties
-            
-            logger.info("No properties found in semantic search")    
-            return []
+            logger.debug("No direct matches, trying semantic search")
+            return await self._semantic_search(filters)
             
         except Exception as e:
             logger.error(f"Error searching properties: {str(e)}")
             return []
+
+    async def _text_search(self, query: Optional[str], filters: Dict[str, Any], user_id: str) -> List[Dict[str, Any]]:
+        """Ranked full-text match on the descriptive words of the query, within the filters.
+
+        Returns [] without a round trip when the query has no words beyond what the
+        filters already cover.
+        """
+        terms = text_search_terms(query or "")
+        if not terms:
+            return []
+        with tracing.span("db_text_search") as stage:
+            properties = await database_service.search_properties_text(terms, filters, limit=PAGE_SIZE)
+            if not properties:
+                stage.outcome = "empty"
+        if properties:
+            self.last_properties[user_id] = properties
+            # Ranked matches aren't keyset paginated
+            self.next_cursors.pop(user_id, None)
+        return properties
+
+    def _remember_page(self, user_id: str, filters: Dict[str, Any], page: PropertyPage) -> List[Dict[str, Any]]:
+        """Store the shown page for follow-up queries and its cursor for show-more requests"""
+        self.last_properties[user_id] = page.items
+        self.next_cursors[user_id] = (filters, page.next_cursor)
+        return page.items
+
+    async def _handle_intent(self, user_id: str, intent: str) -> Optional[ChatResponse]:
+        """Answer a routed intent locally, or return None to fall through to the LLM"""
+        if intent in INTENT_RESPONSES:
+            return ChatResponse(text=INTENT_RESPONSES[intent], properties=[], intent=intent)
+        
+        if intent == "repeat":
+            previous = self.last_responses.get(user_id)
+            if previous is None:
+                return None
+            return ChatResponse(text=previous.text, properties=previous.properties, intent=intent)
+        
+        if intent == "show_more":
+            if user_id not in self.next_cursors:
+                return None
+            filters, cursor = self.next_cursors[user_id]
+            page = None
+            if cursor:
+                with tracing.span("db_next_page"):
+                    page = await database_service.get_property_page(filters, projection="card", limit=PAGE_SIZE, cursor=cursor)
+            if not page or not page.items:
+                return ChatResponse(
+                    text=NO_MORE_RESULTS_RESPONSE,
+                    properties=[],
+                    intent=intent
+                )
+            properties = self._remember_page(user_id, filters, page)
+            return ChatResponse(text=self._format_property_response(properties, filters), properties=properties, intent=intent)
+        
+        return None
+
+    async def _answer_facet_question(self, query: str, filters: Dict[str, Any]) -> Optional[ChatResponse]:
+        """Answer "how many" and "which cities" questions from facet counts, or None if it isn't one"""
+        query_lower = query.lower()
+        for dimension, pattern in FACET_VALUES_PATTERNS.items():
+            if pattern.search(query_lower):
+                values = await facet_service.list_values(dimension, filters)
+                if values is None:
+                    return None
+                return ChatResponse(text=self._format_facet_values(dimension, values, filters), properties=[], intent="facet_values")
+        
+        if FACET_COUNT_PATTERN.search(query_lower):
+            stats = await facet_service.get_stats(filters)
+            if stats is None:
+                return None
+            description = self._describe_filters(filters, plural=stats.count != 1)
+            if not stats.count:
+                text = f"I don't have any {description} right now. Would you like to try different criteria?"
+            elif stats.count == 1:
+                text = f"I have 1 {description}, priced at ₹{stats.min_price:,}. Would you like to hear about it?"
+            else:
+                text = (
+                    f"I have {stats.count} {description}, priced from ₹{stats.min_price:,} to ₹{stats.max_price:,} "
+                    f"with a median of ₹{stats.median_price:,}. Would you like me to show you some of them?"
+                )
+            return ChatResponse(text=text, properties=[], intent="facet_count")
+        
+        return None
+
+    def _describe_filters(self, filters: Dict[str, Any], plural: bool = True) -> str:
+        """Spoken description of a filter set, e.g. "2 BHK residential rental properties in Telangana" """
+        words = []
+        if filters.get('bedrooms'):
+            words.append(f"{filters['bedrooms']} BHK")
+        if filters.get('property_type'):
+            words.append(filters['property_type'])
+        if filters.get('listing_type') == 'rent':
+            words.append("rental")
+        words.append("properties" if plural else "property")
+        if filters.get('listing_type') == 'sale':
+            words.append("for sale")
+        location = filters.get('city') or filters.get('state')
+        if location:
+            words.append(f"in {location}")
+        return " ".join(words)
+
+    def _format_facet_values(self, dimension: str, values: Dict[Any, int], filters: Dict[str, Any]) -> str:
+        """Format per-city or per-state listing counts for speech"""
+        label = "cities" if dimension == "city" else "states"
+        if not values:
+            return f"I don't have any {self._describe_filters(filters)} listed right now."
+        listed = ", ".join(f"{str(value).title()} with {count}" for value, count in list(values.items())[:MAX_FACET_VALUES])
+        response = f"I have {self._describe_filters(filters)} in {len(values)} {label}: {listed}"
+        if len(values) > MAX_FACET_VALUES:
+            response += f", and {len(values) - MAX_FACET_VALUES} more"
+        return response + ". Which one would you like to explore?"
+
+    async def _semantic_search(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Search for properties via Pinecone similarity and hydrate them from Supabase"""
+        query_text = " ".join([f"{k}: {v}" for k, v in filters.items()])
+        with tracing.span("semantic_embedding"):
+            query_embedding = await pinecone_service.get_embedding(query_text)
+        with tracing.span("semantic_search") as stage:
+            similar_docs = await pinecone_service.search_similar(query_embedding, top_k=6)
+            if not similar_docs:
+                stage.outcome = "empty"
+        
+        if similar_docs:
+            logger.debug("Found %s similar properties via semantic search", len(similar_docs))
+            # Get full property details from Supabase
+            property_ids = [doc['id'] for doc in similar_docs]
+            with tracing.span("db_by_ids") as stage:
+                properties = await property_cache.get_many(property_ids)
+                if not properties:
+                    stage.outcome = "empty"
+            return properties
+        
+        logger.debug("No properties found in semantic search")
+        return []
+
+    async def _speculative_search(self, filters: Dict[str, Any], user_id: str, query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run the text, structured and semantic searches concurrently.
+
+        Ranked text matches win when the query has descriptive words that match, then the
+        structured result when it is non-empty; the in-flight semantic search is cancelled
+        in both cases. Otherwise the semantic result is awaited instead of being started
+        only after the database miss.
+        """
+        semantic_task = asyncio.create_task(self._semantic_search(filters))
+        text_task = asyncio.create_task(self._text_search(query, filters, user_id))
+        try:
+            with tracing.span("db_filters") as stage:
+                page = await database_service.get_property_page(filters, projection="card", limit=PAGE_SIZE)
+                if not page.items:
+                    stage.outcome = "empty"
+            text_matches = await text_task
+        except BaseException:
+            semantic_task.cancel()
+            text_task.cancel()
+            raise
+        logger.debug("Direct database search results: %s properties", len(page.items))
+        
+        if text_matches:
+            semantic_task.cancel()
+            speculative_search_total.inc(outcome="text")
+            return text_matches
+        if page.items:
+            semantic_task.cancel()
+            speculative_search_total.inc(outcome="structured")
+            return self._remember_page(user_id, filters, page)
+        
+        # The semantic search has been running for as long as the database query took
+        speculative_search_saved.observe(stage.duration)
+        with tracing.span("semantic_wait") as stage:
+            try:
+                properties = await semantic_task
+            except Exception as e:
+                logger.error(f"Speculative semantic search failed: {str(e)}")
+                properties = []
+            if not properties:
+                stage.outcome = "empty"
+        speculative_search_total.inc(outcome="semantic" if properties else "empty")
+        return properties
         
     def _extract_property_filters(self, query: str) -> Tuple[Dict[str, Any], bool]:
         """Extract property filters from user query and determine if it's a follow-up query"""
@@ -107,7 +390,7 @@ class ConversationManager:
             'show me', 'i want', 'give me'
         ])
         """Extract property filters from user query"""
-        logger.info(f"Extracting filters from query: {query}")
+        logger.debug("Extracting filters from query: %s", query)
         filters = {
             "location": None,
             "property_type": None,
@@ -120,21 +403,8 @@ class ConversationManager:
         
         # Extract location (handle variations)
         query_lower = query.lower()
-        logger.info(f"Processing query: {query_lower}")
+        logger.debug("Processing query: %s", query_lower)
         
-        # Location mapping with pronunciation and spelling variations
-        location_variants = {
-            "bangalore": ["bangalore", "bengaluru", "benguluru", "blr", "banglore", "bangalor"],
-            "andhra pradesh": ["andhra pradesh", "andhra", "ap", "andra pradesh", "andra", "andrapradesh"],
-            "telangana": ["telangana", "hyderabad", "hyd", "telengana", "telangana", "telungana"],
-            "tamil nadu": ["tamil nadu", "chennai", "tamilnadu", "tamil nad", "tamilnad"],
-            "kerala": ["kerala", "kochi", "cochin", "trivandrum", "kerela", "karala"],
-            "maharashtra": ["maharashtra", "mumbai", "pune", "maharastra", "maharashtra"],
-            "dewas": ["dewas", "davos", "divas", "devos", "dewos", "dewaz"],  # Added pronunciation variations
-            "orai": ["orai", "oorai", "horai", "orei", "orrai"],  # Added pronunciation variations
-            "himachal pradesh": ["himachal pradesh", "himachal", "hp", "himanchal", "himachal pradesh", "himachalpradesh"]
-        }
-
         # Try fuzzy matching for locations
         def get_closest_match(word: str, variants: List[str]) -> Optional[str]:
             # Simple fuzzy matching using character similarity
@@ -157,7 +427,7 @@ class ConversationManager:
         
         # Extract state and city with fuzzy matching
         words = query_lower.split()
-        for location, variants in location_variants.items():
+        for location, variants in LOCATION_VARIANTS.items():
             # Check exact matches first
             if any(variant in query_lower for variant in variants):
                 if location.lower() in ["andhra pradesh", "telangana", "tamil nadu", "kerala", "maharashtra", "himachal pradesh"]:
@@ -169,7 +439,7 @@ class ConversationManager:
             # If no exact match, try fuzzy matching on individual words
             for word in words:
                 if closest_match := get_closest_match(word, variants):
-                    logger.info(f"Fuzzy matched '{word}' to '{location}' via variant '{closest_match}'")
+                    logger.debug("Fuzzy matched '%s' to '%s' via variant '%s'", word, location, closest_match)
                     if location.lower() in ["andhra pradesh", "telangana", "tamil nadu", "kerala", "maharashtra", "himachal pradesh"]:
                         filters["state"] = location.title()
                     else:
@@ -177,24 +447,13 @@ class ConversationManager:
                     break
         
         # Extract listing type (rent/sale)
-        listing_types = {
-            "rent": ["rent", "rental", "renting", "lease", "leasing"],
-            "sale": ["sale", "buy", "buying", "purchase", "purchasing", "sell", "selling"]
-        }
-        
-        for ltype, variants in listing_types.items():
+        for ltype, variants in LISTING_TYPE_VARIANTS.items():
             if any(variant in query_lower for variant in variants):
                 filters["listing_type"] = ltype
                 break
 
         # Extract property type
-        property_types = {
-            "agricultural": ["agricultural", "farm", "farming"],
-            "commercial": ["commercial", "office", "retail", "shop"],
-            "residential": ["residential", "house", "home"]
-        }
-        
-        for ptype, variants in property_types.items():
+        for ptype, variants in PROPERTY_TYPE_VARIANTS.items():
             if any(variant in query_lower for variant in variants):
                 filters["property_type"] = ptype
                 break
@@ -215,7 +474,7 @@ class ConversationManager:
         
         # Remove None values
         filters = {k: v for k, v in filters.items() if v is not None}
-        logger.info(f"Extracted filters: {filters}")
+        logger.debug("Extracted filters: %s", filters)
         return filters, is_followup
         
     def _format_property_response(self, properties: List[Dict[str, Any]], filters: Dict[str, Any]) -> str:
@@ -257,15 +516,41 @@ class ConversationManager:
     async def process_query(self, user_id: str, query: str) -> ChatResponse:
         """Process a user query and return response with properties if applicable"""
         logger.info(f"[User {user_id}] Processing query: {query}")
+        with tracing.trace("process_query") as turn_trace:
+            response = await self._process_query(user_id, query)
+        response.trace = turn_trace.to_dict()
+        self.last_responses[user_id] = response
+        return response
+
+    async def _process_query(self, user_id: str, query: str) -> ChatResponse:
         history = self._get_conversation_history(user_id)
         self._add_to_history(user_id, "user", query)
         
         try:
             # Extract property filters if query is about properties
-            filters, is_followup = self._extract_property_filters(query)
-            logger.info(f"[User {user_id}] Extracted filters: {filters}, is_followup: {is_followup}")
+            with tracing.span("extract_filters"):
+                filters, is_followup = self._extract_property_filters(query)
+            logger.debug("[User %s] Extracted filters: %s, is_followup: %s", user_id, filters, is_followup)
             properties = []
             
+            # Answer counts and coverage from precomputed facets without fetching any rows
+            with tracing.span("facets") as stage:
+                routed = await self._answer_facet_question(query, filters)
+                stage.outcome = routed.intent if routed else "skipped"
+            if routed:
+                logger.info(f"[User {user_id}] Answered {routed.intent} from property facets")
+                return routed
+            
+            # Answer greetings, confirmations and canned flows without calling the LLM
+            if not filters and self.intent_router:
+                with tracing.span("intent_route") as stage:
+                    result = self.intent_router.classify(query)
+                    routed = None if result.is_unknown else await self._handle_intent(user_id, result.intent)
+                    stage.outcome = result.intent if routed else "llm"
+                if routed:
+                    logger.info(f"[User {user_id}] Routed intent {result.intent} ({result.source}, {result.confidence:.2f})")
+                    return routed
+            
             # Create initial context for Janaki
             context = (
                 "You are Janaki, an AI voice assistant specializing in real estate. "
@@ -281,9 +566,12 @@ class ConversationManager:
             
             # If query is about properties, search in Pinecone and Supabase
             if filters:
-                logger.info(f"[User {user_id}] Searching properties with filters: {filters}")
-                properties = await self._search_properties(filters, user_id, is_followup)
-                logger.info(f"[User {user_id}] Found {len(properties)} matching properties")
+                logger.debug("[User %s] Searching properties with filters: %s", user_id, filters)
+                with tracing.span("search_properties") as stage:
+                    properties = await self._search_properties(filters, user_id, is_followup, query)
+                    if not properties:
+                        stage.outcome = "empty"
+                logger.debug("[User %s] Found %s matching properties", user_id, len(properties))
                 
                 # Add filter information to context
                 filter_context = "Current filters: "
@@ -294,41 +582,47 @@ class ConversationManager:
                 context += f"\n{filter_context.rstrip(', ')}"
                 
                 if properties:
-                    logger.info(f"[User {user_id}] Property IDs found: {[p.get('id') for p in properties]}")
+                    logger.debug("[User %s] Property IDs found: %s", user_id, [p.get('id') for p in properties])
                     property_response = self._format_property_response(properties, filters)
                     context += f"\nAvailable properties: {property_response}"
                 else:
-                    logger.info(f"[User {user_id}] No properties found matching filters")
+                    logger.debug("[User %s] No properties found matching filters", user_id)
                     context += "\nNo properties found matching those criteria."
             
             # Format the prompt with context and recent history
-            prompt = context + "\n\n"
-            for msg in history[-5:]:  # Keep last 5 messages for context
-                role = "User" if msg["role"] == "user" else "Assistant"
-                prompt += f"{role}: {msg['content']}\n"
-            prompt += (
-                f"\nUser: {query}\n"
-                "Assistant: Remember to respond naturally without using markdown or special characters. "
-                "Format the response in a way that's easy to read and speak:"
-            )
+            with tracing.span("build_prompt"):
+                prompt = context + "\n\n"
+                for msg in history[-5:]:  # Keep last 5 messages for context
+                    role = "User" if msg["role"] == "user" else "Assistant"
+                    prompt += f"{role}: {msg['content']}\n"
+                prompt += (
+                    f"\nUser: {query}\n"
+                    "Assistant: Remember to respond naturally without using markdown or special characters. "
+                    "Format the response in a way that's easy to read and speak:"
+                )
             
             # If we found properties, use the formatted property response directly
             if filters and properties:
-                response_text = self._format_property_response(properties, filters)
+                with tracing.span("format_response"):
+                    response_text = self._format_property_response(properties, filters)
             else:
                 # Generate response using Gemini only for non-property queries or when no properties found
-                response = self.model.generate_content(prompt)
-                response_text = response.text
+                with tracing.span("llm"):
+                    # Awaited, not called synchronously: the event loop keeps serving other
+                    # sessions (and this one's barge-in) while the model answers, and
+                    # cancelling the turn abandons the request
+                    response = await self.model.generate_content_async(prompt)
+                    response_text = response.text
             
             # Return both the response text and the properties
-            logger.info(f"[User {user_id}] Returning response with {len(properties)} properties")
+            logger.debug("[User %s] Returning response with %s properties", user_id, len(properties))
             return ChatResponse(text=response_text, properties=properties)
             
         except Exception as e:
             logger.error(f"Error processing query: {str(e)}")
             logger.error(traceback.format_exc())
             return ChatResponse(
-                text="I apologize, but I encountered an error while processing your request. Could you please try again?",
+                text=ERROR_RESPONSE,
                 properties=[]
             )
 
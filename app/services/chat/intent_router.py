@@ -0,0 +1,146 @@
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import logging
+import re
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+intent_router_total = metrics.counter("intent_router_total")
+
+UNKNOWN_INTENT = "unknown"
+
+# Whole-utterance patterns; a match is treated as certain
+INTENT_RULES: Dict[str, List[str]] = {
+    "greeting": [
+        r"(hi|hello|hey|hiya|namaste|good (morning|afternoon|evening))( there)?( janaki)?",
+    ],
+    "thanks": [
+        r"(ok(ay)? )?(thanks?|thank you|thank you so much|thanks a lot|many thanks)( janaki)?",
+    ],
+    "goodbye": [
+        r"(ok(ay)? )?(bye|goodbye|bye bye|see you|see you later|that's all|that is all)( thanks?| thank you)?",
+    ],
+    "affirm": [
+        r"(yes|yeah|yep|yup|sure|ok|okay|of course|please do|go ahead|yes please)",
+    ],
+    "deny": [
+        r"(no|nope|nah|no thanks|no thank you|not now|not really)",
+    ],
+    "repeat": [
+        r"(can you |could you |please )?(repeat|say) (that|it)( again)?( please)?",
+        r"(pardon|sorry|come again|what did you say)",
+    ],
+    "show_more": [
+        r"(show|give|tell) me more( properties| options| results)?( please)?",
+        r"(more|next)( properties| options| results| ones)?( please)?",
+        r"(any|are there) (more|other) (properties|options)",
+    ],
+}
+
+# Seed phrases for the fallback classifier, covering paraphrases the rules miss
+TRAINING_PHRASES: Dict[str, List[str]] = {
+    "greeting": [
+        "hi", "hello", "hey there", "hello janaki", "hi how are you", "good morning",
+        "hey janaki how are you doing", "hello is anyone there", "hi there good evening",
+    ],
+    "thanks": [
+        "thank you", "thanks a lot", "thank you very much", "that's helpful thanks",
+        "great thank you", "thanks for the help", "thank you so much janaki", "appreciate it",
+    ],
+    "goodbye": [
+        "bye", "goodbye", "see you later", "that's all for today", "i'm done thanks bye",
+        "talk to you later", "have a nice day bye", "ok bye janaki",
+    ],
+    "affirm": [
+        "yes", "yeah sure", "yes please", "that sounds good", "okay go ahead",
+        "sure why not", "yes that works", "correct",
+    ],
+    "deny": [
+        "no", "no thanks", "not really", "nope", "no that's fine", "not right now",
+        "i don't think so", "no not interested",
+    ],
+    "repeat": [
+        "repeat that", "can you say that again", "sorry i didn't catch that",
+        "please repeat", "what did you say", "come again", "say it once more", "pardon me",
+    ],
+    "show_more": [
+        "show more", "show me more", "any more options", "next ones please",
+        "what else do you have", "more properties", "show me other options", "give me more results",
+    ],
+    UNKNOWN_INTENT: [
+        "what is the price of the second property", "tell me about property prices in pune",
+        "how do home loans work", "what documents do i need to buy a house",
+        "is it a good time to invest in real estate", "what is the area of the first one",
+        "does the apartment have parking", "can i schedule a visit tomorrow",
+        "what are the registration charges", "which locality is best for families",
+        "how far is it from the airport", "is the price negotiable",
+    ],
+}
+
+@dataclass
+class IntentResult:
+    intent: str
+    confidence: float
+    source: str  # "rule", "model" or "none"
+
+    @property
+    def is_unknown(self) -> bool:
+        return self.intent == UNKNOWN_INTENT
+
+class IntentRouter:
+    def __init__(self, confidence_threshold: float = 0.8, max_words: int = 8):
+        self.confidence_threshold = confidence_threshold
+        # Long utterances carry real content and always go to the LLM
+        self.max_words = max_words
+        self.rules: List[Tuple[str, re.Pattern]] = [
+            (intent, re.compile(rf"^(?:{pattern})$"))
+            for intent, patterns in INTENT_RULES.items()
+            for pattern in patterns
+        ]
+        self.model = self._train_model()
+        logger.info("IntentRouter initialized")
+
+    def _train_model(self):
+        """Fit a small character n-gram classifier on the seed phrases"""
+        texts, labels = [], []
+        for intent, phrases in TRAINING_PHRASES.items():
+            texts.extend(self._normalize(phrase) for phrase in phrases)
+            labels.extend([intent] * len(phrases))
+        model = make_pipeline(
+            TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True),
+            LogisticRegression(C=10.0, max_iter=1000)
+        )
+        model.fit(texts, labels)
+        return model
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Lowercase and strip punctuation added by speech-to-text"""
+        text = re.sub(r"[^\w\s']", " ", text.lower())
+        return re.sub(r"\s+", " ", text).strip()
+
+    def classify(self, text: str) -> IntentResult:
+        """Classify an utterance, returning the unknown intent when not confident"""
+        normalized = self._normalize(text)
+        if not normalized or len(normalized.split()) > self.max_words:
+            return self._record(IntentResult(UNKNOWN_INTENT, 0.0, "none"))
+
+        for intent, pattern in self.rules:
+            if pattern.match(normalized):
+                return self._record(IntentResult(intent, 1.0, "rule"))
+
+        probabilities = self.model.predict_proba([normalized])[0]
+        best = probabilities.argmax()
+        intent = str(self.model.classes_[best])
+        confidence = float(probabilities[best])
+        if intent == UNKNOWN_INTENT or confidence < self.confidence_threshold:
+            return self._record(IntentResult(UNKNOWN_INTENT, confidence, "model"))
+        return self._record(IntentResult(intent, confidence, "model"))
+
+    def _record(self, result: IntentResult) -> IntentResult:
+        intent_router_total.inc(intent=result.intent, source=result.source)
+        return result
@@ -0,0 +1,195 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+import asyncio
+import json
+import logging
+import os
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.services.db.database_service import database_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+conversation_rows_total = metrics.counter("conversation_rows_total")
+conversation_buffer_depth = metrics.gauge("conversation_buffer_depth")
+
+class ConversationWriter:
+    """Write-behind persistence for conversation turns.
+
+    `enqueue` only appends to an in-memory buffer; a background task flushes it as a
+    multi-row insert once `batch_size` rows are waiting or `flush_interval` seconds have
+    passed. Batches the database rejects are appended to a local JSON-lines journal and
+    replayed after the next successful flush, and `stop` drains everything on shutdown.
+    Replay is at-least-once: a crash mid-replay can insert a journaled row twice.
+    """
+
+    def __init__(
+        self,
+        sink,
+        journal_path: str,
+        batch_size: int = 50,
+        flush_interval: float = 2.0
+    ):
+        self.sink = sink
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._replay_path = f"{journal_path}.replay"
+        self._journal_pending = os.path.exists(journal_path) or os.path.exists(self._replay_path)
+
+    def enqueue(
+        self,
+        transcript: str,
+        ai_response: str,
+        audio_url: Optional[str] = None,
+        user_id: Optional[str] = None
+    ):
+        """Queue a conversation turn for persistence without blocking the caller"""
+        self._buffer.append({
+            'transcript': transcript,
+            'ai_response': ai_response,
+            'audio_url': audio_url,
+            'user_id': user_id,
+            'created_at': datetime.now(timezone.utc).isoformat()
+        })
+        conversation_buffer_depth.set(len(self._buffer))
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self):
+        """Start the background flush loop"""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and persist everything still buffered.
+
+        The loop is woken and allowed to finish its flush rather than cancelled, so a
+        batch being written at shutdown is never dropped.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing conversations: {str(e)}")
+
+    async def flush(self):
+        """Write all buffered rows, spilling them to the journal if the database is unavailable"""
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                conversation_buffer_depth.set(len(self._buffer))
+                try:
+                    saved = await self._write(batch)
+                except asyncio.CancelledError:
+                    # Keep the rows for the next flush; the insert may have landed (at-least-once)
+                    self._buffer[:0] = batch
+                    conversation_buffer_depth.set(len(self._buffer))
+                    raise
+                if saved:
+                    conversation_rows_total.inc(len(batch), result="saved")
+                else:
+                    # Database is unavailable; spill this batch and everything behind it
+                    spilled = batch + self._buffer
+                    self._buffer.clear()
+                    conversation_buffer_depth.set(0)
+                    await asyncio.to_thread(self._append_journal, spilled)
+                    conversation_rows_total.inc(len(spilled), result="journaled")
+                    self._journal_pending = True
+                    return
+            if self._journal_pending:
+                await self._replay_journal()
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> bool:
+        try:
+            return await self.sink.save_conversations(rows)
+        except Exception as e:
+            logger.error(f"Error saving conversation batch: {str(e)}")
+            return False
+
+    def _append_journal(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            for row in rows:
+                journal.write(json.dumps(row) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        logger.warning(f"Journaled {len(rows)} conversation rows to {self.journal_path}")
+
+    def _take_journal(self) -> List[Dict[str, Any]]:
+        """Move journaled rows into the replay file and read them back.
+
+        New spills keep going to the journal while the replay file is drained; a replay
+        file left behind by a crash is picked up again here.
+        """
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self._replay_path):
+                with open(self._replay_path, "a", encoding="utf-8") as replay, \
+                        open(self.journal_path, encoding="utf-8") as journal:
+                    replay.write(journal.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self._replay_path)
+        if not os.path.exists(self._replay_path):
+            return []
+
+        rows = []
+        with open(self._replay_path, encoding="utf-8") as replay:
+            for line in replay:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    logger.warning("Skipping corrupt conversation journal entry")
+        return rows
+
+    async def _replay_journal(self):
+        """Re-insert journaled rows, keeping them journaled if the database rejects them again"""
+        rows = await asyncio.to_thread(self._take_journal)
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            if not await self._write(batch):
+                await asyncio.to_thread(self._append_journal, rows[start:])
+                await asyncio.to_thread(os.remove, self._replay_path)
+                return
+            conversation_rows_total.inc(len(batch), result="replayed")
+
+        if os.path.exists(self._replay_path):
+            await asyncio.to_thread(os.remove, self._replay_path)
+        self._journal_pending = os.path.exists(self.journal_path)
+        if rows:
+            logger.info(f"Replayed {len(rows)} journaled conversation rows")
+
+# Global conversation writer
+conversation_writer = ConversationWriter(
+    database_service,
+    journal_path=settings.CONVERSATION_JOURNAL_PATH,
+    batch_size=settings.CONVERSATION_BATCH_SIZE,
+    flush_interval=settings.CONVERSATION_FLUSH_INTERVAL
+)
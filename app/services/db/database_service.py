@@ -0,0 +1,9 @@
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Data access backend used by the conversation path, selected by DATABASE_BACKEND
+if settings.DATABASE_BACKEND == "postgres":
+    from app.services.db.postgres_service import postgres_service as database_service
+else:
+    from app.services.db.supabase_service import supabase_service as database_service
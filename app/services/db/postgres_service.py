@@ -0,0 +1,317 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime, date
+from decimal import Decimal
+from functools import lru_cache
+import asyncio
+import json
+import logging
+import uuid
+import asyncpg
+from app.core.config import get_settings
+from app.core.health import HealthStatus, probe_with_retry
+from app.services.db.property_queries import (
+    PropertyPage,
+    PROPERTY_ORDERINGS,
+    select_clause,
+    encode_cursor,
+    decode_cursor,
+    search_properties_params,
+    search_nearby_params
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Hot queries use fixed SQL text so asyncpg's per-connection statement cache keeps them prepared
+FILTER_CONDITIONS_SQL = """
+    ($1::text IS NULL OR city ILIKE '%' || $1 || '%')
+      AND ($2::text IS NULL OR state ILIKE '%' || $2 || '%')
+      AND ($3::text IS NULL OR property_type = $3)
+      AND ($4::text IS NULL OR listing_type = $4)
+      AND ($5::int IS NULL OR bedrooms = $5)
+"""
+PROPERTIES_BY_IDS_SQL = "SELECT * FROM properties WHERE id = ANY($1::uuid[])"
+PROPERTY_BY_ID_SQL = "SELECT * FROM properties WHERE id = $1::uuid"
+INSERT_CONVERSATION_SQL = """
+    INSERT INTO conversations (transcript, ai_response, audio_url, user_id)
+    VALUES ($1, $2, $3, $4::uuid)
+    RETURNING id
+"""
+
+SEARCH_PROPERTIES_SQL = """
+    SELECT * FROM search_properties(
+        $1::text, $2::text, $3::text, $4::text, $5::text, $6::int, $7::int, $8::int, $9::int
+    )
+"""
+SEARCH_NEARBY_SQL = """
+    SELECT * FROM search_nearby_properties(
+        $1::float8, $2::float8, $3::float8, $4::text, $5::text, $6::text, $7::text, $8::int, $9::int, $10::int, $11::int
+    )
+"""
+INSERT_CONVERSATIONS_SQL = """
+    INSERT INTO conversations (transcript, ai_response, audio_url, user_id, created_at)
+    SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::uuid[], $5::timestamptz[])
+"""
+PROPERTY_FACETS_SQL = "SELECT * FROM property_facets"
+REFRESH_PROPERTY_FACETS_SQL = "SELECT refresh_property_facets()"
+
+# Postgres types of the keyset sort columns, used to cast cursor values
+SORT_COLUMN_TYPES = {"price": "int", "created_at": "timestamptz"}
+
+@lru_cache(maxsize=None)
+def _properties_by_filters_sql(projection: str) -> str:
+    return f"SELECT {select_clause(projection)} FROM properties WHERE {FILTER_CONDITIONS_SQL} LIMIT $6"
+
+@lru_cache(maxsize=None)
+def _property_page_sql(projection: str, order_by: str, with_cursor: bool) -> str:
+    """Keyset page query; one statement per (projection, ordering, first/next page)"""
+    sort_column, descending = PROPERTY_ORDERINGS[order_by]
+    direction = "DESC" if descending else "ASC"
+    keyset = ""
+    limit_param = "$6"
+    if with_cursor:
+        op = "<" if descending else ">"
+        keyset = f"AND ({sort_column}, id) {op} ($6::text::{SORT_COLUMN_TYPES[sort_column]}, $7::uuid)"
+        limit_param = "$8"
+    return (
+        f"SELECT {select_clause(projection, order_by)} FROM properties "
+        f"WHERE {FILTER_CONDITIONS_SQL} {keyset} "
+        f"ORDER BY {sort_column} {direction}, id {direction} LIMIT {limit_param}"
+    )
+
+def _filter_args(filters: Dict[str, Any]) -> List[Any]:
+    bedrooms = filters.get('bedrooms')
+    return [
+        filters.get('city') or None,
+        filters.get('state') or None,
+        filters.get('property_type') or None,
+        filters.get('listing_type') or None,
+        int(bedrooms) if bedrooms else None
+    ]
+
+def _to_json_value(value: Any) -> Any:
+    """Convert asyncpg column values to the JSON shapes PostgREST returns"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _record_to_dict(record: asyncpg.Record) -> Dict[str, Any]:
+    return {key: _to_json_value(value) for key, value in record.items()}
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Decode json/jsonb columns to Python objects like supabase-py does"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+class PostgresService:
+    """asyncpg-backed data access for properties and conversations.
+
+    Mirrors the SupabaseService method signatures and return shapes, but talks to
+    Postgres directly over a shared connection pool instead of PostgREST.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        server_settings: Optional[Dict[str, str]] = None
+    ):
+        self.dsn = dsn or settings.DATABASE_URL
+        self.min_size = min_size or settings.DATABASE_POOL_MIN_SIZE
+        self.max_size = max_size or settings.DATABASE_POOL_MAX_SIZE
+        self.server_settings = server_settings
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+        self.health = HealthStatus("Postgres")
+
+    async def connect(self) -> asyncpg.Pool:
+        """Create the shared connection pool if it doesn't exist yet"""
+        if self._pool is not None:
+            return self._pool
+        async with self._pool_lock:
+            if self._pool is None:
+                if not self.dsn:
+                    raise ValueError("DATABASE_URL is not configured")
+                logger.info(f"Creating Postgres pool (min={self.min_size}, max={self.max_size})")
+                self._pool = await asyncpg.create_pool(
+                    self.dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    init=_init_connection,
+                    server_settings=self.server_settings
+                )
+        return self._pool
+
+    async def check_health(self, retries: int = 3, backoff: float = 0.5) -> bool:
+        """Readiness probe: run SELECT 1 on the pool, retrying with exponential backoff"""
+        async def probe():
+            pool = await self.connect()
+            await pool.fetchval("SELECT 1")
+        return await probe_with_retry(self.health, probe, retries=retries, backoff=backoff)
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def save_conversation(
+        self,
+        transcript: str,
+        ai_response: str,
+        audio_url: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """Save a conversation row"""
+        try:
+            pool = await self.connect()
+            conversation_id = await pool.fetchval(INSERT_CONVERSATION_SQL, transcript, ai_response, audio_url, user_id)
+            logger.debug(f"Saved conversation with ID: {conversation_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving conversation to Postgres: {str(e)}")
+            return False
+
+    async def save_conversations(self, rows: List[Dict[str, Any]]) -> bool:
+        """Insert a batch of conversation rows with a single multi-row INSERT"""
+        try:
+            pool = await self.connect()
+            await pool.execute(
+                INSERT_CONVERSATIONS_SQL,
+                [row['transcript'] for row in rows],
+                [row['ai_response'] for row in rows],
+                [row.get('audio_url') for row in rows],
+                [row.get('user_id') for row in rows],
+                [datetime.fromisoformat(row['created_at']) for row in rows]
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error saving conversation batch to Postgres: {str(e)}")
+            return False
+
+    async def get_properties_by_ids(self, property_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get property details by property IDs, preserving the order of property_ids"""
+        if not property_ids:
+            return []
+        try:
+            pool = await self.connect()
+            records = await pool.fetch(PROPERTIES_BY_IDS_SQL, property_ids)
+            id_to_property = {prop['id']: prop for prop in map(_record_to_dict, records)}
+            return [id_to_property[pid] for pid in property_ids if pid in id_to_property]
+        except Exception as e:
+            logger.error(f"Error fetching properties from Postgres: {str(e)}")
+            return []
+
+    async def get_properties_by_filters(
+        self,
+        filters: Dict[str, Any],
+        projection: str = "detail",
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get properties matching the conversation filters"""
+        try:
+            pool = await self.connect()
+            records = await pool.fetch(_properties_by_filters_sql(projection), *_filter_args(filters), limit)
+            logger.debug(f"Found {len(records)} properties")
+            return [_record_to_dict(record) for record in records]
+        except Exception as e:
+            logger.error(f"Error fetching properties from Postgres: {str(e)}")
+            return []
+
+    async def search_properties_text(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 6
+    ) -> List[Dict[str, Any]]:
+        """Ranked full-text search over title, description and features via search_properties()"""
+        try:
+            params = search_properties_params(query, filters or {}, limit)
+            pool = await self.connect()
+            records = await pool.fetch(SEARCH_PROPERTIES_SQL, *params.values())
+            return [_record_to_dict(record) for record in records]
+        except Exception as e:
+            logger.error(f"Error searching property text in Postgres: {str(e)}")
+            return []
+
+    async def search_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 6
+    ) -> List[Dict[str, Any]]:
+        """Nearest matching properties to a point with distance_km, via search_nearby_properties()"""
+        params = search_nearby_params(latitude, longitude, radius_km, filters or {}, limit)
+        try:
+            pool = await self.connect()
+            records = await pool.fetch(SEARCH_NEARBY_SQL, *params.values())
+            return [_record_to_dict(record) for record in records]
+        except Exception as e:
+            logger.error(f"Error searching nearby properties in Postgres: {str(e)}")
+            return []
+
+    async def get_property_page(
+        self,
+        filters: Dict[str, Any],
+        projection: str = "card",
+        limit: int = 6,
+        cursor: Optional[str] = None,
+        order_by: str = "price"
+    ) -> PropertyPage:
+        """Get one page of matching properties using keyset pagination"""
+        try:
+            args = _filter_args(filters)
+            if cursor:
+                order_by, last_value, last_id = decode_cursor(cursor)
+                args += [str(last_value), last_id]
+            # Fetch one extra row to know whether another page exists
+            args.append(limit + 1)
+            
+            pool = await self.connect()
+            records = await pool.fetch(_property_page_sql(projection, order_by, bool(cursor)), *args)
+            rows = [_record_to_dict(record) for record in records]
+            items = rows[:limit]
+            next_cursor = encode_cursor(order_by, items[-1]) if len(rows) > limit else None
+            return PropertyPage(items=items, next_cursor=next_cursor)
+        except Exception as e:
+            logger.error(f"Error fetching property page from Postgres: {str(e)}")
+            return PropertyPage()
+
+    async def get_property_facets(self) -> Optional[List[Dict[str, Any]]]:
+        """Get every row of the property_facets materialized view"""
+        try:
+            pool = await self.connect()
+            records = await pool.fetch(PROPERTY_FACETS_SQL)
+            return [_record_to_dict(record) for record in records]
+        except Exception as e:
+            logger.error(f"Error fetching property facets from Postgres: {str(e)}")
+            return None
+
+    async def refresh_property_facets(self) -> bool:
+        """Recompute the property_facets materialized view"""
+        try:
+            pool = await self.connect()
+            await pool.execute(REFRESH_PROPERTY_FACETS_SQL)
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing property facets in Postgres: {str(e)}")
+            return False
+
+    async def get_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single property by ID"""
+        try:
+            pool = await self.connect()
+            record = await pool.fetchrow(PROPERTY_BY_ID_SQL, property_id)
+            return _record_to_dict(record) if record else None
+        except Exception as e:
+            logger.error(f"Error fetching property from Postgres: {str(e)}")
+            return None
+
+postgres_service = PostgresService()
@@ -0,0 +1,102 @@
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+import base64
+import json
+
+# Column projections per use case, so list queries don't ship images/features they never show
+VOICE_SUMMARY_COLUMNS: Tuple[str, ...] = (
+    "id", "title", "description", "property_type", "listing_type", "city", "state",
+    "price", "bedrooms", "bathrooms", "square_feet"
+)
+CARD_COLUMNS: Tuple[str, ...] = VOICE_SUMMARY_COLUMNS + ("images", "created_at")
+
+PROPERTY_PROJECTIONS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "voice": VOICE_SUMMARY_COLUMNS,
+    "card": CARD_COLUMNS,
+    "detail": None,  # All columns
+}
+
+# Keyset orderings: name -> (sort column, descending). Ties are broken by id in the same direction.
+PROPERTY_ORDERINGS: Dict[str, Tuple[str, bool]] = {
+    "price": ("price", False),
+    "newest": ("created_at", True),
+}
+
+@dataclass
+class PropertyPage:
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+def projection_columns(projection: str, order_by: Optional[str] = None) -> Optional[List[str]]:
+    """Columns to select for a projection, always including the keyset sort key"""
+    if projection not in PROPERTY_PROJECTIONS:
+        raise ValueError(f"Unknown property projection: {projection}")
+    columns = PROPERTY_PROJECTIONS[projection]
+    if columns is None:
+        return None
+    columns = list(columns)
+    if order_by:
+        sort_column = PROPERTY_ORDERINGS[order_by][0]
+        if sort_column not in columns:
+            columns.append(sort_column)
+    return columns
+
+def select_clause(projection: str, order_by: Optional[str] = None) -> str:
+    """PostgREST/SQL select list for a projection"""
+    columns = projection_columns(projection, order_by)
+    return "*" if columns is None else ",".join(columns)
+
+def search_properties_params(query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    """Arguments for the search_properties database function, in declaration order"""
+    bedrooms = filters.get("bedrooms")
+    return {
+        "search_query": query,
+        "filter_city": filters.get("city") or None,
+        "filter_state": filters.get("state") or None,
+        "filter_property_type": filters.get("property_type") or None,
+        "filter_listing_type": filters.get("listing_type") or None,
+        "filter_bedrooms": int(bedrooms) if bedrooms else None,
+        "min_price": filters.get("min_price"),
+        "max_price": filters.get("max_price"),
+        "result_limit": limit,
+    }
+
+def search_nearby_params(
+    latitude: float,
+    longitude: float,
+    radius_km: Optional[float],
+    filters: Dict[str, Any],
+    limit: int
+) -> Dict[str, Any]:
+    """Arguments for the search_nearby_properties database function, in declaration order"""
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError(f"Invalid coordinates: {latitude}, {longitude}")
+    if radius_km is not None and radius_km <= 0:
+        raise ValueError("radius_km must be positive")
+    params = search_properties_params("", filters, limit)
+    del params["search_query"]
+    return {
+        "center_latitude": latitude,
+        "center_longitude": longitude,
+        "radius_km": radius_km,
+        **params,
+    }
+
+def encode_cursor(order_by: str, row: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just past `row` in the given ordering"""
+    sort_column = PROPERTY_ORDERINGS[order_by][0]
+    payload = json.dumps({"o": order_by, "k": [row[sort_column], row["id"]]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, str]:
+    """Decode a cursor into (ordering, last sort value, last id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        order_by = payload["o"]
+        sort_value, last_id = payload["k"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if order_by not in PROPERTY_ORDERINGS:
+        raise ValueError("Invalid pagination cursor")
+    return order_by, sort_value, str(last_id)
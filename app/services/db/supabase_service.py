@@ -1,35 +1,48 @@
 from typing import List, Dict, Any, Optional
 import logging
-from supabase import create_client, Client
+from supabase import Client
+from postgrest.types import ReturnMethod
 from app.core.config import get_settings
+from app.core.supabase import supabase_clients
+from app.core.health import HealthStatus, probe_with_retry
+from app.services.db.property_queries import (
+    PropertyPage,
+    PROPERTY_ORDERINGS,
+    select_clause,
+    encode_cursor,
+    decode_cursor,
+    search_properties_params,
+    search_nearby_params
+)
 import traceback
+import asyncio
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 class SupabaseService:
     def __init__(self):
-        """Initialize Supabase client"""
-        try:
-            logger.info(f"Initializing Supabase client with URL: {settings.SUPABASE_URL}")
-            self.client: Client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_ANON_KEY
-            )
-            # Test connection
-            self.client.table('conversations').select('count').execute()
-            logger.info("Supabase client initialized and connected successfully")
-        except Exception as e:
-            logger.error(f"Error initializing Supabase client: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise
+        """Set up the service; the Supabase client is created on first use"""
+        self.health = HealthStatus("Supabase")
+
+    @property
+    def client(self) -> Client:
+        """Shared anon Supabase client, created lazily so importing this module never touches the network"""
+        return supabase_clients.client("anon")
+
+    async def check_health(self, retries: int = 3, backoff: float = 0.5) -> bool:
+        """Readiness probe: run a trivial query, retrying with exponential backoff"""
+        async def probe():
+            query = self.client.table('conversations').select('id').limit(1)
+            await asyncio.to_thread(query.execute)
+        return await probe_with_retry(self.health, probe, retries=retries, backoff=backoff)
 
     async def save_conversation(self, transcript: str, ai_response: str, audio_url: Optional[str] = None) -> bool:
         """Save a conversation to Supabase"""
         try:
-            logger.info("Attempting to save conversation to Supabase")
-            logger.info(f"Transcript: {transcript[:100]}...")
-            logger.info(f"AI Response: {ai_response[:100]}...")
+            logger.debug("Attempting to save conversation to Supabase")
+            logger.debug("Transcript: %.100s...", transcript)
+            logger.debug("AI Response: %.100s...", ai_response)
             
             # Prepare data
             data = {
@@ -43,14 +56,14 @@ class SupabaseService:
                 session = self.client.auth.get_session()
                 if session and session.user:
                     data['user_id'] = session.user.id
-                    logger.info(f"Adding user_id to conversation: {session.user.id}")
+                    logger.debug("Adding user_id to conversation: %s", session.user.id)
                 else:
-                    logger.info("No authenticated user session found")
+                    logger.debug("No authenticated user session found")
             except Exception as e:
                 logger.warning(f"Error getting session, saving as anonymous: {str(e)}")
 
             # Insert conversation into the conversations table
-            logger.info("Executing Supabase insert")
+            logger.debug("Executing Supabase insert")
             response = self.client.table('conversations').insert(data).execute()
             
             if not response.data:
@@ -66,11 +79,24 @@ class SupabaseService:
             logger.error(traceback.format_exc())
             return False
 
+    async def save_conversations(self, rows: List[Dict[str, Any]]) -> bool:
+        """Insert a batch of conversation rows in a single request"""
+        try:
+            query = self.client.table('conversations').insert(rows, returning=ReturnMethod.minimal)
+            await asyncio.to_thread(query.execute)
+            logger.debug(f"Saved batch of {len(rows)} conversations")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving conversation batch to Supabase: {str(e)}")
+            return False
+
     async def get_properties_by_ids(self, property_ids: List[str]) -> List[Dict[str, Any]]:
         """Get property details from Supabase by property IDs"""
         try:
             # Query properties table
-            response = self.client.table('properties').select('*').in_('id', property_ids).execute()
+            query = self.client.table('properties').select('*').in_('id', property_ids)
+            response = await asyncio.to_thread(query.execute)
             
             if response.data:
                 # Sort results to match the order of property_ids
@@ -84,37 +110,47 @@ class SupabaseService:
             logger.error(traceback.format_exc())
             return []
 
-    async def get_properties_by_filters(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _apply_filters(self, query, filters: Dict[str, Any]):
+        """Apply conversation filters to a properties query"""
+        # Apply filters based on actual column names
+        if filters.get('city'):
+            logger.debug("Filtering by city: %s", filters['city'])
+            query = query.ilike('city', f"%{filters['city']}%")
+        if filters.get('state'):
+            logger.debug("Filtering by state: %s", filters['state'])
+            query = query.ilike('state', f"%{filters['state']}%")
+        if filters.get('property_type'):
+            logger.debug("Filtering by property_type: %s", filters['property_type'])
+            # Try both type and property_type fields with OR condition
+            query = query.or_(f"type.eq.{filters['property_type']},property_type.eq.{filters['property_type']}")
+        if filters.get('listing_type'):
+            logger.debug("Filtering by listing_type: %s", filters['listing_type'])
+            query = query.eq('listing_type', filters['listing_type'])
+        if filters.get('bedrooms'):
+            logger.debug("Filtering by bedrooms: %s", filters['bedrooms'])
+            # Try both bedrooms and num_bedrooms fields with OR condition
+            query = query.or_(f"bedrooms.eq.{filters['bedrooms']},num_bedrooms.eq.{filters['bedrooms']}")
+        return query
+
+    async def get_properties_by_filters(
+        self,
+        filters: Dict[str, Any],
+        projection: str = "detail",
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """Get properties from Supabase using filters"""
         try:
-            logger.info(f"Searching properties with filters: {filters}")
-            query = self.client.table('properties').select('*')
-            
-            # Apply filters based on actual column names
-            if filters.get('city'):
-                logger.info(f"Filtering by city: {filters['city']}")
-                query = query.ilike('city', f"%{filters['city']}%")
-            if filters.get('state'):
-                logger.info(f"Filtering by state: {filters['state']}")
-                query = query.ilike('state', f"%{filters['state']}%")
-            if filters.get('property_type'):
-                logger.info(f"Filtering by property_type: {filters['property_type']}")
-                # Try both type and property_type fields with OR condition
-                query = query.or_(f"type.eq.{filters['property_type']},property_type.eq.{filters['property_type']}")
-            if filters.get('listing_type'):
-                logger.info(f"Filtering by listing_type: {filters['listing_type']}")
-                query = query.eq('listing_type', filters['listing_type'])
-            if filters.get('bedrooms'):
-                logger.info(f"Filtering by bedrooms: {filters['bedrooms']}")
-                # Try both bedrooms and num_bedrooms fields with OR condition
-                query = query.or_(f"bedrooms.eq.{filters['bedrooms']},num_bedrooms.eq.{filters['bedrooms']}")
+            logger.debug("Searching properties with filters: %s", filters)
+            query = self._apply_filters(self.client.table('properties').select(select_clause(projection)), filters)
+            if limit is not None:
+                query = query.limit(limit)
                 
-            # Execute query
-            response = query.execute()
-            logger.info(f"Found {len(response.data)} properties")
+            # Execute query off the event loop so concurrent searches can overlap
+            response = await asyncio.to_thread(query.execute)
+            logger.debug("Found %d properties", len(response.data))
             
             if response.data:
-                logger.info(f"First property: {response.data[0]}")
+                logger.debug("First property: %s", response.data[0])
                 return response.data
             return []
             
@@ -123,6 +159,111 @@ class SupabaseService:
             logger.error(traceback.format_exc())
             return []
 
+    async def search_properties_text(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 6
+    ) -> List[Dict[str, Any]]:
+        """Ranked full-text search over title, description and features via the search_properties RPC"""
+        try:
+            response = await asyncio.to_thread(
+                self.client.rpc('search_properties', search_properties_params(query, filters or {}, limit)).execute
+            )
+            return response.data or []
+            
+        except Exception as e:
+            logger.error(f"Error searching property text in Supabase: {str(e)}")
+            logger.error(traceback.format_exc())
+            return []
+
+    async def search_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 6
+    ) -> List[Dict[str, Any]]:
+        """Nearest matching properties to a point with distance_km, via the search_nearby_properties RPC"""
+        params = search_nearby_params(latitude, longitude, radius_km, filters or {}, limit)
+        try:
+            response = await asyncio.to_thread(
+                self.client.rpc('search_nearby_properties', params).execute
+            )
+            return response.data or []
+            
+        except Exception as e:
+            logger.error(f"Error searching nearby properties in Supabase: {str(e)}")
+            logger.error(traceback.format_exc())
+            return []
+
+    async def get_property_page(
+        self,
+        filters: Dict[str, Any],
+        projection: str = "card",
+        limit: int = 6,
+        cursor: Optional[str] = None,
+        order_by: str = "price"
+    ) -> PropertyPage:
+        """Get one page of matching properties using keyset pagination.
+
+        Only `limit` rows of the requested projection are transferred, and the returned
+        cursor resumes after the last row, so cost doesn't grow with catalog size.
+        """
+        try:
+            last_value = last_id = None
+            if cursor:
+                order_by, last_value, last_id = decode_cursor(cursor)
+            sort_column, descending = PROPERTY_ORDERINGS[order_by]
+            
+            query = self._apply_filters(
+                self.client.table('properties').select(select_clause(projection, order_by)),
+                filters
+            )
+            if cursor:
+                op = 'lt' if descending else 'gt'
+                query = query.or_(
+                    f'{sort_column}.{op}."{last_value}",'
+                    f'and({sort_column}.eq."{last_value}",id.{op}.{last_id})'
+                )
+            # Fetch one extra row to know whether another page exists
+            query = query.order(sort_column, desc=descending).order('id', desc=descending).limit(limit + 1)
+            response = await asyncio.to_thread(query.execute)
+            
+            rows = response.data or []
+            items = rows[:limit]
+            next_cursor = encode_cursor(order_by, items[-1]) if len(rows) > limit else None
+            return PropertyPage(items=items, next_cursor=next_cursor)
+            
+        except Exception as e:
+            logger.error(f"Error fetching property page from Supabase: {str(e)}")
+            logger.error(traceback.format_exc())
+            return PropertyPage()
+
+    async def get_property_facets(self) -> Optional[List[Dict[str, Any]]]:
+        """Get every row of the property_facets materialized view"""
+        try:
+            query = self.client.table('property_facets').select('*')
+            response = await asyncio.to_thread(query.execute)
+            return response.data or []
+            
+        except Exception as e:
+            logger.error(f"Error fetching property facets from Supabase: {str(e)}")
+            return None
+
+    async def refresh_property_facets(self) -> bool:
+        """Recompute the property_facets materialized view"""
+        try:
+            # EXECUTE is granted to service_role only; the anon data client is refused
+            rpc = supabase_clients.client("service").rpc('refresh_property_facets')
+            await asyncio.to_thread(rpc.execute)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error refreshing property facets in Supabase: {str(e)}")
+            return False
+
     async def get_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get a single property by ID"""
         try:
@@ -0,0 +1,152 @@
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+import asyncio
+import logging
+import time
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.services.db.database_service import database_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Dimensions of the property_facets view, in key order
+FACET_DIMENSIONS: Tuple[str, ...] = ("state", "city", "listing_type", "property_type", "bedrooms")
+
+FacetKey = Tuple[Any, ...]
+
+facet_lookups_total = metrics.counter("facet_lookups_total")
+
+@dataclass
+class FacetStats:
+    count: int
+    min_price: Optional[int] = None
+    median_price: Optional[int] = None
+    max_price: Optional[int] = None
+
+def _normalize(dimension: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    if dimension == "bedrooms":
+        return int(value)
+    return str(value).strip().lower()
+
+def facet_key(filters: Dict[str, Any]) -> FacetKey:
+    """Index key for a filter dict; dimensions that aren't filtered on are None ("any")"""
+    return tuple(_normalize(dimension, filters.get(dimension)) for dimension in FACET_DIMENSIONS)
+
+class FacetService:
+    """In-memory index over the property_facets materialized view.
+
+    The view already holds every rollup of the facet dimensions (GROUP BY CUBE), so a
+    count or price question is a dict lookup and "which cities" is a lookup into a
+    children index built at load time. The index is reloaded after `ttl` seconds, and
+    `mark_stale` asks the database to refresh the view before the next reload.
+    Commercial listings without bedrooms are grouped under bedrooms=0.
+    """
+
+    def __init__(self, loader, ttl: float = 300):
+        self.loader = loader
+        self.ttl = ttl
+        self._stats: Dict[FacetKey, FacetStats] = {}
+        # (dimension, parent key) -> {value: listing count}
+        self._children: Dict[Tuple[str, FacetKey], Dict[Any, int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._available = False
+        self._view_stale = False
+        # Bumped by every mark_stale, so a refresh can tell whether writes landed while it ran
+        self._writes = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_stats(self, filters: Dict[str, Any]) -> Optional[FacetStats]:
+        """Count and price range of active listings matching the filters, or None if facets are unavailable"""
+        if not await self._ensure_loaded():
+            facet_lookups_total.inc(kind="stats", result="unavailable")
+            return None
+        stats = self._stats.get(facet_key(filters))
+        facet_lookups_total.inc(kind="stats", result="hit" if stats else "empty")
+        return stats or FacetStats(count=0)
+
+    async def list_values(self, dimension: str, filters: Optional[Dict[str, Any]] = None) -> Optional[Dict[Any, int]]:
+        """Listing counts per value of `dimension` among matching listings, largest first, or None if unavailable"""
+        if dimension not in FACET_DIMENSIONS:
+            raise ValueError(f"Unknown facet dimension: {dimension}")
+        if not await self._ensure_loaded():
+            facet_lookups_total.inc(kind="values", result="unavailable")
+            return None
+        parent = facet_key({**(filters or {}), dimension: None})
+        values = self._children.get((dimension, parent), {})
+        facet_lookups_total.inc(kind="values", result="hit" if values else "empty")
+        return values
+
+    def mark_stale(self):
+        """Schedule a view refresh and reload after listings were created, updated or deleted"""
+        self._view_stale = True
+        self._writes += 1
+        self._schedule_refresh()
+
+    async def refresh(self):
+        """Refresh the view if listings changed, then rebuild the in-memory index"""
+        if self._view_stale:
+            self._view_stale = False
+            if not await self.loader.refresh_property_facets():
+                # Retried with the next reload after the TTL, not on every lookup
+                self._view_stale = True
+        rows = await self.loader.get_property_facets()
+        if rows is None:
+            # Keep serving the previous index; retry on the next lookup after the TTL
+            self._loaded_at = time.monotonic()
+            return
+        self._build(rows)
+        self._available = True
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(self._stats)} property facets")
+
+    def _build(self, rows: List[Dict[str, Any]]):
+        stats: Dict[FacetKey, FacetStats] = {}
+        for row in rows:
+            stats[facet_key(row)] = FacetStats(
+                count=row['listing_count'],
+                min_price=row.get('min_price'),
+                median_price=row.get('median_price'),
+                max_price=row.get('max_price')
+            )
+
+        children: Dict[Tuple[str, FacetKey], Dict[Any, int]] = {}
+        for key, entry in stats.items():
+            for position, dimension in enumerate(FACET_DIMENSIONS):
+                if key[position] is None:
+                    continue
+                parent = key[:position] + (None,) + key[position + 1:]
+                children.setdefault((dimension, parent), {})[key[position]] = entry.count
+        for parent, values in children.items():
+            children[parent] = dict(sorted(values.items(), key=lambda item: item[1], reverse=True))
+
+        # Swap both indexes in at once so lookups never see a half-built state
+        self._stats, self._children = stats, children
+
+    async def _ensure_loaded(self) -> bool:
+        if self._loaded_at is None:
+            self._schedule_refresh()
+            await asyncio.shield(self._refresh_task)
+        elif time.monotonic() - self._loaded_at > self.ttl:
+            # Serve the current index while the reload runs in the background
+            self._schedule_refresh()
+        return self._available
+
+    def _schedule_refresh(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._run_refresh())
+
+    async def _run_refresh(self):
+        writes = self._writes
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing property facets: {str(e)}")
+        if self._writes != writes and self._loaded_at is not None:
+            # Writes landed while this refresh was running
+            self._loaded_at = float("-inf")
+
+# Global facet service
+facet_service = FacetService(database_service, ttl=settings.PROPERTY_FACETS_TTL)
@@ -0,0 +1,97 @@
+from typing import List, Dict, Any, Optional
+import asyncio
+import logging
+from cachetools import TTLCache
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.services.db.database_service import database_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+property_cache_total = metrics.counter("property_cache_total")
+
+class PropertyCache:
+    """Read-through cache of full property rows keyed by property id.
+
+    Misses from one call are filled with a single `get_properties_by_ids` query, and
+    concurrent callers waiting on the same id share that in-flight query. Cached rows
+    are shared between callers and must be treated as read-only. The cache is
+    per-process, so writes made by other workers become visible after the TTL.
+    """
+
+    def __init__(self, loader, maxsize: int = 2048, ttl: float = 300):
+        self.loader = loader
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Bumped on every invalidation so loads that raced a write aren't cached
+        self._epoch = 0
+
+    async def get(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single property, loading it on a miss"""
+        properties = await self.get_many([property_id])
+        return properties[0] if properties else None
+
+    async def get_many(self, property_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get properties in the order of property_ids, loading all misses in one query"""
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing: List[str] = []
+        waiting: Dict[str, asyncio.Future] = {}
+
+        for property_id in dict.fromkeys(property_ids):
+            cached = self._cache.get(property_id)
+            if cached is not None:
+                found[property_id] = cached
+            elif property_id in self._inflight:
+                waiting[property_id] = self._inflight[property_id]
+            else:
+                missing.append(property_id)
+
+        property_cache_total.inc(len(found), result="hit")
+        property_cache_total.inc(len(missing) + len(waiting), result="miss")
+
+        if missing:
+            found.update(await self._load(missing))
+        for property_id, future in waiting.items():
+            found[property_id] = await asyncio.shield(future)
+
+        return [found[pid] for pid in property_ids if found.get(pid) is not None]
+
+    async def _load(self, property_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        loop = asyncio.get_running_loop()
+        futures = {property_id: loop.create_future() for property_id in property_ids}
+        self._inflight.update(futures)
+        epoch = self._epoch
+        loaded: Dict[str, Optional[Dict[str, Any]]] = {}
+        try:
+            rows = await self.loader.get_properties_by_ids(property_ids)
+            by_id = {row['id']: row for row in rows}
+            for property_id in property_ids:
+                row = by_id.get(property_id)
+                if row is not None and epoch == self._epoch:
+                    self._cache[property_id] = row
+                loaded[property_id] = row
+            return loaded
+        finally:
+            for property_id, future in futures.items():
+                if not future.done():
+                    future.set_result(loaded.get(property_id))
+                if self._inflight.get(property_id) is future:
+                    del self._inflight[property_id]
+
+    def invalidate(self, property_id: str):
+        """Drop a property after it was updated or deleted"""
+        self._epoch += 1
+        self._cache.pop(str(property_id), None)
+
+    def clear(self):
+        """Drop every cached property"""
+        self._epoch += 1
+        self._cache.clear()
+
+# Global property cache
+property_cache = PropertyCache(
+    database_service,
+    maxsize=settings.PROPERTY_CACHE_SIZE,
+    ttl=settings.PROPERTY_CACHE_TTL
+)
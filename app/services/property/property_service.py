@@ -1,10 +1,13 @@
 from typing import List, Dict, Optional
-from app.core.supabase import get_supabase_client
+from app.core.supabase import supabase_clients
 from app.services.vector_store.pinecone_service import pinecone_service
+from app.services.property.property_cache import property_cache
+from app.services.property.facet_service import facet_service
+from app.services.db.database_service import database_service
 
 class PropertyService:
     def __init__(self, auth_token: str):
-        self.supabase = get_supabase_client(auth_token)
+        self.supabase = supabase_clients.for_user(auth_token)
 
     async def create_property(self, property_data: Dict) -> Dict:
         """Create a new property listing"""
@@ -12,6 +15,7 @@ class PropertyService:
             # Create property in database
             response = self.supabase.table('properties').insert([property_data]).execute()
             property_id = response.data[0]['id']
+            facet_service.mark_stale()
             
             # Add to vector store
             await pinecone_service.upsert_vectors(
@@ -91,15 +95,27 @@ class PropertyService:
         except Exception as e:
             raise Exception(f"Failed to search properties: {str(e)}")
 
+    async def search_nearby(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        filters: Optional[Dict] = None,
+        limit: int = 6
+    ) -> List[Dict]:
+        """Get the nearest matching properties to a point, each with a distance_km"""
+        try:
+            return await database_service.search_nearby(lat, lon, radius_km, filters, limit)
+        except Exception as e:
+            raise Exception(f"Failed to search nearby properties: {str(e)}")
+
     async def get_property(self, property_id: str) -> Dict:
         """Get a property by ID"""
         try:
-            response = self.supabase.table('properties')\
-                .select('*')\
-                .eq('id', property_id)\
-                .single()\
-                .execute()
-            return response.data
+            property_data = await property_cache.get(property_id)
+            if property_data is None:
+                raise ValueError("Property not found")
+            return property_data
         except Exception as e:
             raise Exception(f"Failed to get property: {str(e)}")
 
@@ -108,6 +124,8 @@ class PropertyService:
         try:
             # Update database
             response = self.supabase.table('properties').update([property_data]).eq('id', property_id).execute()
+            property_cache.invalidate(property_id)
+            facet_service.mark_stale()
             
             # Update vector store
             await pinecone_service.upsert_vectors(
@@ -129,6 +147,8 @@ class PropertyService:
         try:
             # Delete from database
             response = self.supabase.table('properties').delete().eq('id', property_id).execute()
+            property_cache.invalidate(property_id)
+            facet_service.mark_stale()
             
             # Delete from vector store
             await pinecone_service.delete_vectors(
@@ -1,18 +1,29 @@
 from pinecone import Pinecone, ServerlessSpec
 from app.core.config import get_settings
-import google.generativeai as genai
+from app.core.gemini import gemini_model
 from typing import List, Dict, Any, Optional
 import logging
+import threading
 import time
+import asyncio
 import numpy as np
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 class PineconeService:
+    """Pinecone indexes and Gemini embeddings.
+
+    Nothing touches the network at construction: the client and the Gemini model are
+    created on first use, and the indexes are checked (and created if missing) by the
+    first call that needs them, in a worker thread.
+    """
+
     def __init__(self):
-        # Initialize Pinecone
-        self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+        self._pc: Optional[Pinecone] = None
+        self._index_connections: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
         
         # Define indexes
         self.indexes = {
@@ -27,27 +38,42 @@ class PineconeService:
                 "dimension": 768  # Using 768 dimensions for consistency
             }
         }
-        
-        # Create/verify both indexes
-        for index_config in self.indexes.values():
-            self.ensure_index_exists(index_config["name"], index_config["dimension"])
-        
-        # Wait for indexes to be ready
-        time.sleep(5)
-        
-        # Initialize index connections
-        self.index_connections = {
-            name: self.pc.Index(config["name"])
-            for name, config in self.indexes.items()
-        }
-        
-        # Initialize Gemini
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.0-flash') 
-        logger.info("PineconeService initialized successfully")
 
-    def ensure_index_exists(self, index_name: str, dimension: int):
-        """Create index if it doesn't exist, recreate if dimensions don't match"""
+    @property
+    def pc(self) -> Pinecone:
+        if self._pc is None:
+            with self._lock:
+                if self._pc is None:
+                    self._pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+        return self._pc
+
+    @property
+    def model(self):
+        return gemini_model()
+
+    def _connect(self):
+        """Create/verify both indexes and open connections to them (blocking, runs once)"""
+        with self._connect_lock:
+            if self._index_connections is not None:
+                return
+            created = [
+                self.ensure_index_exists(index_config["name"], index_config["dimension"])
+                for index_config in self.indexes.values()
+            ]
+            if any(created):
+                # Wait for new indexes to be ready
+                time.sleep(5)
+            self._index_connections = {name: self.pc.Index(config["name"]) for name, config in self.indexes.items()}
+            logger.info("PineconeService initialized successfully")
+
+    async def _index(self, index_type: str):
+        """Connection to an index, connecting on first use without blocking the event loop"""
+        if self._index_connections is None:
+            await asyncio.to_thread(self._connect)
+        return self._index_connections[index_type]
+
+    def ensure_index_exists(self, index_name: str, dimension: int) -> bool:
+        """Create index if it doesn't exist, recreate if dimensions don't match; True if it was created"""
         try:
             # Check existing indexes
             existing_indexes = [index.name for index in self.pc.list_indexes()]
@@ -82,6 +108,7 @@ class PineconeService:
                     )
                 )
                 logger.info(f"Created new Pinecone index: {index_name}")
+            return needs_creation
                 
         except Exception as e:
             logger.error(f"Error managing Pinecone index: {str(e)}")
@@ -103,7 +130,9 @@ class PineconeService:
             Provide a detailed analysis that captures the semantic essence.
             """
             
-            response = self.model.generate_content(
+            # Awaited natively rather than in a thread, so cancelling a speculative
+            # semantic search also abandons the Gemini request
+            response = await self.model.generate_content_async(
                 prompt,
                 generation_config={
                     "temperature": 0.0,
@@ -144,7 +173,7 @@ class PineconeService:
             query_embedding = await self.get_embedding(query)
             
             # Get index and namespace
-            index = self.index_connections[index_type]
+            index = await self._index(index_type)
             namespace = self.indexes[index_type]["namespace"]
             
             # Query Pinecone
@@ -194,7 +223,7 @@ class PineconeService:
             vector = await self.get_embedding(content)
             
             # Get index and namespace
-            index = self.index_connections[index_type]
+            index = await self._index(index_type)
             namespace = self.indexes[index_type]["namespace"]
             
             # Prepare metadata
@@ -220,22 +249,24 @@ class PineconeService:
             logger.error(f"Error upserting to {index_type} index: {str(e)}")
             raise
 
-    async def search_similar(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Search for similar documents using the query"""
+    async def search_similar(self, query_embedding: List[float], top_k: int = 5, index_type: str = "properties") -> List[Dict[str, Any]]:
+        """Metadata of the nearest matches to an embedding from `get_embedding`, each with its "id"
+        (the listing id for the properties index)"""
         try:
-            # Generate embedding for the query
-            response = self.model.generate_content(query)
-            query_embedding = response.embedding
-
-            # Search in Pinecone
-            results = self.index.query(
+            index = await self._index(index_type)
+            # The Pinecone client is synchronous; keep its round trip off the event loop
+            results = await asyncio.to_thread(
+                index.query,
                 vector=query_embedding,
                 top_k=top_k,
-                include_metadata=True
+                include_metadata=True,
+                namespace=self.indexes[index_type]["namespace"]
             )
 
-            # Return the results
-            return [match.metadata for match in results.matches]
+            return [
+                {**(match.metadata or {}), "id": (match.metadata or {}).get("property_id", match.id)}
+                for match in results.matches
+            ]
             
         except Exception as e:
             logger.error(f"Error in similarity search: {str(e)}")
@@ -248,11 +279,12 @@ class PineconeService:
             query_text = " ".join([f"{k}: {v}" for k, v in filters.items() if v])
             
             # Generate embedding for the query
-            response = self.model.generate_content(query_text)
+            response = await self.model.generate_content_async(query_text)
             query_embedding = response.embedding
             
             # Search in Pinecone
-            results = self.index_connections["properties"].query(
+            index = await self._index("properties")
+            results = index.query(
                 vector=query_embedding,
                 namespace=self.indexes["properties"]["namespace"],
                 top_k=5,
@@ -0,0 +1,120 @@
+from typing import Optional
+from contextlib import contextmanager
+import asyncio
+import logging
+import random
+import time
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+voice_sessions_active = metrics.gauge("voice_sessions_active")
+voice_sessions_rejected_total = metrics.counter("voice_sessions_rejected_total")
+voice_turns_in_flight = metrics.gauge("voice_turns_in_flight")
+event_loop_lag_seconds = metrics.gauge("event_loop_lag_seconds")
+
+# "Try Again Later" (RFC 6455): sent to connections refused while the process is saturated
+BUSY_CLOSE_CODE = 1013
+
+class SessionAdmission:
+    """Process-wide admission control for voice sessions.
+
+    A new session is refused when the process already serves `max_sessions`, when
+    `max_turns_in_flight` turns are waiting on STT/LLM/TTS providers, or when the event
+    loop lags by more than `max_loop_lag` seconds (measured by `start`'s monitor task).
+    Refusing early keeps the sessions already admitted within provider timeouts instead
+    of letting every session on the pod degrade together. The lag signal relies on turns
+    awaiting their provider calls: a synchronous call on the loop would read as lag for
+    as long as it runs.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        max_turns_in_flight: int,
+        max_loop_lag: float,
+        lag_interval: float = 0.5,
+        retry_after: int = 5
+    ):
+        self.max_sessions = max_sessions
+        self.max_turns_in_flight = max_turns_in_flight
+        self.max_loop_lag = max_loop_lag
+        self.lag_interval = lag_interval
+        self.retry_after = retry_after
+        self.active_sessions = 0
+        self.turns_in_flight = 0
+        self.loop_lag = 0.0
+        self._monitor: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start measuring event loop lag"""
+        if self._monitor is None:
+            self._monitor = asyncio.create_task(self._measure_loop_lag())
+
+    async def stop(self):
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None:
+            monitor.cancel()
+            await asyncio.gather(monitor, return_exceptions=True)
+
+    def overload_reason(self) -> Optional[str]:
+        """Why a new session can't be served right now, or None"""
+        if self.active_sessions >= self.max_sessions:
+            return "sessions"
+        if self.turns_in_flight >= self.max_turns_in_flight:
+            return "turns"
+        if self.loop_lag > self.max_loop_lag:
+            return "loop_lag"
+        return None
+
+    def admit(self) -> Optional[str]:
+        """Take a session slot; returns the overload reason instead when the process is saturated"""
+        reason = self.overload_reason()
+        if reason is not None:
+            voice_sessions_rejected_total.inc(reason=reason)
+            logger.warning(f"Refusing voice session: {reason} (sessions={self.active_sessions}, "
+                           f"turns={self.turns_in_flight}, loop_lag={self.loop_lag:.3f}s)")
+            return reason
+        self.active_sessions += 1
+        voice_sessions_active.set(self.active_sessions)
+        return None
+
+    def release(self):
+        """Give back a slot taken by `admit`"""
+        self.active_sessions = max(self.active_sessions - 1, 0)
+        voice_sessions_active.set(self.active_sessions)
+
+    def retry_after_seconds(self) -> int:
+        # Jittered so clients refused together don't all come back together
+        return random.randint(self.retry_after, 2 * self.retry_after)
+
+    @contextmanager
+    def turn(self):
+        """Count a turn as in flight for its duration"""
+        self.turns_in_flight += 1
+        voice_turns_in_flight.set(self.turns_in_flight)
+        try:
+            yield
+        finally:
+            self.turns_in_flight -= 1
+            voice_turns_in_flight.set(self.turns_in_flight)
+
+    async def _measure_loop_lag(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(time.perf_counter() - started - self.lag_interval, 0.0)
+            # Decay rather than overwrite, so one stall keeps shedding for a few intervals
+            self.loop_lag = max(lag, self.loop_lag / 2)
+            event_loop_lag_seconds.set(self.loop_lag)
+
+# Global voice session admission control
+session_admission = SessionAdmission(
+    max_sessions=settings.VOICE_MAX_SESSIONS,
+    max_turns_in_flight=settings.VOICE_MAX_TURNS_IN_FLIGHT,
+    max_loop_lag=settings.VOICE_MAX_LOOP_LAG_MS / 1000,
+    lag_interval=settings.VOICE_LOOP_LAG_INTERVAL_MS / 1000,
+    retry_after=settings.VOICE_RETRY_AFTER_SECONDS
+)
@@ -1,84 +1,101 @@
 import logging
 from typing import Dict, Any, List, Optional
 import traceback
-from deepgram import Deepgram
 from elevenlabs.client import ElevenLabs
 from app.core.config import get_settings
+from app.core.http import HTTPClientRegistry, http_clients
+from app.core.metrics import metrics
+from app.services.voice.utterance_buffer import UtteranceBuffer
+from app.utils.voice import is_wav, prepare_recording
 import asyncio
-import io
-import json
-import tempfile
-import os
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+stt_recordings_total = metrics.counter("stt_recordings_total")
+
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, clients: HTTPClientRegistry = http_clients):
         self.elevenlabs = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
-        self.deepgram = Deepgram(settings.DEEPGRAM_API_KEY)
+        # Prerecorded transcription goes over the shared, pooled Deepgram client
+        self.deepgram_api_key = settings.DEEPGRAM_API_KEY
+        self.deepgram_url = "https://api.deepgram.com/v1/listen"
+        self.clients = clients
+        self.utterance = UtteranceBuffer()
         logger.info("AudioProcessor initialized with API keys")
 
-    async def process_audio(self, audio_data: bytes) -> Optional[str]:
-        """Process audio data to text using Deepgram"""
+    def append_audio(self, chunk: bytes):
+        """Add a chunk to the utterance being recorded"""
+        self.utterance.append(chunk)
+
+    async def process_audio(self, audio_data: Optional[bytes] = None) -> Optional[str]:
+        """Transcribe the buffered utterance, plus `audio_data` if given, using Deepgram.
+
+        The recording is normalized and re-encoded before upload (see prepare_recording);
+        one without speech is never sent, and one that can't be decoded is sent as is.
+        Raises UtteranceTooLarge when the utterance exceeds the configured size.
+        """
+        if audio_data:
+            self.append_audio(audio_data)
+        if not len(self.utterance):
+            return None
+        audio = self.utterance.take()
+        try:
+            prepared = await asyncio.to_thread(prepare_recording, audio)
+        except ValueError as e:
+            logger.warning(f"Could not normalize audio, uploading as is: {str(e)}")
+            stt_recordings_total.inc(result="raw")
+            prepared = (audio, 'audio/wav' if is_wav(audio) else 'audio/webm')
+        else:
+            if prepared is None:
+                stt_recordings_total.inc(result="silent")
+                logger.debug("No speech in %d byte recording, skipping transcription", len(audio))
+                return None
+            stt_recordings_total.inc(result="normalized")
+        buffer, mimetype = prepared
         try:
             # Log the audio data size for debugging
-            logger.info(f"Received audio data of size: {len(audio_data)} bytes")
+            logger.info(
+                "Received audio data of size: %d bytes, uploading %d bytes", len(audio), len(buffer),
+                extra={"sample_every": 20}
+            )
             
-            # Save audio data to a temporary file
-            with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
+            # Deepgram reads the buffer directly; nothing touches the filesystem
+            options = {
+                'smart_format': 'true',
+                'model': 'nova-2',
+                'language': 'en-US',
+                'punctuate': 'true'
+            }
             
-            try:
-                # Open the temporary file for Deepgram
-                with open(temp_file_path, 'rb') as audio_file:
-                    # Create a source from the audio file
-                    source = {
-                        'buffer': audio_file,
-                        'mimetype': 'audio/webm'
-                    }
-                    
-                    # Configure Deepgram options
-                    options = {
-                        'smart_format': True,
-                        'model': 'nova-2',
-                        'language': 'en-US',
-                        'punctuate': True
-                    }
-                    
-                    # Send to Deepgram for transcription
-                    response = await self.deepgram.transcription.prerecorded(source, options)
-                    logger.info(f"Deepgram raw response: {json.dumps(response)}")
-                    
-                    if response and isinstance(response, dict):
-                        results = response.get('results', {})
-                        channels = results.get('channels', [])
-                        
-                        if channels and len(channels) > 0:
-                            alternatives = channels[0].get('alternatives', [])
-                            if alternatives and len(alternatives) > 0:
-                                transcript = alternatives[0].get('transcript', '').strip()
-                                if transcript:
-                                    logger.info(f"Successfully transcribed text: {transcript}")
-                                    return transcript
-                    
-                    logger.error("No valid transcript found in response structure")
-                    return None
-                    
-            except Exception as transcription_error:
-                logger.error(f"Deepgram transcription error: {str(transcription_error)}")
-                logger.error(traceback.format_exc())
-                return None
-            finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except Exception as e:
-                    logger.error(f"Error removing temporary file: {str(e)}")
+            # Send to Deepgram for transcription
+            result = await self.clients.client("deepgram").post(
+                self.deepgram_url,
+                params=options,
+                headers={"Authorization": f"Token {self.deepgram_api_key}", "Content-Type": mimetype},
+                content=bytes(buffer)
+            )
+            result.raise_for_status()
+            response = result.json()
+            logger.debug("Deepgram raw response: %s", response)
+            
+            if response and isinstance(response, dict):
+                results = response.get('results', {})
+                channels = results.get('channels', [])
+                
+                if channels and len(channels) > 0:
+                    alternatives = channels[0].get('alternatives', [])
+                    if alternatives and len(alternatives) > 0:
+                        transcript = alternatives[0].get('transcript', '').strip()
+                        if transcript:
+                            logger.debug("Successfully transcribed text: %s", transcript)
+                            return transcript
+            
+            logger.error("No valid transcript found in response structure")
+            return None
             
         except Exception as e:
-            logger.error(f"Error processing audio: {str(e)}")
+            logger.error(f"Deepgram transcription error: {str(e)}")
             logger.error(traceback.format_exc())
             return None
 
@@ -100,12 +117,11 @@ class AudioProcessor:
                 )
             )
             
-            # Convert generator to bytes
-            audio_bytes = b''
+            # Convert generator to bytes, joining once instead of re-copying per chunk
             try:
-                for chunk in audio_stream:
-                    if isinstance(chunk, (bytes, bytearray)):
-                        audio_bytes += chunk
+                audio_bytes = b''.join(
+                    chunk for chunk in audio_stream if isinstance(chunk, (bytes, bytearray))
+                )
                 
                 logger.info(f"Generated speech audio of size: {len(audio_bytes)} bytes")
                 return audio_bytes
@@ -123,5 +139,3 @@ class AudioProcessor:
             if "quota_exceeded" in str(e):
                 raise Exception("Voice generation quota exceeded. Please try again later.") from e
             raise Exception("Could not generate speech. Please try again.") from e
-
-audio_processor = AudioProcessor()
\ No newline at end of file
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional, Tuple, Union
+from dataclasses import dataclass
+from enum import IntEnum
+import json
+import struct
+
+# Binary frame layout for the voice WebSocket, big-endian:
+#   version u8 | type u8 | turn u32 | seq u32 | payload
+# `turn` is the conversation turn the frame belongs to (0 when it isn't tied to one) and
+# `seq` numbers the frames of a turn from 0, so clients can order audio, spot gaps and
+# drop frames of interrupted turns without extra round trips.
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("!BBII")
+
+class FrameType(IntEnum):
+    AUDIO = 1  # MP3 bytes
+    INTERIM_TRANSCRIPT = 2  # UTF-8 text
+    TRANSCRIPT = 3  # UTF-8 text
+    RESPONSE = 4  # UTF-8 JSON: text, properties (and trace when enabled)
+    AUDIO_START = 5  # UTF-8 MIME type of the AUDIO frames that follow
+    AUDIO_END = 6  # Empty; the turn's audio is complete
+    INTERRUPT = 7  # Empty; stop playing `turn` and discard its remaining frames
+
+# Legacy JSON message types and how they map onto frames. Anything else (errors,
+# connection status) stays a JSON text message.
+MESSAGE_FRAME_TYPES = {
+    "interim_transcription": FrameType.INTERIM_TRANSCRIPT,
+    "transcription": FrameType.TRANSCRIPT,
+    "response": FrameType.RESPONSE,
+    "audio_start": FrameType.AUDIO_START,
+    "audio_end": FrameType.AUDIO_END,
+    "interrupt": FrameType.INTERRUPT,
+}
+
+@dataclass
+class Frame:
+    type: FrameType
+    turn: int
+    seq: int
+    payload: bytes
+
+def encode_frame(frame_type: FrameType, turn: int, seq: int, payload: bytes = b"") -> bytes:
+    return FRAME_HEADER.pack(FRAME_VERSION, frame_type, turn, seq) + payload
+
+def decode_frame(data: bytes) -> Frame:
+    """Parse a frame; raises ValueError for truncated frames or unknown versions/types"""
+    if len(data) < FRAME_HEADER.size:
+        raise ValueError(f"Frame too short: {len(data)} bytes")
+    version, frame_type, turn, seq = FRAME_HEADER.unpack_from(data)
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported frame version: {version}")
+    return Frame(FrameType(frame_type), turn, seq, bytes(data[FRAME_HEADER.size:]))
+
+def message_to_frame(message: Union[Dict[str, Any], bytes]) -> Optional[Tuple[FrameType, bytes]]:
+    """Frame type and payload for an outgoing message, or None if it stays JSON"""
+    if isinstance(message, (bytes, bytearray, memoryview)):
+        return FrameType.AUDIO, bytes(message)
+    frame_type = MESSAGE_FRAME_TYPES.get(message.get("type"))
+    if frame_type in (FrameType.INTERIM_TRANSCRIPT, FrameType.TRANSCRIPT):
+        return frame_type, message["text"].encode()
+    if frame_type == FrameType.RESPONSE:
+        body = {key: value for key, value in message.items() if key != "type"}
+        return frame_type, json.dumps(body, default=str).encode()
+    if frame_type == FrameType.AUDIO_START:
+        return frame_type, message.get("format", "audio/mpeg").encode()
+    if frame_type is not None:
+        return frame_type, b""
+    return None
@@ -0,0 +1,217 @@
+from typing import List, Dict, Any, Optional, AsyncIterator
+from dataclasses import dataclass
+from urllib.parse import urlencode
+import asyncio
+import json
+import logging
+import time
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.utils.voice import VoiceActivityDetector
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+stt_sessions_total = metrics.counter("stt_sessions_total")
+# Time from the client signalling end of audio to the final transcript being available
+stt_finalize_seconds = metrics.histogram("stt_finalize_seconds")
+stt_chunks_total = metrics.counter("stt_chunks_total")
+
+@dataclass
+class TranscriptEvent:
+    text: str
+    is_final: bool  # True when the utterance is complete and can start a turn
+    confidence: float = 0.0
+
+def live_options(encoding: Optional[str] = None) -> Dict[str, Any]:
+    """Deepgram live query parameters.
+
+    Containerized input (webm/opus) is detected by Deepgram; raw PCM ("linear16") needs
+    its encoding and sample rate spelled out.
+    """
+    options = {
+        "model": settings.DEEPGRAM_MODEL,
+        "language": "en-US",
+        "smart_format": "true",
+        "punctuate": "true",
+        "interim_results": "true",
+        "endpointing": settings.STT_ENDPOINTING_MS,
+        "utterance_end_ms": settings.STT_UTTERANCE_END_MS,
+    }
+    if encoding:
+        options.update(encoding=encoding, sample_rate=settings.STT_SAMPLE_RATE, channels=1)
+    return options
+
+class LiveTranscriptionSession:
+    """One Deepgram live transcription socket for a continuous audio stream.
+
+    Audio chunks are forwarded as they arrive. Finalized segments are accumulated until
+    Deepgram signals the end of speech (speech_final or UtteranceEnd), then published
+    as one final TranscriptEvent; everything before that is published as interim text.
+    """
+
+    def __init__(
+        self,
+        events: asyncio.Queue,
+        api_key: Optional[str] = None,
+        url: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        keepalive_interval: float = 5.0
+    ):
+        self.events = events
+        self.api_key = api_key or settings.DEEPGRAM_API_KEY
+        self.url = url or settings.DEEPGRAM_LIVE_URL
+        self.options = options or live_options()
+        self.keepalive_interval = keepalive_interval
+        self._socket = None
+        self._receiver: Optional[asyncio.Task] = None
+        self._keepalive: Optional[asyncio.Task] = None
+        self._segments: List[str] = []
+        self._confidences: List[float] = []
+        self._finish_started: Optional[float] = None
+
+    async def start(self):
+        """Open the live transcription socket"""
+        self._socket = await connect(
+            f"{self.url}?{urlencode(self.options)}",
+            additional_headers={"Authorization": f"Token {self.api_key}"}
+        )
+        self._receiver = asyncio.create_task(self._receive())
+        self._keepalive = asyncio.create_task(self._send_keepalives())
+        stt_sessions_total.inc()
+
+    async def send(self, chunk: bytes):
+        """Forward an audio chunk"""
+        await self._socket.send(chunk)
+
+    async def finish(self, timeout: float = 5.0):
+        """Flush outstanding audio, publish the last transcript and close the socket"""
+        if self._socket is None:
+            return
+        self._finish_started = time.perf_counter()
+        try:
+            await self._socket.send(json.dumps({"type": "CloseStream"}))
+            # Deepgram sends the remaining results and closes the socket itself
+            await asyncio.wait_for(asyncio.shield(self._receiver), timeout=timeout)
+        except (asyncio.TimeoutError, ConnectionClosed):
+            logger.warning("Live transcription did not close cleanly")
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Close the socket without waiting for outstanding results"""
+        for task in (self._keepalive, self._receiver):
+            if task is not None and not task.done():
+                task.cancel()
+        if self._socket is not None:
+            await self._socket.close()
+            self._socket = None
+        await self._publish_utterance()
+
+    async def _send_keepalives(self):
+        # Deepgram closes sockets that see no audio for ~10 seconds
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self._socket.send(json.dumps({"type": "KeepAlive"}))
+            except ConnectionClosed:
+                return
+
+    async def _receive(self):
+        try:
+            async for message in self._socket:
+                if isinstance(message, bytes):
+                    continue
+                await self._handle_message(json.loads(message))
+        except ConnectionClosed as e:
+            logger.debug("Live transcription socket closed: %s", e)
+        await self._publish_utterance()
+
+    async def _handle_message(self, message: Dict[str, Any]):
+        message_type = message.get("type")
+        if message_type == "UtteranceEnd":
+            await self._publish_utterance()
+            return
+        if message_type != "Results":
+            return
+
+        alternatives = message.get("channel", {}).get("alternatives") or [{}]
+        transcript = (alternatives[0].get("transcript") or "").strip()
+        if message.get("is_final"):
+            if transcript:
+                self._segments.append(transcript)
+                self._confidences.append(alternatives[0].get("confidence", 0.0))
+            if message.get("speech_final"):
+                await self._publish_utterance()
+            elif transcript:
+                await self.events.put(TranscriptEvent(text=" ".join(self._segments), is_final=False))
+        elif transcript:
+            await self.events.put(TranscriptEvent(text=" ".join(self._segments + [transcript]), is_final=False))
+
+    async def _publish_utterance(self):
+        if not self._segments:
+            return
+        text = " ".join(self._segments)
+        confidence = sum(self._confidences) / len(self._confidences)
+        self._segments, self._confidences = [], []
+        if self._finish_started is not None:
+            stt_finalize_seconds.observe(time.perf_counter() - self._finish_started)
+        await self.events.put(TranscriptEvent(text=text, is_final=True, confidence=confidence))
+
+class StreamingTranscriber:
+    """Per-connection streaming speech-to-text.
+
+    A client recording is a single webm stream, so each recording gets its own live
+    session: it opens on the first chunk and is finished by `end_audio`. Transcript
+    events from every session arrive, in order, on one queue read via `events()`.
+
+    For raw PCM input a VoiceActivityDetector gates the stream: silence is never sent
+    (a session only opens once speech starts) and the utterance is finished as soon as
+    the detector's hangover runs out, without waiting for the client to stop recording.
+    """
+
+    def __init__(self, session_factory=LiveTranscriptionSession, vad: Optional[VoiceActivityDetector] = None):
+        self.session_factory = session_factory
+        self.vad = vad
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._session: Optional[LiveTranscriptionSession] = None
+
+    async def feed(self, chunk: bytes):
+        """Forward a chunk of the current recording, opening a session if needed"""
+        activity = self.vad.process(chunk) if self.vad is not None else None
+        if activity is not None and not activity.is_speech:
+            stt_chunks_total.inc(result="dropped")
+        else:
+            if self._session is None:
+                session = self.session_factory(self._events)
+                await session.start()
+                self._session = session
+            await self._session.send(chunk)
+            stt_chunks_total.inc(result="forwarded")
+        if activity is not None and activity.end_of_utterance:
+            await self.end_audio()
+
+    async def end_audio(self):
+        """The client stopped recording; publish the final transcript"""
+        if self.vad is not None:
+            self.vad.reset()
+        session, self._session = self._session, None
+        if session is not None:
+            await session.finish()
+
+    async def close(self):
+        """Drop the current session and stop the event stream"""
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+        await self._events.put(None)
+
+    async def events(self) -> AsyncIterator[TranscriptEvent]:
+        """Interim and final transcripts until `close`"""
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
@@ -1,5 +1,6 @@
-import aiohttp
+import httpx
 from app.core.config import get_settings
+from app.core.http import http_clients
 from fastapi import HTTPException
 import asyncio
 from datetime import datetime, timedelta
@@ -71,35 +72,35 @@ class LiveKitService:
             logger.debug(f"Generated admin token: {token[:20]}...")
             
             # Create room via REST API
-            async with aiohttp.ClientSession() as session:
-                # Try both API endpoints
-                endpoints = [
-                    f"{self.api_url}/twirp/livekit.RoomService/CreateRoom",
-                    f"{self.api_url}/room/create"
-                ]
-                
-                for endpoint in endpoints:
-                    try:
-                        async with session.post(
-                            endpoint,
-                            headers={
-                                "Authorization": f"Bearer {token}",
-                                "Content-Type": "application/json"
-                            },
-                            json={"name": room_name}
-                        ) as response:
-                            if response.status == 200:
-                                room_data = await response.json()
-                                logger.info(f"Created room successfully: {room_name}")
-                                return room_data
-                            elif response.status != 404:  # If not 404, break as we got a definitive error
-                                response.raise_for_status()
-                    except aiohttp.ClientError as e:
-                        logger.warning(f"Failed to create room using endpoint {endpoint}: {str(e)}")
-                        continue
-                
-                # If we get here, both endpoints failed
-                raise HTTPException(status_code=500, detail="Failed to create room")
+            client = http_clients.client("livekit")
+            # Try both API endpoints
+            endpoints = [
+                f"{self.api_url}/twirp/livekit.RoomService/CreateRoom",
+                f"{self.api_url}/room/create"
+            ]
+            
+            for endpoint in endpoints:
+                try:
+                    response = await client.post(
+                        endpoint,
+                        headers={
+                            "Authorization": f"Bearer {token}",
+                            "Content-Type": "application/json"
+                        },
+                        json={"name": room_name}
+                    )
+                    if response.status_code == 200:
+                        room_data = response.json()
+                        logger.info(f"Created room successfully: {room_name}")
+                        return room_data
+                    elif response.status_code != 404:  # If not 404, break as we got a definitive error
+                        response.raise_for_status()
+                except httpx.HTTPError as e:
+                    logger.warning(f"Failed to create room using endpoint {endpoint}: {str(e)}")
+                    continue
+            
+            # If we get here, both endpoints failed
+            raise HTTPException(status_code=500, detail="Failed to create room")
                 
         except Exception as e:
             logger.error(f"Error creating room: {str(e)}")
@@ -0,0 +1,172 @@
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import unicodedata
+import uuid
+from cachetools import LRUCache
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+tts_cache_total = metrics.counter("tts_cache_total")
+tts_cache_bytes = metrics.gauge("tts_cache_bytes")
+
+def normalize_text(text: str) -> str:
+    """Text as it affects synthesis: NFC, trimmed, whitespace runs collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def tts_cache_key(text: str, voice_id: str, model_id: str, voice_settings: Dict[str, Any]) -> str:
+    """Content address of a synthesized phrase; any input that changes the audio changes the key"""
+    payload = json.dumps(
+        {"text": normalize_text(text), "voice": voice_id, "model": model_id, "settings": voice_settings},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class TTSCache:
+    """Synthesized audio keyed by content address, in two tiers.
+
+    Recently used clips are held in an in-memory LRU bounded by total bytes. Every clip
+    is also written to a blob store on disk (`<directory>/<key[:2]>/<key>.mp3`) that
+    survives restarts and is shared by workers on the same host; it is evicted least
+    recently used first once it exceeds `max_disk_bytes`. Disk I/O runs in worker
+    threads.
+    """
+
+    def __init__(self, directory: str, max_memory_bytes: int = 64 * 1024 * 1024, max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: LRUCache = LRUCache(maxsize=max_memory_bytes, getsizeof=len)
+        # key -> size, least recently used first; built from the directory on first use
+        self._disk: Optional[OrderedDict] = None
+        self._disk_bytes = 0
+        self._index_lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for `key`, promoting disk hits into memory"""
+        audio = self._memory.get(key)
+        if audio is not None:
+            # Disk recency must follow memory hits too, or the hottest clips are evicted first
+            if self._disk is not None and key in self._disk:
+                self._disk.move_to_end(key)
+            tts_cache_total.inc(result="memory")
+            return audio
+
+        disk = await self._index()
+        if key in disk:
+            try:
+                audio = await asyncio.to_thread(self._read, key)
+            except OSError as e:
+                logger.warning(f"Dropping unreadable TTS cache entry {key}: {str(e)}")
+                self._forget(key)
+            else:
+                disk.move_to_end(key)
+                self._remember(key, audio)
+                tts_cache_total.inc(result="disk")
+                return audio
+
+        tts_cache_total.inc(result="miss")
+        return None
+
+    async def put(self, key: str, audio: bytes):
+        """Store audio in memory and on disk, evicting old blobs past the disk budget"""
+        if not audio:
+            return
+        self._remember(key, audio)
+        disk = await self._index()
+        if key in disk:
+            disk.move_to_end(key)
+            return
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        except OSError as e:
+            logger.error(f"Error writing TTS cache entry: {str(e)}")
+            return
+        disk[key] = len(audio)
+        self._disk_bytes += len(audio)
+        await self._evict()
+
+    def _remember(self, key: str, audio: bytes):
+        try:
+            self._memory[key] = audio
+        except ValueError:
+            # Larger than the whole memory budget; serve it from disk only
+            pass
+        tts_cache_bytes.set(self._memory.currsize, tier="memory")
+
+    def _forget(self, key: str):
+        if self._disk is not None and key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
+            tts_cache_bytes.set(self._disk_bytes, tier="disk")
+
+    async def _evict(self):
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._memory.pop(key, None)
+            evicted.append(key)
+        tts_cache_bytes.set(self._disk_bytes, tier="disk")
+        if evicted:
+            logger.debug("Evicting %d TTS cache entries", len(evicted))
+            await asyncio.to_thread(self._delete, evicted)
+
+    async def _index(self) -> OrderedDict:
+        if self._disk is None:
+            async with self._index_lock:
+                if self._disk is None:
+                    entries = await asyncio.to_thread(self._scan)
+                    self._disk = OrderedDict((key, size) for key, size, _ in entries)
+                    self._disk_bytes = sum(self._disk.values())
+                    tts_cache_bytes.set(self._disk_bytes, tier="disk")
+                    await self._evict()
+        return self._disk
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def _read(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as blob:
+            return blob.read()
+
+    def _write(self, key: str, audio: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers in other workers never see a partial clip
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as blob:
+            blob.write(audio)
+        os.replace(temp_path, path)
+
+    def _delete(self, keys):
+        for key in keys:
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """Existing blobs as (key, size, mtime), oldest first"""
+        entries = []
+        if os.path.isdir(self.directory):
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+                for blob in os.scandir(shard.path):
+                    if blob.name.endswith(".mp3"):
+                        stat = blob.stat()
+                        entries.append((blob.name[:-4], stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+# Global TTS audio cache
+tts_cache = TTSCache(
+    settings.TTS_CACHE_DIR,
+    max_memory_bytes=settings.TTS_CACHE_MEMORY_BYTES,
+    max_disk_bytes=settings.TTS_CACHE_DISK_BYTES
+)
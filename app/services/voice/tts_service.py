@@ -1,28 +1,87 @@
+from typing import AsyncIterator, Iterable, List, Optional
+import asyncio
+import re
+import time
 import httpx
 from app.core.config import get_settings
+from app.core.http import HTTPClientRegistry, http_clients
+from app.core.metrics import metrics
+from app.services.voice.tts_cache import TTSCache, tts_cache, tts_cache_key
 import logging
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Time from request to the first audio chunk, i.e. when the client can start playback
+tts_first_chunk_seconds = metrics.histogram("tts_first_chunk_seconds")
+
+# Sentence ends, and line breaks between listing details
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def split_sentences(text: str, min_chars: Optional[int] = None) -> List[str]:
+    """Split text into sentences for synthesis.
+
+    Pieces shorter than `min_chars` are kept with the following text (a trailing short
+    piece joins the previous sentence), so a request is never spent on a fragment.
+    """
+    min_chars = min_chars or settings.TTS_SENTENCE_MIN_CHARS
+    sentences: List[str] = []
+    starts: List[int] = []
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        sentence = text[start:match.start()].strip()
+        if len(sentence) >= min_chars:
+            sentences.append(sentence)
+            starts.append(start)
+            start = match.end()
+    tail = text[start:].strip()
+    if tail and sentences and len(tail) < min_chars:
+        sentences[-1] = text[starts[-1]:].strip()
+    elif tail:
+        sentences.append(tail)
+    return sentences
+
 class TTSService:
-    def __init__(self):
+    def __init__(self, cache: Optional[TTSCache] = None, clients: HTTPClientRegistry = http_clients):
         # Initialize ElevenLabs settings
         self.api_key = settings.ELEVENLABS_API_KEY
         self.api_url = "https://api.elevenlabs.io/v1/text-to-speech"
         # Bella voice ID
         self.voice = "EXAVITQu4vr4xnSDxMaL"
+        self.model_id = "eleven_monolingual_v1"
+        self.voice_settings = {
+            "stability": 0.5,
+            "similarity_boost": 0.75
+        }
+        self.cache = cache
+        self.clients = clients
+        # Concurrent synthesis requests from this process, kept within the provider's limit
+        self._slots = asyncio.Semaphore(settings.TTS_MAX_CONCURRENCY)
 
-    async def text_to_speech(self, text: str) -> bytes:
-        """Convert text to speech using ElevenLabs"""
-        if not self.api_key:
-            logger.error("ElevenLabs API key is not set")
-            raise ValueError("ElevenLabs API key is not configured")
+    def cache_key(self, text: str) -> str:
+        return tts_cache_key(text, self.voice, self.model_id, self.voice_settings)
+
+    async def stream_speech(self, text: str) -> AsyncIterator[bytes]:
+        """Yield MP3 chunks as they arrive from ElevenLabs' streaming endpoint.
 
+        Cached phrases are returned as a single chunk without calling the provider;
+        completed syntheses are added to the cache.
+        """
         if not text or not text.strip():
             logger.error("Empty text provided for TTS conversion")
             raise ValueError("Cannot convert empty text to speech")
 
+        key = self.cache_key(text) if self.cache is not None else None
+        if key is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        if not self.api_key:
+            logger.error("ElevenLabs API key is not set")
+            raise ValueError("ElevenLabs API key is not configured")
+
         try:
             # Call ElevenLabs API directly
             headers = {
@@ -33,31 +92,38 @@ class TTSService:
             
             data = {
                 "text": text,
-                "model_id": "eleven_monolingual_v1",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.75
-                }
+                "model_id": self.model_id,
+                "voice_settings": self.voice_settings
             }
             
-            url = f"{self.api_url}/{self.voice}"
-            logger.info(f"Making TTS request for text: {text[:50]}...")
+            url = f"{self.api_url}/{self.voice}/stream"
+            logger.debug("Making TTS request for text: %.50s...", text)
+            started = time.perf_counter()
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=data, headers=headers)
+            client = self.clients.client("elevenlabs")
+            async with client.stream("POST", url, json=data, headers=headers) as response:
                 response.raise_for_status()
                 
                 if response.headers.get('content-type') != 'audio/mpeg':
                     logger.error(f"Unexpected content type from TTS API: {response.headers.get('content-type')}")
                     raise ValueError("Invalid response from TTS service")
                 
-                content = response.content
-                if not content or len(content) == 0:
+                chunks = []
+                async for chunk in response.aiter_bytes():
+                    if not chunk:
+                        continue
+                    if not chunks:
+                        tts_first_chunk_seconds.observe(time.perf_counter() - started)
+                    chunks.append(chunk)
+                    yield chunk
+                
+                if not chunks:
                     logger.error("Received empty response from TTS API")
                     raise ValueError("Empty response from TTS service")
-                
-                logger.info(f"Successfully generated audio of size: {len(content)} bytes")
-                return content
+                logger.debug("Streamed audio in %d chunks", len(chunks))
+            
+            if key is not None:
+                await self.cache.put(key, b"".join(chunks))
             
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error in TTS conversion: {str(e)}")
@@ -65,8 +131,68 @@ class TTSService:
                 raise ValueError("Invalid ElevenLabs API key")
             raise ValueError(f"TTS API error: {e.response.status_code}")
             
+        except ValueError:
+            raise
+            
         except Exception as e:
             logger.error(f"Error in text-to-speech conversion: {str(e)}")
             raise ValueError(f"Failed to convert text to speech: {str(e)}")
 
-tts_service = TTSService()
+    async def stream_sentences(self, text: str) -> AsyncIterator[bytes]:
+        """Synthesize the sentences of `text` concurrently and yield their audio strictly in order.
+
+        Every sentence starts synthesizing right away, bounded by TTS_MAX_CONCURRENCY
+        requests per process. The current sentence streams as it arrives; later ones
+        are buffered until it finishes, so total time approaches that of the longest
+        sentence instead of the whole text.
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            raise ValueError("Cannot convert empty text to speech")
+        queues = [asyncio.Queue() for _ in sentences]
+        tasks = [
+            asyncio.create_task(self._synthesize_into(sentence, queue))
+            for sentence, queue in zip(sentences, queues)
+        ]
+        try:
+            for queue in queues:
+                while (chunk := await queue.get()) is not None:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+        finally:
+            # Abandon the remaining sentences if the consumer stops early (e.g. barge-in)
+            for task in tasks:
+                task.cancel()
+
+    async def _synthesize_into(self, sentence: str, queue: asyncio.Queue):
+        try:
+            async with self._slots:
+                async for chunk in self.stream_speech(sentence):
+                    queue.put_nowait(chunk)
+        except Exception as e:
+            # Raised by the consumer when it reaches this sentence
+            queue.put_nowait(e)
+            return
+        queue.put_nowait(None)
+
+    async def text_to_speech(self, text: str) -> bytes:
+        """Convert text to speech using ElevenLabs, returning the whole MP3"""
+        return b"".join([chunk async for chunk in self.stream_sentences(text)])
+
+    async def prewarm(self, phrases: Iterable[str]):
+        """Synthesize sentences that aren't cached yet so later requests are cache hits"""
+        if self.cache is None:
+            return
+        warmed = 0
+        for phrase in phrases:
+            for sentence in split_sentences(phrase):
+                try:
+                    if await self.cache.get(self.cache_key(sentence)) is None:
+                        await self.text_to_speech(sentence)
+                        warmed += 1
+                except ValueError as e:
+                    logger.warning(f"Could not pre-warm TTS phrase: {str(e)}")
+        logger.info(f"Pre-warmed {warmed} TTS sentences")
+
+tts_service = TTSService(cache=tts_cache)
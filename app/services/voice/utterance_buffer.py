@@ -0,0 +1,39 @@
+from typing import Optional
+from app.core.config import get_settings
+
+settings = get_settings()
+
+class UtteranceTooLarge(ValueError):
+    """A recording grew past the configured maximum utterance size"""
+
+class UtteranceBuffer:
+    """Assembles the audio chunks of one utterance in memory.
+
+    Chunks are appended to a growing bytearray; `take` hands the whole utterance off as
+    a memoryview over that bytearray (no copy) and starts a fresh one, so the view
+    stays valid while transcription reads it.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes or settings.MAX_UTTERANCE_BYTES
+        self._buffer = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def append(self, chunk: bytes):
+        """Add a chunk; the utterance is discarded if it would exceed `max_bytes`"""
+        if len(self._buffer) + len(chunk) > self.max_bytes:
+            self.clear()
+            raise UtteranceTooLarge(
+                f"Recording is too long, please keep it under {self.max_bytes // 1024} KB"
+            )
+        self._buffer += chunk
+
+    def take(self) -> memoryview:
+        """Zero-copy view of the assembled utterance; the buffer starts over empty"""
+        buffer, self._buffer = self._buffer, bytearray()
+        return memoryview(buffer)
+
+    def clear(self):
+        self._buffer = bytearray()
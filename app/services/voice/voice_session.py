@@ -0,0 +1,350 @@
+from typing import Any, Dict, Optional, Union
+from dataclasses import dataclass
+from functools import partial
+import asyncio
+import itertools
+import json
+import logging
+import uuid
+from fastapi import WebSocket
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.services.chat.conversation_manager import conversation_manager
+from app.services.db.conversation_writer import conversation_writer
+from app.services.voice.admission import session_admission
+from app.services.voice.frames import encode_frame, message_to_frame
+from app.services.voice.live_transcription import LiveTranscriptionSession, StreamingTranscriber, live_options
+from app.services.voice.tts_service import tts_service
+from app.services.voice.utterance_buffer import UtteranceTooLarge
+from app.utils.voice import VoiceActivityDetector
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+voice_barge_in_total = metrics.counter("voice_barge_in_total")
+voice_turns_total = metrics.counter("voice_turns_total")
+voice_slow_clients_total = metrics.counter("voice_slow_clients_total")
+voice_audio_dropped_total = metrics.counter("voice_audio_dropped_total")
+
+# Outgoing messages that belong to a response and are discarded once its turn is interrupted
+RESPONSE_MESSAGE_TYPES = {"response", "audio_start", "audio", "audio_end", "error"}
+# Frame sequence counters kept for recent turns
+MAX_SEQUENCED_TURNS = 16
+# Policy violation: the client stopped reading what it asked for
+SLOW_CLIENT_CLOSE_CODE = 1008
+
+@dataclass
+class Turn:
+    id: int
+    text: Optional[str] = None  # Transcript; filled in after STT for recorded audio
+    audio: Optional[bytes] = None
+    responded: bool = False  # The text response reached the outbox
+
+class VoiceSession:
+    """One voice conversation over an accepted WebSocket, handled full duplex.
+
+    A reader task keeps draining the socket (audio, control messages) while a turn task
+    answers utterances from a bounded queue, and a writer task sends everything queued on
+    a bounded outbox. When the user starts speaking while a response is being sent, or
+    while the client reports it is still playing one ({"type": "playback", "playing":
+    bool}), the turn is cancelled (abandoning its TTS calls), queued frames from it are
+    dropped and the client is told to stop playback with {"type": "interrupt"}. A new
+    utterance that arrives while the previous one is still waiting on the LLM replaces
+    it and both are answered together; one still being transcribed is left to finish.
+    All queues are bounded: a full outbox holds the turn back, and a client that stops
+    reading for VOICE_SEND_TIMEOUT_SECONDS is disconnected rather than left holding a
+    session.
+
+    Recorded mode: each binary message is a whole recording, transcribed in the turn.
+    Streaming mode: binary messages are chunks forwarded to live transcription by their
+    own task, so the reader never waits on Deepgram, and {"type": "audio_end"} ends a
+    recording; with encoding=linear16 the chunks are PCM and voice activity detection
+    ends utterances on the server.
+
+    Clients that negotiate binary frames (see app.services.voice.frames) get every
+    transcript, response and audio chunk as a frame tagged with its turn and sequence
+    number, and audio is always streamed; other clients get the JSON messages.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        streaming_stt: bool = False,
+        stream_audio: bool = False,
+        encoding: Optional[str] = None,
+        frames: bool = False,
+        audio_processor=None,
+        transcriber: Optional[StreamingTranscriber] = None
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.frames = frames
+        self.stream_audio = stream_audio or frames
+        self.audio_processor = audio_processor
+        self.transcriber = transcriber
+        if streaming_stt and transcriber is None:
+            self.transcriber = self._make_transcriber(encoding)
+        elif not streaming_stt and audio_processor is None:
+            # Imported here: the Deepgram/ElevenLabs SDK clients are only needed in recorded mode
+            from app.services.voice.audio_processor import AudioProcessor
+            self.audio_processor = AudioProcessor()
+        self.turns: asyncio.Queue = asyncio.Queue(maxsize=settings.VOICE_TURN_QUEUE_SIZE)
+        # Audio chunks for the transcriber; None marks the end of a recording
+        self.audio: asyncio.Queue = asyncio.Queue(maxsize=settings.VOICE_AUDIO_QUEUE_SIZE)
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=settings.VOICE_OUTBOX_SIZE)
+        self._turn_ids = itertools.count(1)
+        self._turn: Optional[Turn] = None
+        self._turn_task: Optional[asyncio.Task] = None
+        # Outbox items from turns up to this id belong to interrupted responses
+        self._cancelled_through = 0
+        # The last turn whose response reached the outbox, and whether the client is playing it
+        self._speaking: Optional[Turn] = None
+        self._client_playing = False
+        self._carry_over: Optional[str] = None
+        self._sequences: Dict[int, int] = {}
+
+    @staticmethod
+    def _make_transcriber(encoding: Optional[str]) -> StreamingTranscriber:
+        if encoding == "linear16":
+            return StreamingTranscriber(
+                session_factory=partial(LiveTranscriptionSession, options=live_options(encoding)),
+                vad=VoiceActivityDetector()
+            )
+        return StreamingTranscriber()
+
+    async def run(self):
+        """Serve the connection until the client disconnects"""
+        reader, writer = asyncio.create_task(self._read()), asyncio.create_task(self._write())
+        tasks = [reader, writer, asyncio.create_task(self._process_turns())]
+        if self.transcriber is not None:
+            tasks.append(asyncio.create_task(self._forward_audio()))
+            tasks.append(asyncio.create_task(self._relay_transcripts()))
+        try:
+            # The session also ends when the writer gives up on a client that stopped reading
+            await asyncio.wait([reader, writer], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if self._turn_task is not None:
+                self._turn_task.cancel()
+            for task in tasks:
+                task.cancel()
+            if self.transcriber is not None:
+                await self.transcriber.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _turn_running(self, turn: Optional[Turn]) -> bool:
+        return turn is not None and self._turn is turn and self._turn_task is not None and not self._turn_task.done()
+
+    async def barge_in(self):
+        """The user started speaking: stop the response being sent or played, here and on the client"""
+        turn = self._speaking
+        if turn is None or not (self._client_playing or self._turn_running(turn)):
+            return
+        self._speaking, self._client_playing = None, False
+        self._cancelled_through = max(self._cancelled_through, turn.id)
+        if self._turn_running(turn):
+            self._turn_task.cancel()
+        voice_barge_in_total.inc()
+        logger.debug("Barge-in cancelled turn %s", turn.id)
+        await self._send({"type": "interrupt"}, turn.id)
+
+    def _supersede(self):
+        """A new utterance arrived: drop the current turn if it is still waiting on the LLM
+
+        Its text is carried into the next turn. A turn still in STT has no text to carry
+        and is left to finish.
+        """
+        turn = self._turn
+        if self._turn_running(turn) and turn.text is not None and not turn.responded:
+            logger.debug("Turn %s superseded by a new utterance", turn.id)
+            self._turn_task.cancel()
+
+    async def _read(self):
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                logger.info(f"Client disconnected: {self.user_id}")
+                return
+            try:
+                if message.get("bytes"):
+                    await self._on_audio(message["bytes"])
+                elif message.get("text"):
+                    await self._on_control(json.loads(message["text"]))
+            except Exception as e:
+                logger.error(f"Error processing message: {str(e)}")
+                await self._send({"type": "error", "message": "Error processing message"})
+
+    async def _on_audio(self, chunk: bytes):
+        if self.transcriber is not None:
+            self._queue_audio(chunk)
+            return
+        await self.barge_in()
+        self._supersede()
+        self._enqueue(Turn(next(self._turn_ids), audio=chunk))
+
+    async def _on_control(self, message: Dict[str, Any]):
+        message_type = message.get("type")
+        if message_type == "audio_end" and self.transcriber is not None:
+            self._queue_audio(None)
+        elif message_type == "playback":
+            self._client_playing = bool(message.get("playing"))
+
+    def _queue_audio(self, chunk: Optional[bytes]):
+        """Hand audio to the forwarder without blocking the reader; chunks are dropped when it falls behind"""
+        if self.audio.full():
+            if chunk is not None:
+                voice_audio_dropped_total.inc()
+                return
+            # Never lose the end of a recording: make room by dropping its oldest chunk
+            self.audio.get_nowait()
+            voice_audio_dropped_total.inc()
+        self.audio.put_nowait(chunk)
+
+    async def _forward_audio(self):
+        # Opening a live session and finishing one (which waits for Deepgram's last
+        # results) happen here, off the reader
+        while True:
+            chunk = await self.audio.get()
+            try:
+                if chunk is None:
+                    await self.transcriber.end_audio()
+                else:
+                    await self.transcriber.feed(chunk)
+            except Exception as e:
+                logger.error(f"Error forwarding audio: {str(e)}")
+                await self.transcriber.end_audio()
+                await self._send({"type": "error", "message": "Error processing message"})
+
+    async def _relay_transcripts(self):
+        async for event in self.transcriber.events():
+            await self.barge_in()
+            if not event.is_final:
+                await self._send({"type": "interim_transcription", "text": event.text})
+                continue
+            self._supersede()
+            turn = Turn(next(self._turn_ids), text=event.text)
+            await self._send({"type": "transcription", "text": event.text}, turn.id)
+            self._enqueue(turn)
+
+    def _enqueue(self, turn: Turn):
+        """Queue an utterance without ever blocking the reader; the oldest waiting one is dropped when full"""
+        if self.turns.full():
+            dropped = self.turns.get_nowait()
+            logger.warning(f"Turn queue full, dropping turn {dropped.id} for {self.user_id}")
+        self.turns.put_nowait(turn)
+
+    async def _process_turns(self):
+        while True:
+            turn = await self.turns.get()
+            self._turn = turn
+            self._turn_task = asyncio.create_task(self._run_turn(turn))
+            with session_admission.turn():
+                # wait() rather than await: a cancelled turn must not cancel this loop
+                await asyncio.wait([self._turn_task])
+            if self._turn_task.cancelled():
+                # Speech that never got an answer is prepended to the next utterance
+                if turn.text and not turn.responded:
+                    voice_turns_total.inc(result="superseded")
+                    self._carry_over = turn.text
+                else:
+                    voice_turns_total.inc(result="interrupted")
+            elif self._turn_task.exception() is not None:
+                voice_turns_total.inc(result="error")
+                logger.error(f"Error processing turn: {str(self._turn_task.exception())}")
+                await self._send({"type": "error", "message": "Error processing message"})
+            else:
+                voice_turns_total.inc(result="completed")
+
+    async def _run_turn(self, turn: Turn):
+        if turn.text is None:
+            try:
+                text = await self.audio_processor.process_audio(turn.audio)
+            except UtteranceTooLarge as e:
+                logger.warning(f"Dropped oversized recording from {self.user_id}: {str(e)}")
+                await self._send({"type": "error", "message": str(e)}, turn.id)
+                return
+            if not text:
+                return
+            turn.text = text
+            await self._send({"type": "transcription", "text": text}, turn.id)
+
+        text = turn.text
+        if self._carry_over:
+            text = f"{self._carry_over} {text}"
+            turn.text, self._carry_over = text, None
+
+        # Get AI response
+        response = await conversation_manager.process_query(self.user_id, text)
+        message = {
+            "type": "response",
+            "text": response.text,
+            "properties": response.properties if hasattr(response, 'properties') else None
+        }
+        if settings.DEBUG_TRACE:
+            message["trace"] = response.trace
+        await self._send(message, turn.id)
+        turn.responded = True
+        self._speaking = turn
+        conversation_writer.enqueue(text, response.text, user_id=self.user_id)
+
+        # Convert response to speech and send audio
+        try:
+            if self.stream_audio:
+                await self._send_audio_stream(response.text, turn.id)
+                return
+            audio_data = await tts_service.text_to_speech(response.text)
+            if audio_data and len(audio_data) > 0:
+                logger.debug("Sending audio response of size: %d bytes", len(audio_data))
+                await self._send(audio_data, turn.id)
+            else:
+                logger.error("TTS service returned empty audio data")
+                await self._send({"type": "error", "message": "Failed to generate audio response"}, turn.id)
+        except ValueError as ve:
+            logger.error(f"TTS error: {str(ve)}")
+            await self._send({"type": "error", "message": str(ve)}, turn.id)
+
+    async def _send_audio_stream(self, text: str, turn_id: int):
+        """Forward TTS audio as it is synthesized: audio_start, one binary frame per chunk, audio_end"""
+        stream_id = uuid.uuid4().hex[:8]
+        chunks = 0
+        async for chunk in tts_service.stream_sentences(text):
+            if chunks == 0:
+                await self._send({"type": "audio_start", "stream_id": stream_id, "format": "audio/mpeg"}, turn_id)
+            await self._send(chunk, turn_id)
+            chunks += 1
+        await self._send({"type": "audio_end", "stream_id": stream_id, "chunks": chunks}, turn_id)
+
+    async def _send(self, message: Union[Dict[str, Any], bytes], turn_id: Optional[int] = None):
+        """Queue a message for the writer, tagged with the turn it belongs to"""
+        await self.outbox.put((turn_id, message))
+
+    async def _write(self):
+        while True:
+            turn_id, message = await self.outbox.get()
+            message_type = "audio" if isinstance(message, (bytes, bytearray)) else message["type"]
+            if message_type in RESPONSE_MESSAGE_TYPES and turn_id is not None and turn_id <= self._cancelled_through:
+                continue
+            try:
+                await asyncio.wait_for(self._deliver(turn_id, message), settings.VOICE_SEND_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                voice_slow_clients_total.inc()
+                logger.warning(f"Client {self.user_id} stopped reading, closing the connection")
+                await self.websocket.close(code=SLOW_CLIENT_CLOSE_CODE, reason="Client not reading")
+                return
+
+    async def _deliver(self, turn_id: Optional[int], message: Union[Dict[str, Any], bytes]):
+        frame = message_to_frame(message) if self.frames else None
+        if frame is not None:
+            frame_type, payload = frame
+            await self.websocket.send_bytes(encode_frame(frame_type, turn_id or 0, self._next_seq(turn_id or 0), payload))
+        elif isinstance(message, (bytes, bytearray)):
+            await self.websocket.send_bytes(message)
+        else:
+            await self.websocket.send_json(message)
+
+    def _next_seq(self, turn_id: int) -> int:
+        seq = self._sequences.get(turn_id, 0)
+        self._sequences[turn_id] = seq + 1
+        if len(self._sequences) > MAX_SEQUENCED_TURNS:
+            self._sequences.pop(next(iter(self._sequences)))
+        return seq
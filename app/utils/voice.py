@@ -1,7 +1,213 @@
 from typing import Dict, Optional, Tuple
+from dataclasses import dataclass
 import asyncio
-import aiohttp
-from app.core.config import settings
+import io
+import logging
+import math
+import av
+import numpy as np
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+from app.core.config import get_settings
+from app.core.http import http_clients
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+def pcm16_to_float(audio_data: bytes) -> np.ndarray:
+    """Little-endian 16-bit PCM to float32 samples in [-1, 1]"""
+    count = len(audio_data) // 2
+    return np.frombuffer(audio_data, dtype="<i2", count=count).astype(np.float32) / 32768.0
+
+def speech_frames(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: Optional[int] = None,
+    energy_threshold: Optional[float] = None,
+    zcr_threshold: Optional[float] = None
+) -> np.ndarray:
+    """Per-frame speech flags from RMS energy and zero-crossing rate.
+
+    A frame is speech when it is loud enough, or when it is at least half as loud and
+    crosses zero often (unvoiced sounds like "s" and "f" are quiet but noisy). A
+    trailing partial frame is ignored.
+    """
+    frame_ms = frame_ms or settings.VAD_FRAME_MS
+    energy_threshold = energy_threshold or settings.VAD_ENERGY_THRESHOLD
+    zcr_threshold = zcr_threshold or settings.VAD_ZCR_THRESHOLD
+
+    frame = max(sample_rate * frame_ms // 1000, 2)
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    frames = samples[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame - 1)
+    return (rms >= energy_threshold) | ((rms >= energy_threshold / 2) & (zcr >= zcr_threshold))
+
+def is_wav(audio_data: bytes) -> bool:
+    return audio_data[:4] == b"RIFF" and audio_data[8:12] == b"WAVE"
+
+def wav_to_float(audio_data: bytes) -> Tuple[int, np.ndarray]:
+    """Decode a PCM/float WAV into (sample_rate, float32 samples in [-1, 1], shape (n,) or (n, channels))"""
+    sample_rate, samples = wavfile.read(io.BytesIO(audio_data))
+    if samples.dtype == np.uint8:
+        return sample_rate, (samples.astype(np.float32) - 128) / 128
+    if np.issubdtype(samples.dtype, np.integer):
+        return sample_rate, samples.astype(np.float32) / -np.iinfo(samples.dtype).min
+    return sample_rate, samples.astype(np.float32)
+
+def decode_audio(audio_data: bytes) -> Tuple[int, np.ndarray]:
+    """Decode a recording into (sample_rate, float32 samples).
+
+    WAV is read directly; anything else (browser webm/opus, ogg, mp3) is decoded with
+    PyAV and downmixed and resampled to mono STT_SAMPLE_RATE on the way. Raises
+    ValueError for data that can't be decoded.
+    """
+    if is_wav(audio_data):
+        return wav_to_float(audio_data)
+    chunks = []
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=settings.STT_SAMPLE_RATE)
+    with av.open(io.BytesIO(audio_data)) as container:
+        if not container.streams.audio:
+            raise ValueError("Recording has no audio stream")
+        for frame in container.decode(container.streams.audio[0]):
+            chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(frame))
+        chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(None))
+    samples = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    return settings.STT_SAMPLE_RATE, samples
+
+def encode_opus(samples: np.ndarray, sample_rate: int, bitrate: Optional[int] = None) -> bytes:
+    """Encode mono float samples as Ogg/Opus"""
+    output = io.BytesIO()
+    with av.open(output, mode="w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=sample_rate, layout="mono")
+        stream.bit_rate = bitrate or settings.STT_UPLOAD_BITRATE
+        frame = av.AudioFrame.from_ndarray(
+            (np.clip(samples, -1, 1) * 32767).astype("<i2").reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return output.getvalue()
+
+def to_mono(samples: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """Downmix to mono and resample to `target_rate`"""
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1)
+    if sample_rate != target_rate:
+        divisor = math.gcd(sample_rate, target_rate)
+        samples = resample_poly(samples, target_rate // divisor, sample_rate // divisor)
+    return samples
+
+def normalize_audio(
+    samples: np.ndarray,
+    sample_rate: int,
+    target_rate: Optional[int] = None,
+    peak: Optional[float] = None,
+    pad_ms: Optional[int] = None
+) -> np.ndarray:
+    """Prepare a recording for STT: downmix to mono, resample, trim silence, peak normalize.
+
+    Silence is trimmed before normalizing so amplified background noise isn't mistaken
+    for speech; a recording with no detectable speech is kept whole.
+    """
+    target_rate = target_rate or settings.STT_SAMPLE_RATE
+    peak = peak or settings.AUDIO_TARGET_PEAK
+    pad_ms = settings.AUDIO_TRIM_PAD_MS if pad_ms is None else pad_ms
+
+    samples = to_mono(samples, sample_rate, target_rate)
+    active = np.flatnonzero(speech_frames(samples, target_rate))
+    if len(active):
+        frame = target_rate * settings.VAD_FRAME_MS // 1000
+        pad = target_rate * pad_ms // 1000
+        samples = samples[max(active[0] * frame - pad, 0):(active[-1] + 1) * frame + pad]
+
+    loudest = np.max(np.abs(samples)) if len(samples) else 0.0
+    if loudest > 0:
+        samples = samples * (peak / loudest)
+    return samples.astype(np.float32)
+
+def normalize_wav(audio_data: bytes) -> bytes:
+    """Re-encode a WAV recording as normalized 16-bit mono PCM at STT_SAMPLE_RATE"""
+    sample_rate, samples = wav_to_float(audio_data)
+    samples = normalize_audio(samples, sample_rate)
+    output = io.BytesIO()
+    wavfile.write(output, settings.STT_SAMPLE_RATE, (np.clip(samples, -1, 1) * 32767).astype("<i2"))
+    return output.getvalue()
+
+def prepare_recording(audio_data: bytes) -> Optional[Tuple[bytes, str]]:
+    """Normalize a recording for upload to STT and re-encode it compactly.
+
+    Returns (audio, mimetype) as 16 kHz mono Ogg/Opus, which is smaller than both the
+    browser's webm/opus and 16-bit PCM, or None when the recording has no detectable
+    speech and isn't worth transcribing. Raises ValueError for undecodable input.
+    """
+    sample_rate, samples = decode_audio(audio_data)
+    samples = to_mono(samples, sample_rate, settings.STT_SAMPLE_RATE)
+    if not speech_frames(samples, settings.STT_SAMPLE_RATE).any():
+        return None
+    samples = normalize_audio(samples, settings.STT_SAMPLE_RATE)
+    return encode_opus(samples, settings.STT_SAMPLE_RATE), "audio/ogg"
+
+@dataclass
+class VoiceActivity:
+    is_speech: bool  # Speech, or silence still inside the hangover window; worth transcribing
+    end_of_utterance: bool  # Trailing silence outlasted the hangover
+
+class VoiceActivityDetector:
+    """Stateful endpointing over a stream of 16-bit mono PCM chunks.
+
+    Silence before speech is reported as non-speech so it can be dropped. Once speech
+    has started, silence is kept for `hangover_ms` (short pauses stay in the
+    utterance); after that the utterance is reported as ended.
+    """
+
+    def __init__(
+        self,
+        sample_rate: Optional[int] = None,
+        frame_ms: Optional[int] = None,
+        energy_threshold: Optional[float] = None,
+        zcr_threshold: Optional[float] = None,
+        hangover_ms: Optional[int] = None
+    ):
+        self.sample_rate = sample_rate or settings.STT_SAMPLE_RATE
+        self.frame_ms = frame_ms or settings.VAD_FRAME_MS
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold
+        self.hangover_frames = math.ceil((hangover_ms or settings.VAD_HANGOVER_MS) / self.frame_ms)
+        self.in_utterance = False
+        self._silent_frames = 0
+
+    def process(self, audio_data: bytes) -> VoiceActivity:
+        active = speech_frames(
+            pcm16_to_float(audio_data),
+            self.sample_rate,
+            self.frame_ms,
+            self.energy_threshold,
+            self.zcr_threshold
+        )
+        if active.any():
+            self.in_utterance = True
+            self._silent_frames = len(active) - 1 - int(np.flatnonzero(active)[-1])
+            is_speech = True
+        elif self.in_utterance:
+            self._silent_frames += len(active)
+            is_speech = self._silent_frames < self.hangover_frames
+        else:
+            return VoiceActivity(is_speech=False, end_of_utterance=False)
+
+        if self._silent_frames >= self.hangover_frames:
+            self.reset()
+            return VoiceActivity(is_speech=is_speech, end_of_utterance=True)
+        return VoiceActivity(is_speech=True, end_of_utterance=False)
+
+    def reset(self):
+        self.in_utterance = False
+        self._silent_frames = 0
 
 class VoiceProcessor:
     def __init__(self):
@@ -27,16 +233,16 @@ class VoiceProcessor:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, params=params, data=audio_data) as resp:
-                    result = await resp.json()
-                    
-                    if "results" in result:
-                        transcript = result["results"]["channels"][0]["alternatives"][0]["transcript"]
-                        confidence = result["results"]["channels"][0]["alternatives"][0]["confidence"]
-                        return transcript, confidence
-                    else:
-                        raise ValueError("No transcription results found")
+            audio_data = await self.enhance_audio(audio_data)
+            resp = await http_clients.client("deepgram").post(url, headers=headers, params=params, content=audio_data)
+            result = resp.json()
+            
+            if "results" in result:
+                transcript = result["results"]["channels"][0]["alternatives"][0]["transcript"]
+                confidence = result["results"]["channels"][0]["alternatives"][0]["confidence"]
+                return transcript, confidence
+            else:
+                raise ValueError("No transcription results found")
                         
         except Exception as e:
             print(f"Error in transcription: {str(e)}")
@@ -59,13 +265,12 @@ class VoiceProcessor:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=data) as resp:
-                    if resp.status == 200:
-                        return await resp.read()
-                    else:
-                        print(f"TTS API error: {resp.status}")
-                        return None
+            resp = await http_clients.client("elevenlabs").post(url, headers=headers, json=data)
+            if resp.status_code == 200:
+                return resp.content
+            else:
+                print(f"TTS API error: {resp.status_code}")
+                return None
                         
         except Exception as e:
             print(f"Error in text-to-speech: {str(e)}")
@@ -73,16 +278,28 @@ class VoiceProcessor:
 
     async def enhance_audio(self, audio_data: bytes) -> Optional[bytes]:
         """
-        Enhance audio quality by removing background noise
-        and improving clarity.
+        Normalize a WAV recording before upload: mono, STT_SAMPLE_RATE, silence trimmed,
+        peak normalized. Uploads here are sent as audio/wav, so other formats are
+        returned unchanged (AudioProcessor normalizes browser recordings), as is anything
+        that fails to decode.
         """
-        # TODO: Implement audio enhancement using a service like Krisp or custom ML model
-        return audio_data
+        if not is_wav(audio_data):
+            return audio_data
+        try:
+            return await asyncio.to_thread(normalize_wav, audio_data)
+        except ValueError as e:
+            logger.warning(f"Could not normalize audio, uploading as is: {str(e)}")
+            return audio_data
 
-    async def detect_silence(self, audio_data: bytes, threshold: float = 0.1) -> bool:
-        """Detect if audio chunk is silence."""
-        # TODO: Implement silence detection
-        return False
+    async def detect_silence(
+        self,
+        audio_data: bytes,
+        threshold: Optional[float] = None,
+        sample_rate: Optional[int] = None
+    ) -> bool:
+        """Detect if a 16-bit mono PCM chunk is silence (no frame above the energy threshold)."""
+        samples = pcm16_to_float(audio_data)
+        return not speech_frames(samples, sample_rate or settings.STT_SAMPLE_RATE, energy_threshold=threshold).any()
 
     async def get_speaker_sentiment(self, text: str) -> Dict[str, float]:
         """Analyze sentiment of speaker's text."""
@@ -99,13 +316,12 @@ class VoiceProcessor:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=data) as resp:
-                    result = await resp.json()
-                    sentiment_text = result["choices"][0]["text"].strip()
-                    # Parse the JSON string to dict
-                    import json
-                    return json.loads(sentiment_text)
+            resp = await http_clients.client("openai").post(url, headers=headers, json=data)
+            result = resp.json()
+            sentiment_text = result["choices"][0]["text"].strip()
+            # Parse the JSON string to dict
+            import json
+            return json.loads(sentiment_text)
         except Exception as e:
             print(f"Error in sentiment analysis: {str(e)}")
             return {"positive": 0.33, "negative": 0.33, "neutral": 0.34}
@@ -1,6 +1,7 @@
 import React, { useEffect, useRef, useState } from 'react';
 import { Room, RoomOptions } from 'livekit-client';
-import { LIVEKIT_WS_URL } from '../../config';
+import { LIVEKIT_WS_URL, VOICE_PCM_CAPTURE } from '../../config';
+import { PcmCapture, startPcmCapture } from '../../utils/pcmCapture';
 import { useAuth } from '../../contexts/AuthContext';
 import { 
   Box, 
@@ -134,6 +135,51 @@ const RecordButton = styled(IconButton, {
   }
 }));
 
+// Binary frames from the voice WebSocket (see app/services/voice/frames.py), big-endian:
+// version u8 | type u8 | turn u32 | seq u32 | payload
+const FRAME_VERSION = 1;
+const FRAME_HEADER_SIZE = 10;
+const FRAME_TYPES: Record<number, string> = {
+  1: 'audio',
+  2: 'interim_transcription',
+  3: 'transcription',
+  4: 'response',
+  5: 'audio_start',
+  6: 'audio_end',
+  7: 'interrupt',
+};
+
+interface Frame {
+  type: string;
+  turn: number;
+  seq: number;
+  payload: ArrayBuffer;
+}
+
+const decodeFrame = (buffer: ArrayBuffer): Frame | null => {
+  if (buffer.byteLength < FRAME_HEADER_SIZE) return null;
+  const view = new DataView(buffer);
+  const type = FRAME_TYPES[view.getUint8(1)];
+  if (view.getUint8(0) !== FRAME_VERSION || !type) return null;
+  return { type, turn: view.getUint32(2), seq: view.getUint32(6), payload: buffer.slice(FRAME_HEADER_SIZE) };
+};
+
+// The JSON message a non-audio frame stands for
+const frameToMessage = (frame: Frame): any => {
+  const text = new TextDecoder().decode(frame.payload);
+  switch (frame.type) {
+    case 'interim_transcription':
+    case 'transcription':
+      return { type: frame.type, text };
+    case 'response':
+      return { type: frame.type, ...JSON.parse(text) };
+    case 'audio_start':
+      return { type: frame.type, format: text };
+    default:
+      return { type: frame.type };
+  }
+};
+
 interface Property {
   id: string;
   name: string;
@@ -146,6 +192,65 @@ interface Property {
   images: string[];
 }
 
+// Plays MP3 audio that arrives in chunks, starting as soon as the first chunk is buffered;
+// onDone runs once, when playback finishes or is stopped
+class StreamingAudioPlayer {
+  private mediaSource = new MediaSource();
+  private sourceBuffer: SourceBuffer | null = null;
+  private queue: ArrayBuffer[] = [];
+  private ended = false;
+  private audio = new Audio();
+  private url: string;
+  private done = false;
+
+  constructor(mimeType: string, private onDone: () => void = () => {}) {
+    this.url = URL.createObjectURL(this.mediaSource);
+    this.mediaSource.addEventListener('sourceopen', () => {
+      this.sourceBuffer = this.mediaSource.addSourceBuffer(mimeType);
+      this.sourceBuffer.addEventListener('updateend', () => this.flush());
+      this.flush();
+    });
+    this.audio.onended = () => {
+      URL.revokeObjectURL(this.url);
+      this.finish();
+    };
+    this.audio.src = this.url;
+    this.audio.play().catch((error) => console.error('Audio play failed:', error));
+  }
+
+  append(chunk: ArrayBuffer) {
+    this.queue.push(chunk);
+    this.flush();
+  }
+
+  end() {
+    this.ended = true;
+    this.flush();
+  }
+
+  stop() {
+    this.audio.pause();
+    URL.revokeObjectURL(this.url);
+    this.finish();
+  }
+
+  private finish() {
+    if (this.done) return;
+    this.done = true;
+    this.onDone();
+  }
+
+  private flush() {
+    if (!this.sourceBuffer || this.sourceBuffer.updating) return;
+    const chunk = this.queue.shift();
+    if (chunk) {
+      this.sourceBuffer.appendBuffer(chunk);
+    } else if (this.ended && this.mediaSource.readyState === 'open') {
+      this.mediaSource.endOfStream();
+    }
+  }
+}
+
 interface VoiceChatProps {
   sessionId: string;
   onMessage: (message: string) => Promise<void>;
@@ -174,9 +279,14 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
   const [room, setRoom] = useState<Room | null>(null);
   const wsRef = useRef<WebSocket | null>(null);
   const mediaRecorderRef = useRef<MediaRecorder | null>(null);
+  const pcmCaptureRef = useRef<PcmCapture | null>(null);
   const streamRef = useRef<MediaStream | null>(null);
-  const chunksRef = useRef<Blob[]>([]);
   const analyserRef = useRef<AnalyserNode | null>(null);
+  const audioStreamRef = useRef<StreamingAudioPlayer | null>(null);
+  const playbackRef = useRef<HTMLAudioElement | null>(null);
+  // Set when the server agrees to binary frames; frames of turns up to interruptedTurnRef are stale
+  const framedRef = useRef(false);
+  const interruptedTurnRef = useRef(0);
   const conversationEndRef = useRef<HTMLDivElement>(null);
 
   const initRoom = async () => {
@@ -238,15 +348,97 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
     if (!user?.token) return;
 
     const initWebSocket = () => {
-      const ws = new WebSocket(`ws://localhost:8000/api/voice/conversation/voice?token=${encodeURIComponent(user.token)}`);
+      const ws = new WebSocket(`ws://localhost:8000/api/voice/conversation/voice?token=${encodeURIComponent(user.token)}&stt=stream&tts=stream&frames=${FRAME_VERSION}${VOICE_PCM_CAPTURE ? '&encoding=linear16' : ''}`);
+      ws.binaryType = 'arraybuffer';
       wsRef.current = ws;
 
       ws.onopen = () => {
         console.log('WebSocket connected');
       };
 
+      // The server only interrupts an answer it knows is still playing
+      const reportPlayback = (playing: boolean) => {
+        if (ws.readyState === WebSocket.OPEN) {
+          ws.send(JSON.stringify({ type: 'playback', playing }));
+        }
+      };
+
+      const handleMessage = (jsonData: any) => {
+        console.log('Received message:', jsonData);
+        switch (jsonData.type) {
+          case 'error':
+            console.error('Server error:', jsonData.message);
+            setError(jsonData.message);
+            setIsProcessing(false);
+            audioStreamRef.current?.end();
+            audioStreamRef.current = null;
+            break;
+          case 'audio_start':
+            audioStreamRef.current?.stop();
+            audioStreamRef.current = new StreamingAudioPlayer(jsonData.format, () => reportPlayback(false));
+            reportPlayback(true);
+            break;
+          case 'audio_end':
+            audioStreamRef.current?.end();
+            audioStreamRef.current = null;
+            break;
+          case 'interrupt':
+            // The user started speaking again; drop the rest of the current answer
+            audioStreamRef.current?.stop();
+            audioStreamRef.current = null;
+            playbackRef.current?.pause();
+            break;
+          case 'connected':
+            framedRef.current = jsonData.protocol === FRAME_VERSION;
+            break;
+          case 'connection':
+            console.log('Connected:', jsonData.message);
+            break;
+          case 'interim_transcription':
+            console.log('Interim transcription:', jsonData.text);
+            break;
+          case 'transcription':
+            setConversation(prev => [...prev, { role: 'user', message: jsonData.text }]);
+            break;
+          case 'response':
+            setConversation(prev => [...prev, { role: 'ai', message: jsonData.text }]);
+            // Handle properties if they exist
+            if (jsonData.properties && Array.isArray(jsonData.properties) && onPropertiesUpdate) {
+              console.log('Updating properties:', jsonData.properties);
+              onPropertiesUpdate(jsonData.properties);
+            }
+            setIsProcessing(false);
+            break;
+
+        }
+      };
+
       ws.onmessage = async (event) => {
-        const data = event.data;
+        if (event.data instanceof ArrayBuffer && framedRef.current) {
+          const frame = decodeFrame(event.data);
+          if (!frame) {
+            console.error('Dropped malformed frame');
+            return;
+          }
+          if (frame.type === 'interrupt') {
+            interruptedTurnRef.current = frame.turn;
+          } else if (frame.turn <= interruptedTurnRef.current && !frame.type.endsWith('transcription')) {
+            // Still in flight when the answer was interrupted
+            return;
+          }
+          if (frame.type === 'audio') {
+            audioStreamRef.current?.append(frame.payload);
+          } else {
+            handleMessage(frameToMessage(frame));
+          }
+          return;
+        }
+        // Chunks of a streamed response go straight to the player, in arrival order
+        if (event.data instanceof ArrayBuffer && audioStreamRef.current) {
+          audioStreamRef.current.append(event.data);
+          return;
+        }
+        const data = event.data instanceof ArrayBuffer ? new Blob([event.data]) : event.data;
         if (data instanceof Blob) {
           try {
             // Ensure we have valid audio data
@@ -264,6 +456,7 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
               
               // Create and set up the audio element
               const audio = new Audio();
+              playbackRef.current = audio;
               
               // Set up promise-based play handler
               const playAudio = async () => {
@@ -290,6 +483,8 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
                 playAudio();
               };
               
+              audio.onplay = () => reportPlayback(true);
+              audio.onpause = () => reportPlayback(false);
               audio.onended = () => {
                 console.log('Audio playback completed');
                 URL.revokeObjectURL(audioUrl);
@@ -316,31 +511,7 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
         } else {
           // Handle JSON messages
           try {
-            const jsonData = JSON.parse(data);
-            console.log('Received message:', jsonData);
-            switch (jsonData.type) {
-              case 'error':
-                console.error('Server error:', jsonData.message);
-                setError(jsonData.message);
-                setIsProcessing(false);
-                break;
-              case 'connection':
-                console.log('Connected:', jsonData.message);
-                break;
-              case 'transcription':
-                setConversation(prev => [...prev, { role: 'user', message: jsonData.text }]);
-                break;
-              case 'response':
-                setConversation(prev => [...prev, { role: 'ai', message: jsonData.text }]);
-                // Handle properties if they exist
-                if (jsonData.properties && Array.isArray(jsonData.properties) && onPropertiesUpdate) {
-                  console.log('Updating properties:', jsonData.properties);
-                  onPropertiesUpdate(jsonData.properties);
-                }
-                setIsProcessing(false);
-                break;
-
-            }
+            handleMessage(JSON.parse(data));
           } catch (error) {
             console.error('Error parsing JSON message:', error);
           }
@@ -352,11 +523,12 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
         setIsProcessing(false);
       };
 
-      ws.onclose = () => {
+      ws.onclose = (event) => {
         console.log('WebSocket closed');
         setIsProcessing(false);
-        // Attempt to reconnect after a delay
-        setTimeout(initWebSocket, 3000);
+        // Attempt to reconnect after a delay; a busy server (1013) says how long to wait
+        const retryAfter = event.code === 1013 ? Number(/retry_after=(\d+)/.exec(event.reason)?.[1] ?? 5) : 3;
+        setTimeout(initWebSocket, retryAfter * 1000);
       };
     };
 
@@ -393,30 +565,39 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
       };
       updateLevel();
 
+      if (VOICE_PCM_CAPTURE) {
+        // Raw PCM chunks; the server's voice activity detection drops silence and ends utterances
+        pcmCaptureRef.current = await startPcmCapture(stream, (chunk) => {
+          if (wsRef.current?.readyState === WebSocket.OPEN) {
+            wsRef.current.send(chunk);
+          }
+        });
+        setIsRecording(true);
+        return;
+      }
+
       // Set up media recorder with specific MIME type
       const mediaRecorder = new MediaRecorder(stream, {
         mimeType: 'audio/webm;codecs=opus'
       });
       mediaRecorderRef.current = mediaRecorder;
-      chunksRef.current = [];
 
+      // Stream chunks while recording so transcription runs alongside speech
       mediaRecorder.ondataavailable = (e) => {
-        if (e.data.size > 0) {
-          chunksRef.current.push(e.data);
+        if (e.data.size > 0 && wsRef.current?.readyState === WebSocket.OPEN) {
+          wsRef.current.send(e.data);
         }
       };
 
       mediaRecorder.onstop = async () => {
-        const audioBlob = new Blob(chunksRef.current, { type: 'audio/webm' });
-        chunksRef.current = [];
         setIsProcessing(true);
 
         if (wsRef.current?.readyState === WebSocket.OPEN) {
-          wsRef.current.send(audioBlob);
+          wsRef.current.send(JSON.stringify({ type: 'audio_end' }));
         }
       };
 
-      mediaRecorder.start(1000);
+      mediaRecorder.start(250);
       setIsRecording(true);
     } catch (error) {
       console.error('Error starting recording:', error);
@@ -424,6 +605,18 @@ export const VoiceChat: React.FC<VoiceChatProps> = ({
   };
 
   const stopRecording = () => {
+    if (pcmCaptureRef.current && isRecording) {
+      pcmCaptureRef.current.stop();
+      pcmCaptureRef.current = null;
+      streamRef.current?.getTracks().forEach(track => track.stop());
+      setIsRecording(false);
+      setAudioLevel(0);
+      // Utterances were already ended by the server's voice activity detection; flush any tail
+      if (wsRef.current?.readyState === WebSocket.OPEN) {
+        wsRef.current.send(JSON.stringify({ type: 'audio_end' }));
+      }
+      return;
+    }
     if (mediaRecorderRef.current && isRecording) {
       mediaRecorderRef.current.stop();
       streamRef.current?.getTracks().forEach(track => track.stop());
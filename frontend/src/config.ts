@@ -1,4 +1,8 @@
 // LiveKit configuration
 export const LIVEKIT_WS_URL = import.meta.env.VITE_LIVEKIT_WS_URL || 'wss://ai-voice-agent-6xzqyjfa.livekit.cloud';
 
+// Send 16 kHz PCM from the microphone so the server can drop silence before speech-to-text;
+// set VITE_VOICE_PCM_CAPTURE=false to fall back to webm/opus recording
+export const VOICE_PCM_CAPTURE = import.meta.env.VITE_VOICE_PCM_CAPTURE !== 'false';
+
 // Note: In Vite, environment variables must be prefixed with VITE_
@@ -2,6 +2,7 @@
 
 interface ImportMetaEnv {
   readonly VITE_LIVEKIT_WS_URL: string
+  readonly VITE_VOICE_PCM_CAPTURE?: string
 }
 
 interface ImportMeta {
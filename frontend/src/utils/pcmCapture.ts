@@ -0,0 +1,79 @@
+// Captures microphone audio as 16 kHz mono 16-bit PCM ("linear16"), the format the voice
+// server runs voice activity detection on before anything is sent to speech-to-text.
+export const PCM_SAMPLE_RATE = 16000;
+
+// Runs on the audio thread: averages channels, box-filters down to the target rate and
+// posts Int16 chunks of `chunkSamples` to the main thread
+const WORKLET_SOURCE = `
+class PcmDownsampler extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+    const { targetRate, chunkSamples } = options.processorOptions;
+    this.step = sampleRate / targetRate;
+    this.position = 0;
+    this.chunk = new Int16Array(chunkSamples);
+    this.filled = 0;
+  }
+
+  process(inputs) {
+    const channels = inputs[0];
+    if (!channels || channels.length === 0) return true;
+    const frames = channels[0].length;
+    while (this.position < frames) {
+      const start = Math.floor(this.position);
+      const end = Math.max(Math.min(Math.floor(this.position + this.step), frames), start + 1);
+      let sum = 0;
+      for (let i = start; i < end; i++) {
+        for (const channel of channels) sum += channel[i];
+      }
+      const sample = Math.max(-1, Math.min(1, sum / ((end - start) * channels.length)));
+      this.chunk[this.filled++] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+      if (this.filled === this.chunk.length) {
+        this.port.postMessage(this.chunk.buffer, [this.chunk.buffer]);
+        this.chunk = new Int16Array(this.chunk.length);
+        this.filled = 0;
+      }
+      this.position += this.step;
+    }
+    this.position -= frames;
+    return true;
+  }
+}
+registerProcessor('pcm-downsampler', PcmDownsampler);
+`;
+
+export interface PcmCapture {
+  stop: () => void;
+}
+
+export const startPcmCapture = async (
+  stream: MediaStream,
+  onChunk: (chunk: ArrayBuffer) => void,
+  chunkMs = 100
+): Promise<PcmCapture> => {
+  // The context runs at the device rate; resampling happens in the worklet so every browser behaves the same
+  const context = new AudioContext();
+  const moduleUrl = URL.createObjectURL(new Blob([WORKLET_SOURCE], { type: 'application/javascript' }));
+  try {
+    await context.audioWorklet.addModule(moduleUrl);
+  } finally {
+    URL.revokeObjectURL(moduleUrl);
+  }
+
+  const source = context.createMediaStreamSource(stream);
+  const downsampler = new AudioWorkletNode(context, 'pcm-downsampler', {
+    processorOptions: { targetRate: PCM_SAMPLE_RATE, chunkSamples: (PCM_SAMPLE_RATE * chunkMs) / 1000 },
+  });
+  downsampler.port.onmessage = (event: MessageEvent<ArrayBuffer>) => onChunk(event.data);
+  // The worklet outputs silence; connecting it keeps the graph pulling audio through it
+  source.connect(downsampler).connect(context.destination);
+
+  return {
+    stop: () => {
+      downsampler.port.onmessage = null;
+      source.disconnect();
+      downsampler.disconnect();
+      context.close();
+    },
+  };
+};
@@ -0,0 +1,124 @@
+"""Benchmark STT upload size and latency with and without audio normalization.
+
+Measures the path AudioProcessor.process_audio takes for recorded voice turns. It
+builds browser-like recordings (48 kHz stereo webm/opus from MediaRecorder, with
+speech surrounded by silence), or uses the recordings given in any format. Each
+recording goes through prepare_recording, and the script reports bytes uploaded and
+preparation time. With a Deepgram key it also times prerecorded transcription of the
+raw upload and of the prepared upload; the prepared timing includes preparation.
+
+    DEEPGRAM_API_KEY=... python scripts/benchmark_audio_normalization.py --recordings 20
+    python scripts/benchmark_audio_normalization.py --files recordings/*.webm --no-stt
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+import av
+import httpx
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.utils.voice import is_wav, prepare_recording
+
+DEEPGRAM_URL = "https://api.deepgram.com/v1/listen"
+
+def synthetic_recording(seconds: float, rng: np.random.Generator, rate: int = 48000) -> bytes:
+    """Speech-like harmonics with pitch drift, 0.5-1.5 s of room noise either side, as 48 kHz stereo webm/opus"""
+    t = np.arange(int(rate * seconds)) / rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    speech = sum(np.sin(k * phase) / k for k in range(1, 6)) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t) ** 2)
+    lead, tail = (rng.uniform(0.5, 1.5, 2) * rate).astype(int)
+    mono = np.concatenate([np.zeros(lead), 0.2 * speech / np.max(np.abs(speech)), np.zeros(tail)])
+    mono += rng.normal(0, 0.002, len(mono))
+    stereo = (np.stack([mono, 0.9 * mono], axis=1) * 32767).astype("<i2")
+    output = io.BytesIO()
+    with av.open(output, mode="w", format="webm") as container:
+        # Browsers record opus at around 64 kbps for stereo
+        stream = container.add_stream("libopus", rate=rate, layout="stereo")
+        stream.bit_rate = 64000
+        frame = av.AudioFrame.from_ndarray(stereo.reshape(1, -1), format="s16", layout="stereo")
+        frame.sample_rate = rate
+        for packet in [*stream.encode(frame), *stream.encode(None)]:
+            container.mux(packet)
+    return output.getvalue()
+
+def mimetype(audio: bytes) -> str:
+    return "audio/wav" if is_wav(audio) else "audio/webm"
+
+def percentiles(values):
+    values = sorted(values)
+    return {
+        "p50": round(statistics.median(values), 1),
+        "p95": round(values[max(int(len(values) * 0.95) - 1, 0)], 1),
+    }
+
+async def time_transcriptions(client: httpx.AsyncClient, api_key: str, recordings, prepare: bool):
+    latencies = []
+    for audio in recordings:
+        started = time.perf_counter()
+        if prepare:
+            prepared = await asyncio.to_thread(prepare_recording, audio)
+            if prepared is None:
+                latencies.append((time.perf_counter() - started) * 1000)
+                continue
+            audio, content_type = prepared
+        else:
+            content_type = mimetype(audio)
+        response = await client.post(
+            DEEPGRAM_URL,
+            headers={"Authorization": f"Token {api_key}", "Content-Type": content_type},
+            params={"model": "nova-2", "language": "en-US", "punctuate": "true"},
+            content=audio
+        )
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return percentiles(latencies)
+
+async def run(raw, api_key):
+    uploads = []
+    prepare_ms = []
+    for audio in raw:
+        started = time.perf_counter()
+        prepared = prepare_recording(audio)
+        prepare_ms.append((time.perf_counter() - started) * 1000)
+        if prepared is not None:
+            uploads.append(prepared[0])
+
+    raw_bytes, normalized_bytes = sum(map(len, raw)), sum(map(len, uploads))
+    print(f"Recordings:       {len(raw)} ({len(raw) - len(uploads)} without speech, not uploaded)")
+    print(f"Bytes uploaded:   raw {raw_bytes:,}  normalized {normalized_bytes:,}  "
+          f"({100 * (1 - normalized_bytes / raw_bytes):.1f}% smaller)")
+    print(f"Preparation ms:   {percentiles(prepare_ms)}")
+
+    if not api_key:
+        print("Set DEEPGRAM_API_KEY to time transcription")
+        return
+    async with httpx.AsyncClient(timeout=60) as client:
+        print(f"Deepgram ms raw:        {await time_transcriptions(client, api_key, raw, prepare=False)}")
+        print(f"Deepgram ms normalized: {await time_transcriptions(client, api_key, raw, prepare=True)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", nargs="*", type=Path, help="Recordings (webm, ogg, wav...) to use instead of synthetic ones")
+    parser.add_argument("--recordings", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=4.0, help="Speech length of synthetic recordings")
+    parser.add_argument("--no-stt", action="store_true", help="Skip the Deepgram timing")
+    args = parser.parse_args()
+
+    if args.files:
+        recordings = [path.read_bytes() for path in args.files]
+    else:
+        rng = np.random.default_rng(0)
+        recordings = [synthetic_recording(args.seconds, rng) for _ in range(args.recordings)]
+    asyncio.run(run(recordings, None if args.no_stt else os.getenv("DEEPGRAM_API_KEY")))
@@ -0,0 +1,7 @@
+-- Composite indexes backing keyset pagination of property listings.
+-- Each matches an ORDER BY used by get_property_page, with id as the tie-breaker.
+CREATE INDEX IF NOT EXISTS idx_properties_price_id ON properties(price, id);
+CREATE INDEX IF NOT EXISTS idx_properties_created_at_id ON properties(created_at DESC, id DESC);
+
+-- Most voice searches filter by listing type first
+CREATE INDEX IF NOT EXISTS idx_properties_listing_type_price_id ON properties(listing_type, price, id);
@@ -0,0 +1,71 @@
+-- Full-text and trigram search for properties
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Weighted document: title > description > features > location
+ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        setweight(jsonb_to_tsvector('english', coalesce(features, '[]'::jsonb), '["string"]'), 'C') ||
+        setweight(to_tsvector('simple', coalesce(city, '') || ' ' || coalesce(state, '')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_properties_search_vector ON properties USING GIN (search_vector);
+
+-- Trigram indexes let ILIKE '%city%' filters use an index instead of a sequential scan
+CREATE INDEX IF NOT EXISTS idx_properties_city_trgm ON properties USING GIN (city gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_properties_state_trgm ON properties USING GIN (state gin_trgm_ops);
+
+-- Filtered, ranked text search in a single round trip.
+-- Runs with the caller's privileges, so row level security still applies.
+CREATE OR REPLACE FUNCTION search_properties(
+    search_query TEXT,
+    filter_city TEXT DEFAULT NULL,
+    filter_state TEXT DEFAULT NULL,
+    filter_property_type TEXT DEFAULT NULL,
+    filter_listing_type TEXT DEFAULT NULL,
+    filter_bedrooms INTEGER DEFAULT NULL,
+    min_price INTEGER DEFAULT NULL,
+    max_price INTEGER DEFAULT NULL,
+    result_limit INTEGER DEFAULT 6
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    description TEXT,
+    property_type TEXT,
+    listing_type TEXT,
+    city TEXT,
+    state TEXT,
+    price INTEGER,
+    bedrooms INTEGER,
+    bathrooms NUMERIC,
+    square_feet INTEGER,
+    images JSONB,
+    created_at TIMESTAMP WITH TIME ZONE,
+    rank REAL
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.id, p.title, p.description, p.property_type, p.listing_type, p.city, p.state,
+        p.price, p.bedrooms, p.bathrooms, p.square_feet, p.images, p.created_at,
+        ts_rank_cd(p.search_vector, q.query) AS rank
+    FROM properties p
+    CROSS JOIN websearch_to_tsquery('english', search_query) AS q(query)
+    WHERE p.search_vector @@ q.query
+      AND p.is_active
+      AND (filter_city IS NULL OR p.city ILIKE '%' || filter_city || '%')
+      AND (filter_state IS NULL OR p.state ILIKE '%' || filter_state || '%')
+      AND (filter_property_type IS NULL OR p.property_type = filter_property_type)
+      AND (filter_listing_type IS NULL OR p.listing_type = filter_listing_type)
+      AND (filter_bedrooms IS NULL OR p.bedrooms = filter_bedrooms)
+      AND (min_price IS NULL OR p.price >= min_price)
+      AND (max_price IS NULL OR p.price <= max_price)
+    ORDER BY rank DESC, p.id
+    LIMIT least(greatest(result_limit, 1), 50);
+$$;
+
+GRANT EXECUTE ON FUNCTION search_properties(TEXT, TEXT, TEXT, TEXT, TEXT, INTEGER, INTEGER, INTEGER, INTEGER) TO anon, authenticated;
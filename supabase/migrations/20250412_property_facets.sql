@@ -0,0 +1,32 @@
+-- Precomputed facet counts and price statistics for browse-style questions
+-- ("how many rentals in Hyderabad", "which cities do you cover").
+-- CUBE materializes every rollup of the five dimensions; a NULL dimension means "any".
+CREATE MATERIALIZED VIEW IF NOT EXISTS property_facets AS
+SELECT
+    lower(state) AS state,
+    lower(city) AS city,
+    lower(listing_type) AS listing_type,
+    lower(property_type) AS property_type,
+    coalesce(bedrooms, 0) AS bedrooms,
+    count(*)::INTEGER AS listing_count,
+    min(price)::INTEGER AS min_price,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY price)::INTEGER AS median_price,
+    max(price)::INTEGER AS max_price
+FROM properties
+WHERE is_active
+GROUP BY CUBE (lower(state), lower(city), lower(listing_type), lower(property_type), coalesce(bedrooms, 0));
+
+GRANT SELECT ON property_facets TO anon, authenticated;
+
+-- Called by the API after listing writes; runs as owner so clients can't refresh arbitrary views
+CREATE OR REPLACE FUNCTION refresh_property_facets()
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    REFRESH MATERIALIZED VIEW property_facets;
+$$;
+
+REVOKE EXECUTE ON FUNCTION refresh_property_facets() FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION refresh_property_facets() TO authenticated, service_role;
@@ -0,0 +1,75 @@
+-- Radius and nearest-property search on latitude/longitude
+
+CREATE EXTENSION IF NOT EXISTS cube;
+CREATE EXTENSION IF NOT EXISTS earthdistance;
+
+-- GiST index over earth points serves both the bounding-box radius test (@>)
+-- and nearest-first ordering (<->) without scanning the table
+CREATE INDEX IF NOT EXISTS idx_properties_earth_point ON properties
+    USING GIST (ll_to_earth(latitude, longitude))
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+
+-- Nearest matching listings to a point, optionally within radius_km, with distances.
+-- Runs with the caller's privileges, so row level security still applies.
+CREATE OR REPLACE FUNCTION search_nearby_properties(
+    center_latitude DOUBLE PRECISION,
+    center_longitude DOUBLE PRECISION,
+    radius_km DOUBLE PRECISION DEFAULT NULL,
+    filter_city TEXT DEFAULT NULL,
+    filter_state TEXT DEFAULT NULL,
+    filter_property_type TEXT DEFAULT NULL,
+    filter_listing_type TEXT DEFAULT NULL,
+    filter_bedrooms INTEGER DEFAULT NULL,
+    min_price INTEGER DEFAULT NULL,
+    max_price INTEGER DEFAULT NULL,
+    result_limit INTEGER DEFAULT 6
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    description TEXT,
+    property_type TEXT,
+    listing_type TEXT,
+    city TEXT,
+    state TEXT,
+    price INTEGER,
+    bedrooms INTEGER,
+    bathrooms NUMERIC,
+    square_feet INTEGER,
+    images JSONB,
+    created_at TIMESTAMP WITH TIME ZONE,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    distance_km DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.id, p.title, p.description, p.property_type, p.listing_type, p.city, p.state,
+        p.price, p.bedrooms, p.bathrooms, p.square_feet, p.images, p.created_at,
+        p.latitude, p.longitude,
+        earth_distance(ll_to_earth(center_latitude, center_longitude), ll_to_earth(p.latitude, p.longitude)) / 1000.0 AS distance_km
+    FROM properties p
+    WHERE p.latitude IS NOT NULL
+      AND p.longitude IS NOT NULL
+      AND p.is_active
+      AND (radius_km IS NULL OR (
+            earth_box(ll_to_earth(center_latitude, center_longitude), radius_km * 1000.0) @> ll_to_earth(p.latitude, p.longitude)
+            AND earth_distance(ll_to_earth(center_latitude, center_longitude), ll_to_earth(p.latitude, p.longitude)) <= radius_km * 1000.0
+      ))
+      AND (filter_city IS NULL OR p.city ILIKE '%' || filter_city || '%')
+      AND (filter_state IS NULL OR p.state ILIKE '%' || filter_state || '%')
+      AND (filter_property_type IS NULL OR p.property_type = filter_property_type)
+      AND (filter_listing_type IS NULL OR p.listing_type = filter_listing_type)
+      AND (filter_bedrooms IS NULL OR p.bedrooms = filter_bedrooms)
+      AND (min_price IS NULL OR p.price >= min_price)
+      AND (max_price IS NULL OR p.price <= max_price)
+    -- Chord distance orders the same as great-circle distance and can walk the GiST index
+    ORDER BY ll_to_earth(p.latitude, p.longitude) <-> ll_to_earth(center_latitude, center_longitude), p.id
+    LIMIT least(greatest(result_limit, 1), 50);
+$$;
+
+GRANT EXECUTE ON FUNCTION search_nearby_properties(
+    DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, TEXT, TEXT, TEXT, TEXT, INTEGER, INTEGER, INTEGER, INTEGER
+) TO anon, authenticated;
@@ -0,0 +1,31 @@
+import pytest
+from app.core.health import HealthStatus, probe_with_retry
+
+@pytest.mark.asyncio
+async def test_probe_retries_until_success():
+    """Transient failures are retried and the final state is recorded"""
+    attempts = []
+
+    async def flaky_probe():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("connection refused")
+
+    status = HealthStatus("Database")
+    assert await probe_with_retry(status, flaky_probe, retries=3, backoff=0)
+    assert len(attempts) == 3
+    assert status.to_dict()["connected"] is True
+    assert status.last_error is None
+    assert status.latency_ms is not None
+
+@pytest.mark.asyncio
+async def test_probe_reports_failure_after_retries():
+    """A backend that stays down is reported as disconnected with the last error"""
+    async def failing_probe():
+        raise ConnectionError("connection refused")
+
+    status = HealthStatus("Database")
+    assert not await probe_with_retry(status, failing_probe, retries=2, backoff=0)
+    assert status.connected is False
+    assert status.last_error == "connection refused"
+    assert status.last_checked is not None
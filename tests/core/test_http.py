@@ -0,0 +1,19 @@
+import pytest
+from app.core.http import HTTPClientRegistry, PROVIDERS
+
+@pytest.mark.asyncio
+async def test_one_client_per_provider_until_closed():
+    registry = HTTPClientRegistry(connect_timeout=1.5, read_timeout=20.0)
+    registry.open()
+
+    clients = {name: registry.client(name) for name in PROVIDERS}
+    assert len({id(client) for client in clients.values()}) == len(PROVIDERS)
+    assert registry.client("deepgram") is clients["deepgram"]
+    assert clients["openai"].timeout.connect == 1.5
+    assert clients["openai"].timeout.read == 20.0
+
+    await registry.aclose()
+
+    assert all(client.is_closed for client in clients.values())
+    assert registry.client("deepgram") is not clients["deepgram"]
+    await registry.aclose()
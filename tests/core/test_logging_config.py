@@ -0,0 +1,75 @@
+import pytest
+import json
+import queue
+import sys
+import logging
+from app.core.logging_config import (
+    bind_log_context,
+    ContextFilter,
+    SamplingFilter,
+    DeferredQueueHandler,
+    JsonFormatter
+)
+
+def make_record(msg="Found %d properties", args=(3,), **extra):
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_context_is_attached_in_the_emitting_context():
+    """Records pick up the bound ids, and the binding is undone after the block"""
+    context_filter = ContextFilter()
+    with bind_log_context(request_id="req-1"):
+        with bind_log_context(session_id="sess-1"):
+            inner = make_record()
+            context_filter.filter(inner)
+    outer = make_record()
+    context_filter.filter(outer)
+
+    assert (inner.request_id, inner.session_id, inner.user_id) == ("req-1", "sess-1", "-")
+    assert outer.request_id == "-"
+
+def test_sampling_keeps_one_in_n_per_call_site():
+    sampling = SamplingFilter()
+    kept = [sampling.filter(make_record(sample_every=5)) for _ in range(20)]
+    other_site = make_record(sample_every=5)
+    other_site.lineno = 99
+
+    assert kept.count(True) == 4
+    assert kept[0] is True
+    assert sampling.filter(other_site) is True
+    assert all(sampling.filter(make_record()) for _ in range(3))
+
+def test_queue_handler_merges_the_message_in_the_caller():
+    """msg and args are merged before the record is queued; the line is formatted later"""
+    handler = DeferredQueueHandler(queue=None)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record()
+        record.exc_info = sys.exc_info()
+
+    prepared = handler.prepare(record)
+
+    assert prepared.msg == "Found 3 properties" and prepared.args is None
+    assert prepared.exc_info is None and "ValueError: boom" in prepared.exc_text
+
+def test_queued_record_keeps_the_args_as_logged():
+    """Mutating an argument after logging doesn't change what the listener writes"""
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    filters = {"city": "Hyderabad"}
+
+    handler.handle(make_record("Searching with %s", (filters,)))
+    filters["city"] = "Chennai"
+
+    assert logging.Formatter("%(message)s").format(log_queue.get_nowait()) == "Searching with {'city': 'Hyderabad'}"
+
+def test_json_formatter_emits_context_fields():
+    record = make_record(request_id="req-1", session_id="-", user_id="u-1", sampled=5)
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Found 3 properties"
+    assert entry["request_id"] == "req-1" and entry["user_id"] == "u-1"
+    assert "session_id" not in entry
+    assert entry["sampled"] == 5
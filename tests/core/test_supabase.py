@@ -0,0 +1,83 @@
+import pytest
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.core.metrics import metrics
+from app.core.supabase import SupabaseClientRegistry
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Minimal PostgREST stand-in that records the auth header and client port of each request"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.headers.get("Authorization"), self.client_address[1]))
+        body = json.dumps([{"id": "p1"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """GoTrue password grant: every sign-in returns a session for the same user"""
+        self.server.requests.append((self.headers.get("Authorization"), self.client_address[1]))
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({
+            "access_token": "user-token",
+            "refresh_token": "refresh",
+            "expires_in": 3600,
+            "token_type": "bearer",
+            "user": {"id": "u1", "aud": "authenticated", "app_metadata": {}, "user_metadata": {}, "created_at": "2025-01-01T00:00:00Z"}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def registry():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    registry = SupabaseClientRegistry(f"http://127.0.0.1:{server.server_port}", "anon-key", "service-key")
+    registry.server = server
+    try:
+        yield registry
+    finally:
+        registry.close()
+        server.shutdown()
+        server.server_close()
+
+def test_user_clients_share_one_connection_with_their_own_tokens(registry):
+    """Per-request clients send their own JWT but reuse the pooled keep-alive connection"""
+    requests_before = metrics.counter("http_client_requests_total").value(client="supabase", status="2xx")
+
+    for token in ("token-a", "token-b", None):
+        response = registry.for_user(token).table("properties").select("id").execute()
+        assert response.data == [{"id": "p1"}]
+
+    authorizations = [auth for auth, _ in registry.server.requests]
+    assert authorizations == ["Bearer token-a", "Bearer token-b", "Bearer anon-key"]
+    assert len({port for _, port in registry.server.requests}) == 1
+    assert metrics.counter("http_client_requests_total").value(client="supabase", status="2xx") == requests_before + 3
+
+def test_role_clients_are_created_once(registry):
+    assert registry.client("service") is registry.client("service")
+    assert registry.client("anon") is not registry.client("service")
+    with pytest.raises(ValueError):
+        registry.client("admin")
+
+def test_signing_in_leaves_no_user_session_on_shared_clients(registry):
+    response = registry.auth_client().sign_in_with_password({"email": "a@example.com", "password": "secret"})
+    assert response.session.access_token == "user-token"
+
+    registry.client("anon").table("properties").select("id").execute()
+    registry.auth_client().sign_in_with_password({"email": "b@example.com", "password": "secret"})
+
+    # The shared data client and the next auth client still send the anon key
+    assert [auth for auth, _ in registry.server.requests] == ["Bearer anon-key"] * 3
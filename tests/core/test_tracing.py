@@ -0,0 +1,53 @@
+import pytest
+import asyncio
+from app.core import tracing
+from app.core.metrics import MetricsRegistry
+
+def test_spans_are_recorded_on_active_trace():
+    """Spans opened inside a trace appear in order with their outcomes"""
+    with tracing.trace("turn") as turn_trace:
+        with tracing.span("extract_filters"):
+            pass
+        with tracing.span("db_filters") as stage:
+            stage.outcome = "empty"
+
+    result = turn_trace.to_dict()
+    assert result["name"] == "turn"
+    assert [s["stage"] for s in result["spans"]] == ["extract_filters", "db_filters"]
+    assert result["spans"][1]["outcome"] == "empty"
+    assert tracing.get_current_trace() is None
+
+def test_span_records_error_outcome_in_histogram():
+    """An exception escaping a span is recorded with the error outcome"""
+    before = tracing.stage_latency.count(stage="test_failing_stage", outcome="error")
+    with pytest.raises(RuntimeError):
+        with tracing.span("test_failing_stage"):
+            raise RuntimeError("boom")
+    assert tracing.stage_latency.count(stage="test_failing_stage", outcome="error") == before + 1
+
+@pytest.mark.asyncio
+async def test_traces_are_isolated_between_tasks():
+    """Concurrent turns each collect only their own spans"""
+    async def turn(name: str):
+        with tracing.trace(name) as turn_trace:
+            with tracing.span(f"{name}_stage"):
+                await asyncio.sleep(0.01)
+        return turn_trace.to_dict()
+
+    first, second = await asyncio.gather(turn("a"), turn("b"))
+    assert [s["stage"] for s in first["spans"]] == ["a_stage"]
+    assert [s["stage"] for s in second["spans"]] == ["b_stage"]
+
+def test_histogram_snapshot_is_cumulative():
+    """Histogram buckets are cumulative and keyed by labels"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="llm")
+    histogram.observe(0.5, stage="llm")
+    histogram.observe(5.0, stage="llm")
+
+    series = registry.snapshot()["latency"]["series"][0]
+    assert series["labels"] == {"stage": "llm"}
+    assert series["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+    with pytest.raises(ValueError):
+        registry.counter("latency")
@@ -0,0 +1,85 @@
+import pytest
+import time
+import jwt
+from types import SimpleNamespace
+from fastapi import HTTPException
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.supabase import supabase_clients
+from app.services.auth.auth_service import AuthService, verified_tokens
+
+settings = get_settings()
+
+def make_token(secret=None, **overrides):
+    claims = {
+        "sub": "user-123",
+        "email": "buyer@example.com",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "exp": int(time.time()) + 3600,
+        **overrides,
+    }
+    claims = {key: value for key, value in claims.items() if value is not None}
+    return jwt.encode(claims, secret or settings.SUPABASE_JWT_SECRET, algorithm="HS256")
+
+@pytest.fixture
+def auth_service():
+    verified_tokens.clear()
+    return AuthService()
+
+@pytest.mark.asyncio
+async def test_valid_token_is_verified_locally_and_cached(auth_service):
+    """A good token is decoded without calling Supabase, then served from the cache"""
+    verifications = metrics.counter("auth_verifications_total")
+    cached_before = verifications.value(result="cached")
+    token = make_token()
+
+    user = await auth_service.verify_token(f"Bearer {token}")
+    again = await auth_service.verify_token(token)
+
+    assert user == {"id": "user-123", "email": "buyer@example.com"}
+    assert again == user
+    assert verifications.value(result="cached") == cached_before + 1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overrides", [
+    {"exp": int(time.time()) - 10},
+    {"aud": "anon"},
+    {"sub": None},
+    {"secret": "not-the-project-secret"},
+])
+async def test_invalid_tokens_are_rejected(auth_service, overrides):
+    with pytest.raises(HTTPException) as exc_info:
+        await auth_service.verify_token(make_token(**overrides))
+    assert exc_info.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_cached_token_is_not_served_past_its_exp(auth_service):
+    """A cache entry whose exp has passed is dropped and the token is decoded again"""
+    verifications = metrics.counter("auth_verifications_total")
+    token = make_token()
+    user = await auth_service.verify_token(token)
+    key = next(iter(verified_tokens))
+    verified_tokens[key] = (user, time.time() - 1)
+    cached_before = verifications.value(result="cached")
+    local_before = verifications.value(result="local")
+
+    await auth_service.verify_token(token)
+
+    assert verifications.value(result="cached") == cached_before
+    assert verifications.value(result="local") == local_before + 1
+
+@pytest.mark.asyncio
+async def test_remote_verification_returns_the_same_fields(auth_service, monkeypatch):
+    """/verify's response doesn't change shape when remote verification is enabled"""
+    class AuthClient:
+        def get_user(self, token):
+            return SimpleNamespace(user=SimpleNamespace(id="user-123", email="buyer@example.com"))
+
+    monkeypatch.setattr(settings, "AUTH_REMOTE_VERIFY", True)
+    monkeypatch.setattr(supabase_clients, "auth_client", AuthClient)
+    verifications = metrics.counter("auth_verifications_total")
+    remote_before = verifications.value(result="remote")
+
+    assert await auth_service.verify_token(make_token()) == {"id": "user-123", "email": "buyer@example.com"}
+    assert verifications.value(result="remote") == remote_before + 1
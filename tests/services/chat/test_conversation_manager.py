@@ -0,0 +1,203 @@
+import pytest
+import asyncio
+from types import SimpleNamespace
+from app.services.chat import conversation_manager as manager_module
+from app.services.chat.conversation_manager import FACET_COUNT_PATTERN, ConversationManager, text_search_terms
+from app.services.db.property_queries import PropertyPage
+from app.services.vector_store import pinecone_service as pinecone_module
+
+class SlowPinecone:
+    """Semantic leg that answers once `release` is set, recording cancellation"""
+
+    def __init__(self, docs=None, error=None):
+        self.docs = docs or []
+        self.error = error
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def get_embedding(self, text):
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return [0.1] * 768
+
+    async def search_similar(self, query_embedding, top_k=5):
+        if self.error:
+            raise self.error
+        return self.docs
+
+class Database:
+    def __init__(self, items, pinecone=None):
+        self.items = items
+        self.pinecone = pinecone
+
+    async def get_property_page(self, filters, projection="card", limit=6, cursor=None):
+        await asyncio.sleep(0.01)
+        if self.pinecone is not None:
+            # The semantic leg is already in flight while the database answers
+            self.pinecone.release.set()
+        return PropertyPage(items=self.items)
+
+class Cache:
+    async def get_many(self, property_ids):
+        return [{"id": property_id} for property_id in property_ids]
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(manager_module.settings, "SPECULATIVE_SEARCH", True)
+    monkeypatch.setattr(manager_module, "property_cache", Cache())
+    return ConversationManager()
+
+@pytest.mark.asyncio
+async def test_structured_hit_cancels_the_semantic_search(manager, monkeypatch):
+    pinecone = SlowPinecone(docs=[{"id": "p9"}])
+    monkeypatch.setattr(manager_module, "pinecone_service", pinecone)
+    monkeypatch.setattr(manager_module, "database_service", Database([{"id": "p1"}]))
+    structured = manager_module.speculative_search_total.value(outcome="structured")
+
+    properties = await manager._search_properties({"city": "Dewas"}, "user-1")
+    await asyncio.sleep(0)
+
+    assert properties == [{"id": "p1"}]
+    assert pinecone.cancelled
+    assert manager.last_properties["user-1"] == [{"id": "p1"}]
+    assert manager_module.speculative_search_total.value(outcome="structured") == structured + 1
+
+@pytest.mark.asyncio
+async def test_structured_hit_abandons_the_embedding_request(manager, monkeypatch):
+    class SlowModel:
+        cancelled = False
+
+        async def generate_content_async(self, prompt, generation_config=None):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                SlowModel.cancelled = True
+                raise
+
+    monkeypatch.setattr(pinecone_module, "gemini_model", SlowModel)
+    monkeypatch.setattr(manager_module, "pinecone_service", pinecone_module.PineconeService())
+    monkeypatch.setattr(manager_module, "database_service", Database([{"id": "p1"}]))
+
+    assert await manager._search_properties({"city": "Dewas"}, "user-1") == [{"id": "p1"}]
+    await asyncio.sleep(0)
+    assert SlowModel.cancelled
+
+@pytest.mark.asyncio
+async def test_structured_miss_falls_back_to_the_inflight_semantic_search(manager, monkeypatch):
+    pinecone = SlowPinecone(docs=[{"id": "p7"}, {"id": "p8"}])
+    monkeypatch.setattr(manager_module, "pinecone_service", pinecone)
+    monkeypatch.setattr(manager_module, "database_service", Database([], pinecone))
+    semantic = manager_module.speculative_search_total.value(outcome="semantic")
+    saved = manager_module.speculative_search_saved.count()
+
+    properties = await manager._search_properties({"city": "Dewas"}, "user-1")
+
+    assert properties == [{"id": "p7"}, {"id": "p8"}]
+    assert not pinecone.cancelled
+    assert manager_module.speculative_search_total.value(outcome="semantic") == semantic + 1
+    assert manager_module.speculative_search_saved.count() == saved + 1
+
+@pytest.mark.asyncio
+async def test_failed_semantic_search_after_a_miss_returns_nothing(manager, monkeypatch):
+    pinecone = SlowPinecone(error=RuntimeError("pinecone down"))
+    monkeypatch.setattr(manager_module, "pinecone_service", pinecone)
+    monkeypatch.setattr(manager_module, "database_service", Database([], pinecone))
+    empty = manager_module.speculative_search_total.value(outcome="empty")
+
+    assert await manager._search_properties({"city": "Dewas"}, "user-1") == []
+    assert manager_module.speculative_search_total.value(outcome="empty") == empty + 1
+
+def test_text_search_terms_keep_descriptive_words():
+    assert text_search_terms("Show me a 3 BHK villa with a pool for sale in Bangalore") == "villa or pool"
+    assert text_search_terms("I want properties for rent") == ""
+    # Words the filters already cover (locations, listing and property types) aren't search terms
+    assert text_search_terms("2 bhk flats in hyderabad for rent") == ""
+    assert text_search_terms("farm house near chennai") == ""
+
+def listing(id, title, description, city):
+    return {"id": id, "title": title, "description": description, "city": city, "listing_type": "sale"}
+
+LISTINGS = [
+    listing("p1", "Lake View Villa", "Four bedrooms and a private pool", "Bangalore"),
+    listing("p2", "Compact apartment", "Close to the metro", "Bangalore"),
+    listing("p3", "Pool side villa", "Gated community", "Chennai"),
+]
+
+class ListingsDatabase:
+    """In-memory listings answering both queries the way the SQL does.
+
+    get_property_page applies the filters. search_properties_text applies the same
+    filters, keeps rows whose text matches any OR-ed term, and ranks them by the
+    number of matching terms, as the search_properties function does.
+    """
+
+    def __init__(self):
+        self.text_queries = []
+
+    def _filtered(self, filters):
+        return [
+            row for row in LISTINGS
+            if filters.get("city", "").lower() in row["city"].lower()
+            and filters.get("listing_type", row["listing_type"]) == row["listing_type"]
+        ]
+
+    async def get_property_page(self, filters, projection="card", limit=6, cursor=None):
+        return PropertyPage(items=self._filtered(filters)[:limit])
+
+    async def search_properties_text(self, query, filters, limit=6):
+        self.text_queries.append(query)
+        terms = query.split(" or ")
+        ranked = []
+        for row in self._filtered(filters):
+            words = set(f"{row['title']} {row['description']} {row['city']}".lower().split())
+            if matched := sum(term in words for term in terms):
+                ranked.append((-matched, row["id"], row))
+        return [row for _, _, row in sorted(ranked)][:limit]
+
+@pytest.fixture(params=[True, False], ids=["speculative", "sequential"])
+def listings(request, manager, monkeypatch):
+    monkeypatch.setattr(manager_module.settings, "SPECULATIVE_SEARCH", request.param)
+    monkeypatch.setattr(manager_module, "pinecone_service", SlowPinecone())
+    database = ListingsDatabase()
+    monkeypatch.setattr(manager_module, "database_service", database)
+    return database
+
+@pytest.mark.asyncio
+async def test_descriptive_words_rank_matching_listings_within_the_filters(manager, listings):
+    query = "villa with a pool in Bangalore"
+    filters, _ = manager._extract_property_filters(query)
+
+    properties = await manager._search_properties(filters, "user-1", query=query)
+
+    # The structured filters alone would return both Bangalore listings
+    assert [row["id"] for row in properties] == ["p1"]
+    assert listings.text_queries == ["villa or pool"]
+    assert "user-1" not in manager.next_cursors
+
+@pytest.mark.asyncio
+async def test_unmatched_descriptive_words_fall_back_to_the_filters(manager, listings):
+    properties = await manager._search_properties({"city": "Bangalore"}, "user-1", query="penthouse in Bangalore")
+
+    assert [row["id"] for row in properties] == ["p1", "p2"]
+    assert listings.text_queries == ["penthouse"]
+
+@pytest.mark.asyncio
+async def test_queries_without_descriptive_words_skip_the_text_search(manager, listings):
+    properties = await manager._search_properties({"city": "Bangalore"}, "user-1", query="properties in Bangalore")
+
+    assert [row["id"] for row in properties] == ["p1", "p2"]
+    assert listings.text_queries == []
+
+@pytest.mark.parametrize("query,is_count", [
+    ("how many 2 bhk flats are there in hyderabad", True),
+    ("how many properties do you have for rent", True),
+    ("number of commercial listings in bangalore", True),
+    ("how many bhks are available", True),
+    ("how many bathrooms does the 2 bhk have", False),
+    ("how many floors does that property have", False),
+])
+def test_facet_count_pattern_only_matches_listing_counts(query, is_count):
+    assert bool(FACET_COUNT_PATTERN.search(query)) == is_count
@@ -0,0 +1,48 @@
+import pytest
+from app.services.chat.intent_router import IntentRouter, UNKNOWN_INTENT
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(confidence_threshold=0.8)
+
+@pytest.mark.parametrize("utterance,intent", [
+    ("Hi.", "greeting"),
+    ("Hello, Janaki!", "greeting"),
+    ("Thank you.", "thanks"),
+    ("Okay, bye.", "goodbye"),
+    ("Yes, please.", "affirm"),
+    ("No thanks.", "deny"),
+    ("Can you repeat that?", "repeat"),
+    ("Show me more.", "show_more"),
+])
+def test_rules_match_transcribed_utterances(router, utterance, intent):
+    """Punctuated speech-to-text output is matched by the whole-utterance rules"""
+    result = router.classify(utterance)
+    assert result.intent == intent
+    assert result.confidence == 1.0
+    assert result.source == "rule"
+
+@pytest.mark.parametrize("utterance", [
+    "Show me 2 BHK apartments for rent in Bangalore",
+    "What is the price of the third one?",
+    "I am looking for a commercial shop near the main road with parking and good footfall",
+    "",
+])
+def test_substantive_queries_fall_through(router, utterance):
+    """Queries with real content are left for the LLM"""
+    result = router.classify(utterance)
+    assert result.is_unknown
+    assert result.intent == UNKNOWN_INTENT
+
+def test_model_confidence_is_exposed(router):
+    """Paraphrases are classified by the model with a calibrated confidence"""
+    result = router.classify("thanks so much for your help")
+    assert result.source == "model"
+    assert 0.0 < result.confidence <= 1.0
+
+def test_threshold_sends_uncertain_cases_to_llm():
+    """A strict threshold turns model guesses into unknown results"""
+    strict = IntentRouter(confidence_threshold=0.999)
+    result = strict.classify("thanks so much for your help")
+    assert result.is_unknown
+    assert result.source == "model"
@@ -0,0 +1,142 @@
+import pytest
+import asyncio
+import os
+from app.services.db.conversation_writer import ConversationWriter
+
+class FakeConversationSink:
+    """Records each batch insert and can simulate a database outage"""
+
+    def __init__(self):
+        self.available = True
+        self.batches = []
+
+    async def save_conversations(self, rows):
+        if not self.available:
+            return False
+        self.batches.append([row['transcript'] for row in rows])
+        return True
+
+@pytest.fixture
+def sink():
+    return FakeConversationSink()
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "journal" / "conversations.jsonl")
+
+@pytest.mark.asyncio
+async def test_rows_are_flushed_as_batches(sink, journal_path):
+    """Buffered turns are written in batches of at most batch_size rows"""
+    writer = ConversationWriter(sink, journal_path, batch_size=2, flush_interval=60)
+    for i in range(5):
+        writer.enqueue(f"turn {i}", "response")
+
+    assert sink.batches == []
+    await writer.flush()
+    assert sink.batches == [["turn 0", "turn 1"], ["turn 2", "turn 3"], ["turn 4"]]
+
+@pytest.mark.asyncio
+async def test_size_threshold_wakes_background_flush(sink, journal_path):
+    """Reaching batch_size flushes without waiting for the interval"""
+    writer = ConversationWriter(sink, journal_path, batch_size=2, flush_interval=60)
+    await writer.start()
+    try:
+        writer.enqueue("turn 0", "response")
+        writer.enqueue("turn 1", "response")
+        for _ in range(50):
+            if sink.batches:
+                break
+            await asyncio.sleep(0.01)
+        assert sink.batches == [["turn 0", "turn 1"]]
+    finally:
+        await writer.stop()
+
+@pytest.mark.asyncio
+async def test_outage_spills_to_journal_and_replays(sink, journal_path):
+    """Rows survive a database outage and are replayed once it recovers"""
+    writer = ConversationWriter(sink, journal_path, batch_size=10, flush_interval=60)
+    sink.available = False
+    writer.enqueue("turn 0", "response")
+    writer.enqueue("turn 1", "response")
+    await writer.flush()
+
+    assert os.path.exists(journal_path)
+    assert sink.batches == []
+
+    sink.available = True
+    writer.enqueue("turn 2", "response")
+    await writer.flush()
+
+    assert sink.batches == [["turn 2"], ["turn 0", "turn 1"]]
+    assert not os.path.exists(journal_path)
+
+@pytest.mark.asyncio
+async def test_journal_from_previous_process_is_replayed(sink, journal_path):
+    """A journal left behind by a crashed process is replayed by the next writer"""
+    sink.available = False
+    crashed = ConversationWriter(sink, journal_path, batch_size=10, flush_interval=60)
+    crashed.enqueue("turn 0", "response")
+    await crashed.flush()
+
+    sink.available = True
+    writer = ConversationWriter(sink, journal_path, batch_size=10, flush_interval=60)
+    await writer.flush()
+    assert sink.batches == [["turn 0"]]
+
+@pytest.mark.asyncio
+async def test_stop_flushes_remaining_rows(sink, journal_path):
+    """Shutdown drains the buffer even if the flush interval hasn't elapsed"""
+    writer = ConversationWriter(sink, journal_path, batch_size=10, flush_interval=60)
+    await writer.start()
+    writer.enqueue("turn 0", "response")
+    await writer.stop()
+    assert sink.batches == [["turn 0"]]
+
+class SlowConversationSink(FakeConversationSink):
+    """Holds every insert until `release` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def save_conversations(self, rows):
+        self.writing.set()
+        await self.release.wait()
+        return await super().save_conversations(rows)
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_the_batch_being_written(journal_path):
+    """A batch in flight when the writer stops is saved, not dropped"""
+    sink = SlowConversationSink()
+    writer = ConversationWriter(sink, journal_path, batch_size=2, flush_interval=60)
+    await writer.start()
+    writer.enqueue("turn 0", "response")
+    writer.enqueue("turn 1", "response")
+    await sink.writing.wait()
+
+    stopping = asyncio.create_task(writer.stop())
+    writer.enqueue("turn 2", "response")
+    await asyncio.sleep(0.01)
+    assert not stopping.done()
+    sink.release.set()
+    await stopping
+
+    assert sink.batches == [["turn 0", "turn 1"], ["turn 2"]]
+    assert not os.path.exists(journal_path)
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_keeps_its_batch(journal_path):
+    """Rows whose insert was cancelled go back to the buffer for the next flush"""
+    sink = SlowConversationSink()
+    writer = ConversationWriter(sink, journal_path, batch_size=10, flush_interval=60)
+    writer.enqueue("turn 0", "response")
+    flushing = asyncio.create_task(writer.flush())
+    await sink.writing.wait()
+
+    flushing.cancel()
+    await asyncio.gather(flushing, return_exceptions=True)
+    sink.release.set()
+    await writer.flush()
+
+    assert sink.batches == [["turn 0"]]
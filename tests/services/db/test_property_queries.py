@@ -0,0 +1,82 @@
+import re
+import pytest
+from pathlib import Path
+from app.services.db.property_queries import (
+    select_clause,
+    projection_columns,
+    encode_cursor,
+    decode_cursor,
+    search_nearby_params,
+    search_properties_params
+)
+
+MIGRATIONS = Path(__file__).parents[3] / "supabase" / "migrations"
+
+def test_projections_exclude_heavy_columns():
+    """Voice and card projections skip JSONB columns they don't render"""
+    assert "images" not in projection_columns("voice")
+    assert "features" not in projection_columns("card")
+    assert "images" in projection_columns("card")
+    assert select_clause("detail") == "*"
+
+def test_projection_includes_sort_key():
+    """The keyset sort column is always selected so a cursor can be built"""
+    assert "created_at" in projection_columns("voice", order_by="newest")
+    with pytest.raises(ValueError):
+        projection_columns("everything")
+
+def test_cursor_round_trip():
+    """Cursors are opaque and decode back to the ordering and last key"""
+    row = {"id": "8f1c6f1e-0000-4000-8000-000000000001", "price": 2500000}
+    cursor = encode_cursor("price", row)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("price", 2500000, row["id"])
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor("price", {"id": "x", "price": 1})[:-4]])
+def test_invalid_cursor_is_rejected(cursor):
+    """Tampered cursors raise ValueError instead of producing a bad query"""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_search_nearby_params_follow_function_signature():
+    """Center and radius come first, then the shared filters, with no search text"""
+    params = search_nearby_params(12.97, 77.75, 5, {'listing_type': 'rent', 'bedrooms': '2'}, 6)
+
+    assert list(params)[:3] == ['center_latitude', 'center_longitude', 'radius_km']
+    assert 'search_query' not in params
+    assert params['filter_listing_type'] == 'rent'
+    assert params['filter_bedrooms'] == 2
+    assert params['result_limit'] == 6
+
+@pytest.mark.parametrize("latitude,longitude,radius_km", [(91, 0, 5), (0, -181, 5), (12.9, 77.7, 0)])
+def test_search_nearby_params_reject_invalid_input(latitude, longitude, radius_km):
+    with pytest.raises(ValueError):
+        search_nearby_params(latitude, longitude, radius_km, {}, 6)
+
+def test_search_properties_params_follow_function_signature():
+    """Postgres passes the values positionally, so keys must be in declaration order"""
+    sql = (MIGRATIONS / "20250411_property_text_search.sql").read_text()
+    signature = re.search(r"FUNCTION search_properties\((.*?)\)\s*RETURNS", sql, re.S).group(1)
+    declared = [line.split()[0] for line in signature.strip().splitlines()]
+
+    assert list(search_properties_params("pool", {}, 6)) == declared
+
+def test_search_properties_params_map_conversation_filters():
+    params = search_properties_params(
+        "pool or garden",
+        {"city": "Bangalore", "listing_type": "sale", "bedrooms": "3", "property_type": "", "max_price": 5000000},
+        6
+    )
+
+    assert params == {
+        "search_query": "pool or garden",
+        "filter_city": "Bangalore",
+        "filter_state": None,
+        "filter_property_type": None,  # Empty filters mean "any", not an exact match on ""
+        "filter_listing_type": "sale",
+        "filter_bedrooms": 3,
+        "min_price": None,
+        "max_price": 5000000,
+        "result_limit": 6,
+    }
@@ -0,0 +1,142 @@
+import pytest
+import asyncio
+import itertools
+import statistics
+from app.services.property.facet_service import FacetService, FACET_DIMENSIONS
+
+LISTINGS = [
+    {'state': 'Telangana', 'city': 'Hyderabad', 'listing_type': 'rent', 'property_type': 'residential', 'bedrooms': 2, 'price': 25000},
+    {'state': 'Telangana', 'city': 'Hyderabad', 'listing_type': 'rent', 'property_type': 'residential', 'bedrooms': 3, 'price': 40000},
+    {'state': 'Telangana', 'city': 'Hyderabad', 'listing_type': 'sale', 'property_type': 'residential', 'bedrooms': 3, 'price': 9000000},
+    {'state': 'Telangana', 'city': 'Warangal', 'listing_type': 'rent', 'property_type': 'residential', 'bedrooms': 2, 'price': 12000},
+    {'state': 'Karnataka', 'city': 'Bangalore', 'listing_type': 'rent', 'property_type': 'commercial', 'bedrooms': None, 'price': 80000},
+]
+
+def cube_rows(listings):
+    """Rows shaped like the property_facets view: every rollup of the five dimensions"""
+    groups = {}
+    for listing in listings:
+        values = [
+            listing['state'].lower(), listing['city'].lower(), listing['listing_type'],
+            listing['property_type'], listing['bedrooms'] or 0
+        ]
+        for mask in itertools.product([True, False], repeat=len(FACET_DIMENSIONS)):
+            key = tuple(value if keep else None for value, keep in zip(values, mask))
+            groups.setdefault(key, []).append(listing['price'])
+    return [
+        {
+            **dict(zip(FACET_DIMENSIONS, key)),
+            'listing_count': len(prices),
+            'min_price': min(prices),
+            'median_price': int(statistics.median(prices)),
+            'max_price': max(prices),
+        }
+        for key, prices in groups.items()
+    ]
+
+class FakeFacetLoader:
+    """In-memory stand-in for the database service's facet queries"""
+
+    def __init__(self, listings):
+        self.listings = list(listings)
+        self.view = cube_rows(self.listings)
+        self.loads = 0
+        self.refreshes = 0
+        self.available = True
+        self.can_refresh = True
+
+    async def get_property_facets(self):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return list(self.view) if self.available else None
+
+    async def refresh_property_facets(self):
+        self.refreshes += 1
+        if not self.can_refresh:
+            return False
+        self.view = cube_rows(self.listings)
+        return True
+
+@pytest.fixture
+def loader():
+    return FakeFacetLoader(LISTINGS)
+
+@pytest.mark.asyncio
+async def test_counts_and_prices_for_partial_filters(loader):
+    """Unfiltered dimensions roll up; filter values are matched case-insensitively"""
+    facets = FacetService(loader)
+
+    stats = await facets.get_stats({'state': 'Telangana', 'listing_type': 'rent'})
+
+    assert (stats.count, stats.min_price, stats.median_price, stats.max_price) == (3, 12000, 25000, 40000)
+    assert (await facets.get_stats({})).count == 5
+    assert (await facets.get_stats({'city': 'Chennai'})).count == 0
+    assert loader.loads == 1
+
+@pytest.mark.asyncio
+async def test_list_values_orders_by_count(loader):
+    """Which-cities answers come from the children index, largest first"""
+    facets = FacetService(loader)
+
+    assert await facets.list_values('city') == {'hyderabad': 3, 'warangal': 1, 'bangalore': 1}
+    assert await facets.list_values('city', {'listing_type': 'rent', 'state': 'Telangana'}) == {'hyderabad': 2, 'warangal': 1}
+    assert await facets.list_values('state', {'city': 'Bangalore'}) == {'karnataka': 1}
+
+@pytest.mark.asyncio
+async def test_mark_stale_refreshes_view_and_reloads(loader):
+    """A listing write refreshes the view before the index is rebuilt"""
+    facets = FacetService(loader)
+    assert (await facets.get_stats({'city': 'Warangal'})).count == 1
+
+    loader.listings.append({**LISTINGS[3], 'price': 15000})
+    facets.mark_stale()
+    await facets._refresh_task
+
+    assert loader.refreshes == 1
+    stats = await facets.get_stats({'city': 'Warangal'})
+    assert (stats.count, stats.max_price) == (2, 15000)
+
+@pytest.mark.asyncio
+async def test_unavailable_until_first_successful_load(loader):
+    """Lookups return None rather than a zero count when the view can't be read"""
+    loader.available = False
+    facets = FacetService(loader, ttl=0)
+
+    assert await facets.get_stats({'city': 'Hyderabad'}) is None
+    assert await facets.list_values('city') is None
+
+    loader.available = True
+    await facets.get_stats({})  # Expired TTL schedules a background reload
+    await facets._refresh_task
+    assert (await facets.get_stats({'city': 'Hyderabad'})).count == 3
+
+@pytest.mark.asyncio
+async def test_failed_view_refresh_is_retried_after_the_ttl_not_on_every_lookup(loader):
+    """A refused refresh keeps serving the loaded index instead of reloading on each lookup"""
+    loader.can_refresh = False
+    facets = FacetService(loader, ttl=300)
+    await facets.get_stats({})
+    loads = loader.loads
+
+    facets.mark_stale()
+    await facets._refresh_task
+    for _ in range(5):
+        assert (await facets.get_stats({'city': 'Hyderabad'})).count == 3
+        await asyncio.sleep(0)
+
+    assert loader.refreshes == 1
+    assert loader.loads == loads + 1
+    assert facets._refresh_task.done()
+
+    # The next reload after the TTL retries the refresh
+    loader.can_refresh = True
+    loader.listings.append({**LISTINGS[3], 'price': 15000})
+    facets.ttl = 0
+    await facets.get_stats({})
+    await facets._refresh_task
+    assert loader.refreshes == 2
+    assert (await facets.get_stats({'city': 'Warangal'})).count == 2
+
+def test_unknown_dimension_raises(loader):
+    with pytest.raises(ValueError):
+        asyncio.run(FacetService(loader).list_values('zipcode'))
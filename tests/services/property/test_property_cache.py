@@ -0,0 +1,65 @@
+import pytest
+import asyncio
+from app.services.property.property_cache import PropertyCache
+
+class FakePropertyLoader:
+    """In-memory stand-in for the database service that records each by-ids query"""
+
+    def __init__(self, rows):
+        self.rows = {row['id']: row for row in rows}
+        self.calls = []
+
+    async def get_properties_by_ids(self, property_ids):
+        self.calls.append(list(property_ids))
+        await asyncio.sleep(0)
+        return [self.rows[pid] for pid in property_ids if pid in self.rows]
+
+@pytest.fixture
+def loader():
+    return FakePropertyLoader([{'id': f"p{i}", 'title': f"Property {i}"} for i in range(10)])
+
+@pytest.mark.asyncio
+async def test_misses_are_filled_in_one_batch(loader):
+    """Six ids with four cached issue a single query for the remaining two"""
+    cache = PropertyCache(loader)
+    await cache.get_many(['p0', 'p1', 'p2', 'p3'])
+
+    properties = await cache.get_many(['p5', 'p0', 'p1', 'p4', 'p2', 'p3'])
+
+    assert [p['id'] for p in properties] == ['p5', 'p0', 'p1', 'p4', 'p2', 'p3']
+    assert loader.calls == [['p0', 'p1', 'p2', 'p3'], ['p5', 'p4']]
+
+@pytest.mark.asyncio
+async def test_unknown_ids_are_skipped_and_not_cached(loader):
+    """Missing properties are omitted and looked up again next time"""
+    cache = PropertyCache(loader)
+    assert await cache.get('missing') is None
+    assert await cache.get('missing') is None
+    assert loader.calls == [['missing'], ['missing']]
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_query(loader):
+    """Callers racing on the same id wait for the in-flight load"""
+    cache = PropertyCache(loader)
+    first, second = await asyncio.gather(cache.get('p1'), cache.get('p1'))
+    assert first == second == {'id': 'p1', 'title': 'Property 1'}
+    assert loader.calls == [['p1']]
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload(loader):
+    """Invalidated properties are reloaded with fresh data"""
+    cache = PropertyCache(loader)
+    await cache.get('p1')
+    loader.rows['p1'] = {'id': 'p1', 'title': 'Renamed'}
+
+    assert (await cache.get('p1'))['title'] == 'Property 1'
+    cache.invalidate('p1')
+    assert (await cache.get('p1'))['title'] == 'Renamed'
+
+@pytest.mark.asyncio
+async def test_size_bound_evicts_entries(loader):
+    """The cache never holds more than maxsize properties"""
+    cache = PropertyCache(loader, maxsize=3)
+    await cache.get_many([f"p{i}" for i in range(6)])
+    await cache.get_many(['p0'])
+    assert len(loader.calls) == 2
@@ -0,0 +1,71 @@
+import pytest
+import asyncio
+from types import SimpleNamespace
+from app.services.vector_store import pinecone_service as pinecone_module
+from app.services.vector_store.pinecone_service import PineconeService
+
+class FakeIndex:
+    def __init__(self, name):
+        self.name = name
+
+    def describe_index_stats(self):
+        return SimpleNamespace(dimension=768)
+
+    def query(self, **kwargs):
+        return SimpleNamespace(matches=[SimpleNamespace(id="v1", metadata={"property_id": "p1"})])
+
+class FakePinecone:
+    clients = []
+
+    def __init__(self, api_key):
+        self.listed = 0
+        FakePinecone.clients.append(self)
+
+    def list_indexes(self):
+        self.listed += 1
+        return [SimpleNamespace(name="realestate"), SimpleNamespace(name="properties")]
+
+    def Index(self, name):
+        return FakeIndex(name)
+
+@pytest.fixture
+def pinecone(monkeypatch):
+    FakePinecone.clients = []
+    monkeypatch.setattr(pinecone_module, "Pinecone", FakePinecone)
+    monkeypatch.setattr(pinecone_module.time, "sleep", lambda seconds: pytest.fail("slept for existing indexes"))
+    return FakePinecone
+
+def test_construction_does_not_connect(pinecone):
+    PineconeService()
+    assert pinecone.clients == []
+
+@pytest.mark.asyncio
+async def test_first_searches_connect_once(pinecone):
+    service = PineconeService()
+
+    results = await asyncio.gather(*(service.search_similar([0.1] * 768) for _ in range(3)))
+
+    assert results == [[{"property_id": "p1", "id": "p1"}]] * 3
+    [client] = pinecone.clients
+    assert client.listed == 2  # One check per index, not per search
+
+@pytest.mark.asyncio
+async def test_cancelling_an_embedding_cancels_the_gemini_request(monkeypatch):
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    class SlowModel:
+        async def generate_content_async(self, prompt, generation_config=None):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    monkeypatch.setattr(pinecone_module, "gemini_model", SlowModel)
+    embedding = asyncio.create_task(PineconeService().get_embedding("city: Dewas"))
+    await started.wait()
+
+    embedding.cancel()
+    await asyncio.gather(embedding, return_exceptions=True)
+    assert cancelled.is_set()
@@ -0,0 +1,63 @@
+import pytest
+import asyncio
+import time
+from types import SimpleNamespace
+from app.services.chat.conversation_manager import ConversationManager
+from app.services.voice.admission import SessionAdmission
+
+def test_sessions_beyond_the_cap_are_refused_until_one_ends():
+    admission = SessionAdmission(max_sessions=2, max_turns_in_flight=10, max_loop_lag=1.0)
+
+    assert admission.admit() is None
+    assert admission.admit() is None
+    assert admission.admit() == "sessions"
+
+    admission.release()
+    assert admission.admit() is None
+
+def test_turns_in_flight_refuse_new_sessions():
+    admission = SessionAdmission(max_sessions=10, max_turns_in_flight=1, max_loop_lag=1.0)
+
+    with admission.turn():
+        assert admission.admit() == "turns"
+    assert admission.turns_in_flight == 0
+    assert admission.admit() is None
+
+def test_retry_after_is_jittered_within_bounds():
+    admission = SessionAdmission(max_sessions=1, max_turns_in_flight=1, max_loop_lag=1.0, retry_after=5)
+    assert all(5 <= admission.retry_after_seconds() <= 10 for _ in range(50))
+
+@pytest.mark.asyncio
+async def test_a_blocked_event_loop_refuses_new_sessions():
+    admission = SessionAdmission(max_sessions=10, max_turns_in_flight=10, max_loop_lag=0.05, lag_interval=0.01)
+    admission.start()
+    try:
+        await asyncio.sleep(0.005)
+        time.sleep(0.1)  # Blocking work on the loop
+        for _ in range(100):
+            if admission.loop_lag > 0.05:
+                break
+            await asyncio.sleep(0.001)
+        assert admission.admit() == "loop_lag"
+    finally:
+        await admission.stop()
+
+@pytest.mark.asyncio
+async def test_a_turn_waiting_on_the_llm_does_not_refuse_new_sessions():
+    class SlowModel:
+        async def generate_content_async(self, prompt):
+            await asyncio.sleep(0.2)
+            return SimpleNamespace(text="Bring the sale deed and ID proof.")
+
+    manager = ConversationManager(model=SlowModel())
+    admission = SessionAdmission(max_sessions=10, max_turns_in_flight=10, max_loop_lag=0.05, lag_interval=0.01)
+    admission.start()
+    try:
+        with admission.turn():
+            turn = asyncio.create_task(manager.process_query("user-1", "what documents do I need"))
+            await asyncio.sleep(0.1)
+            assert not turn.done()
+            assert admission.admit() is None
+            assert (await turn).text == "Bring the sale deed and ID proof."
+    finally:
+        await admission.stop()
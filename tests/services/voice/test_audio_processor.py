@@ -0,0 +1,60 @@
+import pytest
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.core.http import HTTPClientRegistry
+from app.services.voice.audio_processor import AudioProcessor
+
+# Not decodable, so it is uploaded as recorded
+RECORDING = b"\x1aE\xdf\xa3 not really webm" * 8
+
+class ListenHandler(BaseHTTPRequestHandler):
+    """Deepgram prerecorded stand-in returning a fixed transcript"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.path, self.headers.get("Authorization"), self.headers.get("Content-Type"), body))
+        status = 200 if self.headers.get("Authorization") == "Token test-key" else 401
+        payload = json.dumps({"results": {"channels": [{"alternatives": [{"transcript": " Two bedroom flats "}]}]}})
+        payload = payload.encode() if status == 200 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+async def processor():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListenHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    processor = AudioProcessor(clients=HTTPClientRegistry())
+    processor.deepgram_api_key = "test-key"
+    processor.deepgram_url = f"http://127.0.0.1:{server.server_port}/v1/listen"
+    processor.server = server
+    try:
+        yield processor
+    finally:
+        await processor.clients.aclose()
+        server.shutdown()
+        server.server_close()
+
+@pytest.mark.asyncio
+async def test_recording_is_transcribed_over_the_pooled_client(processor):
+    assert await processor.process_audio(RECORDING) == "Two bedroom flats"
+
+    [(path, authorization, mimetype, body)] = processor.server.requests
+    assert path.startswith("/v1/listen?") and "model=nova-2" in path
+    assert authorization == "Token test-key"
+    assert mimetype == "audio/webm"
+    assert body == RECORDING
+
+@pytest.mark.asyncio
+async def test_rejected_request_yields_no_transcript(processor):
+    processor.deepgram_api_key = "wrong-key"
+    assert await processor.process_audio(RECORDING) is None
@@ -0,0 +1,30 @@
+import json
+import pytest
+from app.services.voice.frames import (
+    FRAME_HEADER, FRAME_VERSION, FrameType, decode_frame, encode_frame, message_to_frame
+)
+
+def test_frame_round_trip():
+    data = encode_frame(FrameType.AUDIO, 7, 3, b"mp3")
+
+    assert len(data) == FRAME_HEADER.size + 3
+    frame = decode_frame(data)
+    assert (frame.type, frame.turn, frame.seq, frame.payload) == (FrameType.AUDIO, 7, 3, b"mp3")
+
+def test_decode_rejects_unknown_versions_and_truncated_frames():
+    with pytest.raises(ValueError):
+        decode_frame(bytes([FRAME_VERSION + 1]) + encode_frame(FrameType.AUDIO, 1, 0)[1:])
+    with pytest.raises(ValueError):
+        decode_frame(b"\x01\x01")
+
+def test_messages_map_to_frames():
+    assert message_to_frame(b"chunk") == (FrameType.AUDIO, b"chunk")
+    assert message_to_frame({"type": "transcription", "text": "2 BHK"}) == (FrameType.TRANSCRIPT, b"2 BHK")
+    assert message_to_frame({"type": "audio_end", "chunks": 4}) == (FrameType.AUDIO_END, b"")
+
+    frame_type, payload = message_to_frame({"type": "response", "text": "Here you go", "properties": []})
+    assert frame_type == FrameType.RESPONSE
+    assert json.loads(payload) == {"text": "Here you go", "properties": []}
+
+    # Errors stay JSON for every client
+    assert message_to_frame({"type": "error", "message": "boom"}) is None
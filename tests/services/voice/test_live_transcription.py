@@ -0,0 +1,131 @@
+import pytest
+import asyncio
+import json
+from websockets.asyncio.server import serve
+from app.services.voice.live_transcription import LiveTranscriptionSession, StreamingTranscriber
+
+def results(transcript, is_final=False, speech_final=False):
+    return json.dumps({
+        "type": "Results",
+        "is_final": is_final,
+        "speech_final": speech_final,
+        "channel": {"alternatives": [{"transcript": transcript, "confidence": 0.9}]},
+    })
+
+class FakeDeepgram:
+    """Local live endpoint: an interim result per chunk, final results on CloseStream"""
+
+    def __init__(self, words):
+        self.words = words
+        self.headers = []
+        self.chunks = []
+
+    async def handler(self, socket):
+        self.headers.append(socket.request.headers.get("Authorization"))
+        heard = []
+        async for message in socket:
+            if isinstance(message, bytes):
+                self.chunks.append(message)
+                heard.append(self.words[len(heard) % len(self.words)])
+                await socket.send(results(" ".join(heard)))
+            elif json.loads(message)["type"] == "CloseStream":
+                await socket.send(results(" ".join(heard[:2]), is_final=True))
+                await socket.send(results(" ".join(heard[2:]), is_final=True, speech_final=True))
+                await socket.close()
+
+@pytest.fixture
+async def deepgram():
+    fake = FakeDeepgram(["show", "me", "rentals", "in", "hyderabad"])
+    async with serve(fake.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        fake.url = f"ws://127.0.0.1:{port}/v1/listen"
+        yield fake
+
+def session_factory(url):
+    return lambda events: LiveTranscriptionSession(events, api_key="test-key", url=url, options={"model": "nova-2"})
+
+async def collect(transcriber):
+    return [event async for event in transcriber.events()]
+
+@pytest.mark.asyncio
+async def test_interim_then_single_final_transcript(deepgram):
+    transcriber = StreamingTranscriber(session_factory(deepgram.url))
+    collected = asyncio.create_task(collect(transcriber))
+
+    for chunk in (b"a", b"b", b"c", b"d", b"e"):
+        await transcriber.feed(chunk)
+    await asyncio.sleep(0.05)
+    await transcriber.end_audio()
+    await transcriber.close()
+    events = await collected
+
+    assert deepgram.headers == ["Token test-key"]
+    assert deepgram.chunks == [b"a", b"b", b"c", b"d", b"e"]
+    interim = [event.text for event in events if not event.is_final]
+    final = [event for event in events if event.is_final]
+    assert interim[0] == "show" and interim[-1].startswith("show me")
+    assert len(final) == 1
+    assert final[0].text == "show me rentals in hyderabad"
+    assert final[0].confidence == pytest.approx(0.9)
+
+@pytest.mark.asyncio
+async def test_each_recording_gets_its_own_session(deepgram):
+    transcriber = StreamingTranscriber(session_factory(deepgram.url))
+    collected = asyncio.create_task(collect(transcriber))
+
+    for recording in ([b"1", b"2"], [b"3"]):
+        for chunk in recording:
+            await transcriber.feed(chunk)
+        await transcriber.end_audio()
+    await transcriber.close()
+    finals = [event.text for event in await collected if event.is_final]
+
+    assert len(deepgram.headers) == 2
+    assert finals == ["show me", "show"]
+
+@pytest.mark.asyncio
+async def test_close_without_audio_ends_event_stream():
+    transcriber = StreamingTranscriber()
+    collected = asyncio.create_task(collect(transcriber))
+    await transcriber.close()
+    assert await collected == []
+
+class RecordingSession:
+    """Session stand-in that records what would have been sent to Deepgram"""
+
+    sessions = []
+
+    def __init__(self, events):
+        self.chunks = []
+        self.finished = False
+        RecordingSession.sessions.append(self)
+
+    async def start(self):
+        pass
+
+    async def send(self, chunk):
+        self.chunks.append(chunk)
+
+    async def finish(self):
+        self.finished = True
+
+    async def close(self):
+        pass
+
+@pytest.mark.asyncio
+async def test_vad_drops_silence_and_ends_utterance():
+    import numpy as np
+    from app.utils.voice import VoiceActivityDetector
+
+    rate = 16000
+    quiet = np.zeros(rate // 4, dtype="<i2").tobytes()
+    speech = (0.3 * np.sin(2 * np.pi * 220 * np.arange(rate // 4) / rate) * 32767).astype("<i2").tobytes()
+    RecordingSession.sessions = []
+    transcriber = StreamingTranscriber(RecordingSession, vad=VoiceActivityDetector(rate, 20, hangover_ms=300))
+
+    for chunk in (quiet, quiet, speech, speech, quiet, quiet, quiet):
+        await transcriber.feed(chunk)
+
+    [session] = RecordingSession.sessions
+    assert session.chunks == [speech, speech, quiet]
+    assert session.finished
@@ -0,0 +1,62 @@
+import pytest
+import os
+from app.services.voice.tts_cache import TTSCache, tts_cache_key
+
+SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+
+def test_key_ignores_whitespace_but_not_voice_inputs():
+    key = tts_cache_key("Hello!  I'm Janaki.\n", "voice-a", "model-1", SETTINGS)
+
+    assert key == tts_cache_key(" Hello! I'm Janaki.", "voice-a", "model-1", dict(reversed(SETTINGS.items())))
+    assert key != tts_cache_key("Hello! I'm Janaki.", "voice-b", "model-1", SETTINGS)
+    assert key != tts_cache_key("Hello! I'm Janaki.", "voice-a", "model-1", {**SETTINGS, "stability": 0.6})
+    assert key != tts_cache_key("hello! i'm janaki.", "voice-a", "model-1", SETTINGS)
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_a_restart(tmp_path):
+    cache = TTSCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=4096)
+    assert await cache.get("ab12") is None
+    await cache.put("ab12", b"mp3-bytes")
+    assert await cache.get("ab12") == b"mp3-bytes"
+
+    restarted = TTSCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=4096)
+
+    assert await restarted.get("ab12") == b"mp3-bytes"
+    assert restarted._memory.get("ab12") == b"mp3-bytes"
+    assert not [name for _, _, names in os.walk(tmp_path) for name in names if name.endswith(".tmp")]
+
+@pytest.mark.asyncio
+async def test_disk_evicts_least_recently_used(tmp_path):
+    cache = TTSCache(str(tmp_path), max_memory_bytes=10, max_disk_bytes=250)
+    for key in ("aa01", "bb02"):
+        await cache.put(key, key.encode() * 25)
+    await cache.get("aa01")  # Now the most recently used
+
+    await cache.put("cc03", b"x" * 100)
+
+    assert await cache.get("bb02") is None
+    assert not os.path.exists(tmp_path / "bb" / "bb02.mp3")
+    assert await cache.get("aa01") == b"aa01" * 25
+    assert await cache.get("cc03") == b"x" * 100
+
+@pytest.mark.asyncio
+async def test_clips_served_from_memory_stay_on_disk(tmp_path):
+    """A phrase that is always a memory hit is still the most recently used on disk"""
+    cache = TTSCache(str(tmp_path), max_memory_bytes=1024, max_disk_bytes=300)
+    await cache.put("ee05", b"g" * 100)
+    for round in range(5):
+        assert await cache.get("ee05") == b"g" * 100
+        await cache.put(f"ff{round:02d}", b"o" * 100)
+
+    assert os.path.exists(tmp_path / "ee" / "ee05.mp3")
+    assert await cache.get("ee05") == b"g" * 100
+    assert await cache.get("ff00") is None
+
+@pytest.mark.asyncio
+async def test_missing_blob_is_a_miss(tmp_path):
+    cache = TTSCache(str(tmp_path), max_memory_bytes=1, max_disk_bytes=4096)
+    await cache.put("dd04", b"clip")
+    os.unlink(tmp_path / "dd" / "dd04.mp3")
+
+    assert await cache.get("dd04") is None
+    assert "dd04" not in cache._disk
@@ -0,0 +1,173 @@
+import pytest
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.core.http import HTTPClientRegistry
+from app.core.metrics import metrics
+from app.services.voice.tts_cache import TTSCache
+from app.services.voice.tts_service import TTSService, split_sentences
+
+CHUNKS = [b"ID3-frame-one", b"frame-two", b"frame-three"]
+
+class StreamingTTSHandler(BaseHTTPRequestHandler):
+    """ElevenLabs stand-in that holds the rest of the audio until the client has the first chunk"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, body["text"]))
+        self.server.ports.append(self.client_address[1])
+        if self.headers.get("xi-api-key") != "test-key":
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, chunk in enumerate(CHUNKS):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+            if index == 0:
+                self.server.first_chunk_received.wait(timeout=5)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+async def tts():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingTTSHandler)
+    server.requests = []
+    server.ports = []
+    server.first_chunk_received = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    service = TTSService(clients=HTTPClientRegistry())
+    service.api_key = "test-key"
+    service.api_url = f"http://127.0.0.1:{server.server_port}/v1/text-to-speech"
+    service.server = server
+    try:
+        yield service
+    finally:
+        await service.clients.aclose()
+        server.shutdown()
+        server.server_close()
+
+@pytest.mark.asyncio
+async def test_chunks_are_yielded_before_the_response_completes(tts):
+    received = []
+    async for chunk in tts.stream_speech("Here are three listings in Hyderabad."):
+        received.append(chunk)
+        tts.server.first_chunk_received.set()
+
+    assert received[0] == CHUNKS[0]
+    assert b"".join(received) == b"".join(CHUNKS)
+    assert tts.server.requests == [(f"/v1/text-to-speech/{tts.voice}/stream", "Here are three listings in Hyderabad.")]
+
+@pytest.mark.asyncio
+async def test_text_to_speech_joins_the_stream(tts):
+    tts.server.first_chunk_received.set()
+    assert await tts.text_to_speech("Hello") == b"".join(CHUNKS)
+
+@pytest.mark.asyncio
+async def test_invalid_key_raises_before_any_audio(tts):
+    tts.api_key = "wrong-key"
+    with pytest.raises(ValueError, match="Invalid ElevenLabs API key"):
+        async for _ in tts.stream_speech("Hello"):
+            pass
+
+@pytest.mark.asyncio
+async def test_cached_phrase_skips_the_provider(tts, tmp_path):
+    tts.cache = TTSCache(str(tmp_path))
+    tts.server.first_chunk_received.set()
+
+    first = await tts.text_to_speech("Hello! I'm Janaki.")
+    tts.api_key = None  # A cache hit never reaches the provider
+    second = [chunk async for chunk in tts.stream_speech("Hello!  I'm Janaki.")]
+
+    assert second == [first]
+    assert len(tts.server.requests) == 1
+
+@pytest.mark.asyncio
+async def test_prewarm_synthesizes_only_uncached_phrases(tts, tmp_path):
+    tts.cache = TTSCache(str(tmp_path))
+    tts.server.first_chunk_received.set()
+
+    await tts.prewarm(["Hello", "Goodbye"])
+    await tts.prewarm(["Hello", "Goodbye", "Thanks"])
+
+    assert [text for _, text in tts.server.requests] == ["Hello", "Goodbye", "Thanks"]
+
+@pytest.mark.asyncio
+async def test_syntheses_reuse_the_pooled_connection(tts):
+    """Back-to-back requests skip connection setup and are counted per provider"""
+    requests_before = metrics.counter("http_client_requests_total").value(client="elevenlabs", status="2xx")
+    tts.server.first_chunk_received.set()
+
+    for text in ("One", "Two", "Three"):
+        await tts.text_to_speech(text)
+
+    assert len(set(tts.server.ports)) == 1
+    assert metrics.counter("http_client_requests_total").value(client="elevenlabs", status="2xx") == requests_before + 3
+
+def test_split_sentences_keeps_fragments_with_their_neighbours():
+    text = (
+        "I found 3 properties for rent in Hyderabad under ₹45,000.\n"
+        "1. Lake View Residency, a 2 BHK in Gachibowli for ₹32,000 a month!\n"
+        "Ok. Would you like to hear more about any of these?"
+    )
+
+    assert split_sentences(text, min_chars=30) == [
+        "I found 3 properties for rent in Hyderabad under ₹45,000.",
+        "1. Lake View Residency, a 2 BHK in Gachibowli for ₹32,000 a month!",
+        "Ok. Would you like to hear more about any of these?",
+    ]
+    assert split_sentences("Sure. Done!", min_chars=30) == ["Sure. Done!"]
+
+class TimedTTS(TTSService):
+    """Synthesis takes longer for earlier sentences, so they finish out of order"""
+
+    def __init__(self, delays):
+        super().__init__(clients=HTTPClientRegistry())
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+
+    async def stream_speech(self, text):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays[text])
+            yield f"<{text}:1>".encode()
+            yield f"<{text}:2>".encode()
+        finally:
+            self.active -= 1
+
+@pytest.mark.asyncio
+async def test_sentences_synthesize_concurrently_but_play_in_order(monkeypatch):
+    sentences = [f"Property {n} is a spacious apartment close to the metro." for n in range(6)]
+    tts = TimedTTS({sentence: 0.3 - 0.04 * n for n, sentence in enumerate(sentences)})
+    tts._slots = asyncio.Semaphore(6)
+
+    started = time.perf_counter()
+    audio = await tts.text_to_speech(" ".join(sentences))
+    elapsed = time.perf_counter() - started
+
+    assert audio == b"".join(f"<{s}:1><{s}:2>".encode() for s in sentences)
+    assert elapsed < 0.5  # Sequential synthesis would take about 1.2 s
+    assert tts.peak == 6
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_respected():
+    sentences = [f"Sentence number {n} of the property readout." for n in range(5)]
+    tts = TimedTTS({sentence: 0.01 for sentence in sentences})
+    tts._slots = asyncio.Semaphore(2)
+
+    chunks = [chunk async for chunk in tts.stream_sentences(" ".join(sentences))]
+
+    assert len(chunks) == 10
+    assert tts.peak == 2
@@ -0,0 +1,35 @@
+import pytest
+from app.services.voice.utterance_buffer import UtteranceBuffer, UtteranceTooLarge
+
+def test_chunks_assemble_into_one_utterance():
+    buffer = UtteranceBuffer(max_bytes=64)
+    for chunk in (b"webm-", b"header", b"-opus"):
+        buffer.append(chunk)
+
+    audio = buffer.take()
+
+    assert isinstance(audio, memoryview)
+    assert audio.tobytes() == b"webm-header-opus"
+    assert len(buffer) == 0
+
+def test_taken_view_survives_the_next_utterance():
+    """Handing off starts a new bytearray rather than clearing the one being read"""
+    buffer = UtteranceBuffer(max_bytes=64)
+    buffer.append(b"first")
+    first = buffer.take()
+
+    buffer.append(b"second")
+
+    assert first.tobytes() == b"first"
+    assert buffer.take().tobytes() == b"second"
+
+def test_oversized_utterance_is_discarded():
+    buffer = UtteranceBuffer(max_bytes=8)
+    buffer.append(b"12345")
+
+    with pytest.raises(UtteranceTooLarge):
+        buffer.append(b"6789")
+
+    assert len(buffer) == 0
+    buffer.append(b"fresh")
+    assert buffer.take().tobytes() == b"fresh"
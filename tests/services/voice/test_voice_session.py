@@ -0,0 +1,348 @@
+import pytest
+import asyncio
+from types import SimpleNamespace
+from app.services.chat.conversation_manager import ConversationManager
+from app.services.voice import voice_session
+from app.services.voice.frames import FrameType, decode_frame
+from app.services.voice.live_transcription import TranscriptEvent
+from app.services.voice.voice_session import Turn, VoiceSession
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    def types(self):
+        return [message if isinstance(message, bytes) else message["type"] for message in self.sent]
+
+class FakeTranscriber:
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def feed(self, chunk):
+        pass
+
+    async def end_audio(self):
+        pass
+
+    async def close(self):
+        await self.queue.put(None)
+
+    async def events(self):
+        while (event := await self.queue.get()) is not None:
+            yield event
+
+class SlowConversation:
+    """Answers after `release` is set, recording every query and every cancellation"""
+
+    def __init__(self):
+        self.queries = []
+        self.cancelled = []
+        self.release = asyncio.Event()
+
+    async def process_query(self, user_id, text):
+        self.queries.append(text)
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        return SimpleNamespace(text=f"answer to {text}", properties=[], trace=None)
+
+class FakeTTS:
+    async def stream_sentences(self, text):
+        for chunk in (b"mp3-1", b"mp3-2"):
+            await asyncio.sleep(0)
+            yield chunk
+
+async def settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+@pytest.fixture
+def conversation(monkeypatch):
+    conversation = SlowConversation()
+    monkeypatch.setattr(voice_session, "conversation_manager", conversation)
+    monkeypatch.setattr(voice_session, "tts_service", FakeTTS())
+    monkeypatch.setattr(voice_session, "conversation_writer", SimpleNamespace(enqueue=lambda *args, **kwargs: None))
+    return conversation
+
+class GatedTTS:
+    """Streams one chunk, then holds the response until `release` is set"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def stream_sentences(self, text):
+        yield b"mp3-1"
+        await self.release.wait()
+        yield b"mp3-2"
+
+@pytest.mark.asyncio
+async def test_speech_before_the_answer_replaces_the_unanswered_turn(conversation):
+    websocket, transcriber = FakeWebSocket(), FakeTranscriber()
+    session = VoiceSession(websocket, "user-1", streaming_stt=True, stream_audio=True, transcriber=transcriber)
+    running = asyncio.create_task(session.run())
+
+    await transcriber.queue.put(TranscriptEvent("show me flats", is_final=True))
+    await settle()
+    assert conversation.queries == ["show me flats"]
+
+    # The user keeps talking before the answer is ready
+    await transcriber.queue.put(TranscriptEvent("in", is_final=False))
+    await transcriber.queue.put(TranscriptEvent("in Hyderabad", is_final=True))
+    await settle()
+    conversation.release.set()
+    await settle()
+
+    assert conversation.cancelled == ["show me flats"]
+    # Speech that was never answered is carried into the next turn
+    assert conversation.queries[-1] == "show me flats in Hyderabad"
+    # Nothing was playing, so the client is not told to interrupt
+    assert websocket.types() == [
+        "transcription", "interim_transcription", "transcription",
+        "response", "audio_start", b"mp3-1", b"mp3-2", "audio_end",
+    ]
+    assert websocket.sent[3]["text"] == "answer to show me flats in Hyderabad"
+
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+
+class SlowModel:
+    """Gemini stand-in that answers after `release` is set, recording cancelled prompts"""
+
+    def __init__(self):
+        self.prompts = []
+        self.cancelled = []
+        self.release = asyncio.Event()
+
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(prompt)
+            raise
+        return SimpleNamespace(text="Bring the sale deed and ID proof.")
+
+@pytest.mark.asyncio
+async def test_speech_during_the_llm_stage_cancels_the_model_call(monkeypatch):
+    model = SlowModel()
+    monkeypatch.setattr(voice_session, "conversation_manager", ConversationManager(model=model))
+    monkeypatch.setattr(voice_session, "tts_service", FakeTTS())
+    monkeypatch.setattr(voice_session, "conversation_writer", SimpleNamespace(enqueue=lambda *args, **kwargs: None))
+    websocket, transcriber = FakeWebSocket(), FakeTranscriber()
+    session = VoiceSession(websocket, "user-1", streaming_stt=True, stream_audio=True, transcriber=transcriber)
+    running = asyncio.create_task(session.run())
+
+    await transcriber.queue.put(TranscriptEvent("what documents do I need", is_final=True))
+    await settle()
+    assert len(model.prompts) == 1
+
+    # The loop is free while the model answers, so the next utterance is handled right away
+    await transcriber.queue.put(TranscriptEvent("to register it", is_final=True))
+    await settle()
+    assert model.cancelled == model.prompts[:1]
+    assert model.prompts[-1].endswith(
+        "User: what documents do I need to register it\n"
+        "Assistant: Remember to respond naturally without using markdown or special characters. "
+        "Format the response in a way that's easy to read and speak:"
+    )
+
+    model.release.set()
+    await settle()
+    assert websocket.types() == [
+        "transcription", "transcription", "response", "audio_start", b"mp3-1", b"mp3-2", "audio_end",
+    ]
+
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+
+@pytest.mark.asyncio
+async def test_reader_keeps_reading_while_a_recording_is_answered(conversation):
+    class Recordings:
+        async def process_audio(self, audio):
+            return audio.decode()
+
+    websocket = FakeWebSocket()
+    session = VoiceSession(websocket, "user-1", audio_processor=Recordings())
+    running = asyncio.create_task(session.run())
+
+    await websocket.incoming.put({"type": "websocket.receive", "bytes": b"two bedrooms"})
+    await settle()
+    await websocket.incoming.put({"type": "websocket.receive", "bytes": b"under one crore"})
+    await settle()
+
+    assert conversation.cancelled == ["two bedrooms"]
+    assert conversation.queries == ["two bedrooms", "two bedrooms under one crore"]
+    assert websocket.types() == ["transcription", "transcription"]
+
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+    assert conversation.cancelled == ["two bedrooms", "two bedrooms under one crore"]
+
+@pytest.mark.asyncio
+async def test_a_recording_still_being_transcribed_is_not_cancelled(conversation):
+    class SlowRecordings:
+        def __init__(self):
+            self.release = asyncio.Event()
+
+        async def process_audio(self, audio):
+            await self.release.wait()
+            return audio.decode()
+
+    recordings = SlowRecordings()
+    websocket = FakeWebSocket()
+    session = VoiceSession(websocket, "user-1", audio_processor=recordings)
+    running = asyncio.create_task(session.run())
+    conversation.release.set()
+
+    await websocket.incoming.put({"type": "websocket.receive", "bytes": b"two bedrooms"})
+    await settle()
+    await websocket.incoming.put({"type": "websocket.receive", "bytes": b"under one crore"})
+    await settle()
+    recordings.release.set()
+    await settle()
+
+    assert conversation.queries == ["two bedrooms", "under one crore"]
+    assert conversation.cancelled == []
+    assert "interrupt" not in websocket.types()
+    assert websocket.types().count("response") == 2
+
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+
+@pytest.mark.asyncio
+async def test_only_speech_over_a_response_in_progress_interrupts_it(conversation, monkeypatch):
+    tts = GatedTTS()
+    monkeypatch.setattr(voice_session, "tts_service", tts)
+    websocket, transcriber = FakeWebSocket(), FakeTranscriber()
+    session = VoiceSession(websocket, "user-1", streaming_stt=True, stream_audio=True, transcriber=transcriber)
+    running = asyncio.create_task(session.run())
+    conversation.release.set()
+
+    # Speech while the answer is still being synthesized cancels it
+    await transcriber.queue.put(TranscriptEvent("show me flats", is_final=True))
+    await settle()
+    await transcriber.queue.put(TranscriptEvent("stop", is_final=False))
+    await settle()
+    assert websocket.types()[-3:] == [b"mp3-1", "interrupt", "interim_transcription"]
+
+    # Once an answer is fully sent, speech only interrupts while the client reports playing it
+    tts.release.set()
+    await transcriber.queue.put(TranscriptEvent("in Hyderabad", is_final=True))
+    await settle()
+    await transcriber.queue.put(TranscriptEvent("and", is_final=False))
+    await settle()
+    assert websocket.types().count("interrupt") == 1
+
+    await websocket.incoming.put({"type": "websocket.receive", "text": '{"type": "playback", "playing": true}'})
+    await settle()
+    await transcriber.queue.put(TranscriptEvent("and Pune", is_final=False))
+    await settle()
+    assert websocket.types().count("interrupt") == 2
+
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+
+@pytest.mark.asyncio
+async def test_reader_does_not_wait_for_the_transcriber(conversation):
+    class SlowFinishTranscriber(FakeTranscriber):
+        def __init__(self):
+            super().__init__()
+            self.received = []
+            self.finished = asyncio.Event()
+
+        async def feed(self, chunk):
+            self.received.append(chunk)
+
+        async def end_audio(self):
+            # Finishing a live session waits for Deepgram's last results
+            await self.finished.wait()
+            self.received.append(None)
+
+    websocket, transcriber = FakeWebSocket(), SlowFinishTranscriber()
+    session = VoiceSession(websocket, "user-1", streaming_stt=True, transcriber=transcriber)
+    running = asyncio.create_task(session.run())
+
+    for message in ({"bytes": b"a"}, {"text": '{"type": "audio_end"}'}, {"bytes": b"b"}):
+        await websocket.incoming.put({"type": "websocket.receive", **message})
+    await settle()
+    assert websocket.incoming.empty()
+    assert transcriber.received == [b"a"]
+
+    transcriber.finished.set()
+    await settle()
+    assert transcriber.received == [b"a", None, b"b"]
+
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+
+@pytest.mark.asyncio
+async def test_frames_from_an_interrupted_turn_are_not_sent():
+    websocket = FakeWebSocket()
+    session = VoiceSession(websocket, "user-1", transcriber=FakeTranscriber(), streaming_stt=True)
+    session._speaking, session._client_playing = Turn(1, text="hi", responded=True), True
+    for frame in (b"a", b"b", b"c"):
+        await session._send(frame, 1)
+
+    await session.barge_in()
+    writer = asyncio.create_task(session._write())
+    await settle()
+    writer.cancel()
+
+    assert websocket.sent == [{"type": "interrupt"}]
+
+@pytest.mark.asyncio
+async def test_framed_session_tags_frames_with_turn_and_sequence(conversation):
+    websocket, transcriber = FakeWebSocket(), FakeTranscriber()
+    session = VoiceSession(websocket, "user-1", streaming_stt=True, transcriber=transcriber, frames=True)
+    running = asyncio.create_task(session.run())
+    conversation.release.set()
+
+    await transcriber.queue.put(TranscriptEvent("show me flats", is_final=True))
+    await settle()
+    await websocket.incoming.put({"type": "websocket.disconnect"})
+    await running
+
+    frames = [decode_frame(data) for data in websocket.sent]
+    assert [(frame.type, frame.turn, frame.seq) for frame in frames] == [
+        (FrameType.TRANSCRIPT, 1, 0), (FrameType.RESPONSE, 1, 1), (FrameType.AUDIO_START, 1, 2),
+        (FrameType.AUDIO, 1, 3), (FrameType.AUDIO, 1, 4), (FrameType.AUDIO_END, 1, 5),
+    ]
+    assert frames[3].payload == b"mp3-1"
+
+@pytest.mark.asyncio
+async def test_a_client_that_stops_reading_is_disconnected(monkeypatch):
+    class StalledWebSocket(FakeWebSocket):
+        async def send_json(self, message):
+            await asyncio.Event().wait()
+
+        async def close(self, code=1000, reason=None):
+            self.closed = code
+
+    monkeypatch.setattr(voice_session.settings, "VOICE_SEND_TIMEOUT_SECONDS", 0.01)
+    websocket = StalledWebSocket()
+    session = VoiceSession(websocket, "user-1", streaming_stt=True, transcriber=FakeTranscriber())
+    running = asyncio.create_task(session.run())
+    await session._send({"type": "error", "message": "boom"})
+
+    await asyncio.wait_for(running, 1)
+    assert websocket.closed == voice_session.SLOW_CLIENT_CLOSE_CODE
+
+def test_full_turn_queue_drops_the_oldest_utterance(monkeypatch):
+    session = VoiceSession(FakeWebSocket(), "user-1", streaming_stt=True, transcriber=FakeTranscriber())
+    for turn_id in range(1, session.turns.maxsize + 2):
+        session._enqueue(Turn(turn_id, text=str(turn_id)))
+
+    waiting = [session.turns.get_nowait().id for _ in range(session.turns.qsize())]
+    assert waiting == list(range(2, session.turns.maxsize + 2))
@@ -0,0 +1,108 @@
+import io
+import av
+import pytest
+import numpy as np
+from scipy.io import wavfile
+from app.utils.voice import (
+    VoiceActivityDetector, VoiceProcessor, decode_audio, normalize_audio, prepare_recording, speech_frames, wav_to_float
+)
+
+RATE = 16000
+
+def pcm(samples):
+    return (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+
+def tone(ms, amplitude=0.3, frequency=220):
+    t = np.arange(RATE * ms // 1000) / RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+def noise(ms, amplitude, seed=0):
+    return np.random.default_rng(seed).uniform(-amplitude, amplitude, RATE * ms // 1000)
+
+def silence(ms):
+    return np.zeros(RATE * ms // 1000)
+
+def test_speech_frames_energy_and_zero_crossings():
+    samples = np.concatenate([silence(100), tone(100), noise(100, 0.015), noise(100, 0.003)])
+
+    active = speech_frames(samples, RATE, frame_ms=20, energy_threshold=0.01, zcr_threshold=0.3)
+
+    # Silence, voiced tone, quiet fricative-like noise (high zero-crossing rate), background hiss
+    assert active.tolist() == [False] * 5 + [True] * 5 + [True] * 5 + [False] * 5
+
+@pytest.mark.asyncio
+async def test_detect_silence():
+    processor = VoiceProcessor()
+
+    assert await processor.detect_silence(pcm(silence(250)))
+    assert await processor.detect_silence(pcm(noise(250, 0.003)))
+    assert not await processor.detect_silence(pcm(tone(250)))
+
+def test_detector_drops_leading_silence_and_ends_after_hangover():
+    vad = VoiceActivityDetector(sample_rate=RATE, frame_ms=20, hangover_ms=500)
+    chunks = [silence(200), tone(200), silence(200), tone(200), silence(200), silence(200), silence(200), silence(200)]
+
+    activity = [vad.process(pcm(chunk)) for chunk in chunks]
+
+    # A 200 ms pause stays in the utterance; 600 ms of trailing silence ends it
+    assert [a.is_speech for a in activity] == [False, True, True, True, True, True, False, False]
+    assert [a.end_of_utterance for a in activity] == [False, False, False, False, False, False, True, False]
+    assert not vad.in_utterance
+
+def test_normalize_audio_downmixes_resamples_trims_and_normalizes():
+    # Half a second of quiet 48 kHz stereo speech with a second of silence either side
+    t = np.arange(48000 // 2) / 48000
+    speech = 0.1 * np.sin(2 * np.pi * 220 * t)
+    mono = np.concatenate([np.zeros(48000), speech, np.zeros(48000)])
+    stereo = np.stack([mono, mono], axis=1)
+
+    samples = normalize_audio(stereo, 48000, target_rate=RATE, peak=0.9, pad_ms=100)
+
+    assert samples.ndim == 1
+    assert abs(len(samples) - RATE * 0.7) <= RATE * 0.02  # 500 ms of speech plus 100 ms of padding each side
+    assert np.max(np.abs(samples)) == pytest.approx(0.9, abs=1e-3)
+
+@pytest.mark.asyncio
+async def test_enhance_audio_reencodes_wav_and_passes_other_formats_through():
+    processor = VoiceProcessor()
+    recording = io.BytesIO()
+    wavfile.write(recording, 44100, (tone(250) * 32767).astype("<i2").repeat(2).reshape(-1, 2))
+
+    sample_rate, samples = wav_to_float(await processor.enhance_audio(recording.getvalue()))
+
+    assert sample_rate == RATE
+    assert samples.ndim == 1
+    assert await processor.enhance_audio(b"\x1aE\xdf\xa3webm") == b"\x1aE\xdf\xa3webm"
+
+def browser_recording(mono, rate=48000):
+    """Stereo webm/opus, as MediaRecorder produces"""
+    output = io.BytesIO()
+    with av.open(output, mode="w", format="webm") as container:
+        stream = container.add_stream("libopus", rate=rate, layout="stereo")
+        interleaved = np.frombuffer(pcm(mono.repeat(2)), dtype="<i2").reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(interleaved, format="s16", layout="stereo")
+        frame.sample_rate = rate
+        for packet in [*stream.encode(frame), *stream.encode(None)]:
+            container.mux(packet)
+    return output.getvalue()
+
+def test_prepare_recording_normalizes_webm_to_compact_ogg():
+    t = np.arange(48000 // 2) / 48000
+    recording = browser_recording(np.concatenate([np.zeros(48000), 0.1 * np.sin(2 * np.pi * 220 * t), np.zeros(48000)]))
+
+    audio, mimetype = prepare_recording(recording)
+    sample_rate, samples = decode_audio(audio)
+
+    assert mimetype == "audio/ogg"
+    assert len(audio) < len(recording)
+    assert sample_rate == RATE
+    # Silence trimmed to the padding around the speech, and the level raised
+    assert len(samples) < RATE
+    assert np.max(np.abs(samples)) > 0.5
+
+def test_prepare_recording_skips_recordings_without_speech():
+    assert prepare_recording(browser_recording(np.zeros(48000))) is None
+
+def test_prepare_recording_rejects_undecodable_audio():
+    with pytest.raises(ValueError):
+        prepare_recording(b"\x1aE\xdf\xa3webm")